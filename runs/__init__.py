@@ -2,4 +2,17 @@
 runs パッケージ
 
 デフォルト構成: runXX/main.py をモジュールとして扱う。
+
+PROGRAMS は selector が使う「表示番号 → モジュールパス」のレジストリです。
+ここでは名前だけを持ち、run のモジュールは実行するときに初めて import します。
+run を追加するときは、ここに1行足すだけで selector に出てきます。
 """
+
+PROGRAMS = [
+    {"module": "runs.run01.main", "display_number": 1},
+    {"module": "runs.run02.main", "display_number": 2},
+    {"module": "runs.run03.main", "display_number": 3},
+    {"module": "runs.run04.main", "display_number": 4},
+    {"module": "runs.run05.main", "display_number": 5},
+    {"module": "runs.run06.main", "display_number": 6},
+]
@@ -11,13 +11,13 @@ if __package__ is None:
     pass
 
 
-from pybricks.tools import wait
+from utils.logger import debug
 from utils.runtime import ensure_project_root
 
 ensure_project_root(__file__)
 
-# stop_logging を持つと、main 側がセンサーロガー停止を面倒みてくれます
-stop_logging = False
+# main.py の単体実行で、一定間隔のセンサーログも記録するなら True（utils.variant.run_standalone）
+SENSOR_LOG = False
 
 
 async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
@@ -25,19 +25,8 @@ async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     ここにロボットの動作を記述してください。
     """
     # 例: await robot.straight(400)
+    # 素の wait も [STEP] の表に出したいときは from utils.control import wait を使う
 
     robot.stop()
-    print("# 走行完了！")
+    debug("# 走行完了！")
 
-
-async def sensor_logger_task(hub, robot, left_wheel, right_wheel):
-    """
-    センサー値を定期的に表示する場合のサンプル。
-    必要なければこの関数ごと削除してください。
-    """
-    global stop_logging
-    print("--- センサーログタスク開始 ---")
-    while not stop_logging:
-        print("LOG: dist={0:.1f}mm heading={1:.1f}deg".format(robot.distance(), hub.imu.heading()))
-        await wait(200)
-    print("--- センサーログタスク終了 ---")
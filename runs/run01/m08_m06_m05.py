@@ -4,12 +4,17 @@ from pathlib import Path
 if __package__ is None:
     sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from pybricks.tools import StopWatch, multitask, run_task, wait
+from pybricks.tools import multitask, run_task
 from setup import initialize_robot
+from utils.logger import debug
 from utils.runtime import ensure_project_root
+from utils.sensorlog import sensor_log, sensor_logger_task
 
 ensure_project_root(__file__)
 
+# main.py の単体実行で、一定間隔のセンサーログも記録する（utils.variant.run_standalone）
+SENSOR_LOG = True
+
 
 async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     #######################################
@@ -18,35 +23,35 @@ async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     # M08
 
     # 最初の目標地点まで前進（450mm）
-    print(">>> 実行: await robot.straight(450)")
+    debug(">>> 実行: await robot.straight(450)")
     await robot.straight(450)
 
     # 右アームを下げる（速度500、角度-360度）
-    print(">>> 実行: await right_lift.run_angle(500,-1100)")
+    debug(">>> 実行: await right_lift.run_angle(500,-360)")
     await right_lift.run_angle(500, -360)
 
-    await wait(100)  # 0.1秒待機
+    await robot.settle(100)  # 止まるまで待つ（最大0.1秒）
 
     # 右アームを下げる（速度500、角度-360度）
-    print(">>> 実行: await right_lift.run_angle(500,-1100)")
+    debug(">>> 実行: await right_lift.run_angle(500,-360)")
     await right_lift.run_angle(500, -360)
 
-    await wait(100)  # 0.1秒待機
+    await robot.settle(100)  # 止まるまで待つ（最大0.1秒）
 
     # 右アームを下げる（速度500、角度-360度）
-    print(">>> 実行: await right_lift.run_angle(500,-1100)")
+    debug(">>> 実行: await right_lift.run_angle(500,-360)")
     await right_lift.run_angle(500, -360)
 
-    await wait(50)  # 0.1秒待機    # M06
+    await robot.settle(50)  # 止まるまで待つ（最大0.05秒）    # M06
 
     # M06
 
     # 微調整のため左に5度回転
-    print(">>> 実行: await robot.turn(-5)")
+    debug(">>> 実行: await robot.turn(-5)")
     await robot.turn(-5)
 
     # さらに前進（250mm）- 目標位置に近づく
-    print(">>> 実行: await robot.straight(250)")
+    debug(">>> 実行: await robot.straight(250)")
     await robot.straight(250)
 
     # M05
@@ -55,17 +60,17 @@ async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     await robot.straight(34)
 
     # 右の車輪だけを少し動かす（180度回転、タイムアウト1.5秒）
-    print(">>> 実行: right_wheel.run_angle(200, 140) [タイムアウト1.5秒]")
+    debug(">>> 実行: right_wheel.run_angle(200, 140) [タイムアウト1.5秒]")
     await robot.run_motor(right_wheel, 200, 140, timeout=1500)
 
     # ホームエリアに戻る
 
     # 時計回りに60度回転
-    print(">>> 実行: await robot.turn(45)")
+    debug(">>> 実行: await robot.turn(45)")
     await robot.turn(50)
 
     # 後退して初期位置方向に戻る（720mm）- 500mm/sスピード
-    print(">>> 実行: await robot.straight(-720) [500mm/sスピード]")
+    debug(">>> 実行: await robot.straight(-720) [500mm/sスピード]")
     await robot.straight(-720, speed=500)
 
     pass  # 何も実行しない場合の構文エラー回避
@@ -73,33 +78,9 @@ async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     ##########################################
 
 
-async def sensor_logger_task(hub, robot, left_wheel, right_wheel):
-    """
-    センサー値を定期的にターミナルに表示する非同期タスク。
-    他のタスク（ロボットの移動）と並行して実行されます。
-    """
-    print("--- センサーログタスク開始 ---")
-    # 経過時間測定用のタイマーを開始
-    logger_timer = StopWatch()
-    logger_timer.reset()
-
-    while True:  # プログラムが終了するまで継続的にログを出力
-        elapsed_time = logger_timer.time()
-        heading = hub.imu.heading()
-        left_deg = left_wheel.angle()
-        right_deg = right_wheel.angle()
-        dist = robot.distance()
-        # f-string を .format() に書き換え
-        print(
-            "LOG[{:5.0f}ms]: dist={:4.0f} mm  heading={:4.0f}°  L={:5.0f}°  R={:5.0f}°".format(
-                elapsed_time, dist, heading, left_deg, right_deg
-            )
-        )
-        await wait(200)  # 200ミリ秒待機して、他のタスクに実行を譲る
-
-
 async def main():
     await run(hub, robot, left_wheel, right_wheel, left_lift, right_lift)
+    sensor_log.stop()  # ロガーを止めて、記録したログを出す
 
 
 if __name__ == "__main__":
@@ -6,14 +6,17 @@ if __package__ is None:
     pass
 
 
-from pybricks.tools import multitask, run_task, wait
+from pybricks.tools import multitask, run_task
 from setup import initialize_robot
+from utils.control import wait
+from utils.logger import debug
 from utils.runtime import ensure_project_root
+from utils.sensorlog import sensor_log, sensor_logger_task
 
 ensure_project_root(__file__)
 
-# グローバル終了フラグ
-stop_logging = False
+# main.py の単体実行で、一定間隔のセンサーログも記録する（utils.variant.run_standalone）
+SENSOR_LOG = True
 
 
 async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
@@ -68,33 +71,12 @@ async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     await robot.straight(-650)
 
     robot.stop()
-    print("# 走行完了！")
-
-
-async def sensor_logger_task(hub, robot, left_wheel, right_wheel):
-    """センサー値を定期的に表示するタスク。"""
-    global stop_logging
-    print("--- センサーログタスク開始 ---")
-    while not stop_logging:
-        heading = hub.imu.heading()
-        left_deg = left_wheel.angle()
-        right_deg = right_wheel.angle()
-        dist = robot.distance()
-        print(
-            "LOG: dist="
-            "{0:4.0f} mm  heading={1:4.0f}°  "
-            "L={2:5.0f}°  R={3:5.0f}°".format(dist, heading, left_deg, right_deg)
-        )
-        await wait(200)
-    print("--- センサーログタスク終了 ---")
+    debug("# 走行完了！")
 
 
 async def main():
-    global stop_logging
     await run(hub, robot, left_wheel, right_wheel, left_lift, right_lift)
-    stop_logging = True
-    print("--- メインタスク完了、ログタスク終了中 ---")
-    await wait(500)
+    sensor_log.stop()  # ロガーを止めて、記録したログを出す
 
 
 if __name__ == "__main__":
@@ -6,13 +6,16 @@ if __package__ is None:
     pass
 
 
-from pybricks.tools import StopWatch, multitask, run_task, wait
+from pybricks.tools import multitask, run_task
 from setup import initialize_robot
+from utils.logger import debug
 from utils.runtime import ensure_project_root
+from utils.sensorlog import sensor_log, sensor_logger_task
 
 ensure_project_root(__file__)
 
-stop_logging = False
+# main.py の単体実行で、一定間隔のセンサーログも記録する（utils.variant.run_standalone）
+SENSOR_LOG = True
 
 
 async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
@@ -23,44 +26,19 @@ async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     # ステップ2: 位置調整のため少し後退
     await robot.straight(-130)
 
-    # ステップ3: カーブしながら前進（タイムアウト処理付き）
-    await robot.curve(850, 25, speed=200, timeout=2000)
+    # ステップ3: カーブしながら前進（タイムアウト・押し当たり検出付き）
+    await robot.curve(850, 25, speed=200, timeout=2000, stall_ms=300)
 
     # ステップ4: スタート地点に向けて後退
     await robot.straight(-550, speed=350)
 
     robot.stop()
-    print("# 走行完了！")
-
-
-async def sensor_logger_task(hub, robot, left_wheel, right_wheel):
-    """センサー値を定期的にターミナルに表示する非同期タスク。"""
-    global stop_logging
-    print("--- センサーログタスク開始 ---")
-    logger_timer = StopWatch()
-    logger_timer.reset()
-
-    while not stop_logging:
-        elapsed_time = logger_timer.time()
-        heading = hub.imu.heading()
-        left_deg = left_wheel.angle()
-        right_deg = right_wheel.angle()
-        dist = robot.distance()
-        print(
-            "LOG[{0:5.0f}ms]: dist={1:4.0f} mm  heading={2:4.0f}°  "
-            "L={3:5.0f}°  R={4:5.0f}°".format(elapsed_time, dist, heading, left_deg, right_deg)
-        )
-        await wait(200)
-
-    print("--- センサーログタスク終了 ---")
+    debug("# 走行完了！")
 
 
 async def main():
-    global stop_logging
     await run(hub, robot, left_wheel, right_wheel, left_lift, right_lift)
-    stop_logging = True
-    print("--- メインタスク完了、ログタスク終了中 ---")
-    await wait(500)
+    sensor_log.stop()  # ロガーを止めて、記録したログを出す
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+"""
+ラン4: M12 を表で書いたもの（m12 と同じ動き）。
+
+表の書き方は setup.Robot.run_table を参照。
+"""
+
+from utils.logger import debug
+
+# main.py の単体実行で、一定間隔のセンサーログも記録する（utils.variant.run_standalone）
+SENSOR_LOG = True
+
+TABLE = (
+    ("S", 350),  # 目標地点に向かって前進
+    ("S", -130),  # 位置調整のため少し後退
+    ("C", 850, 25, 200, 2000, 300),  # カーブしながら前進（タイムアウト・押し当たり検出付き）
+    ("S", -550, 350),  # スタート地点に向けて後退
+)
+
+
+async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
+    """ラン4: M12"""
+    await robot.run_table(TABLE)
+
+    robot.stop()
+    debug("# 走行完了！")
@@ -6,13 +6,16 @@ if __package__ is None:
     pass
 
 
-from pybricks.tools import StopWatch, multitask, run_task, wait
+from pybricks.tools import multitask, run_task
 from setup import initialize_robot
+from utils.logger import debug
 from utils.runtime import ensure_project_root
+from utils.sensorlog import sensor_log, sensor_logger_task
 
 ensure_project_root(__file__)
 
-stop_logging = False
+# main.py の単体実行で、一定間隔のセンサーログも記録する（utils.variant.run_standalone）
+SENSOR_LOG = True
 
 
 async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
@@ -22,7 +25,7 @@ async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     await robot.turn(40)  # M02に向けて方向転換
     await robot.straight(220)
     await robot.turn(-85)
-    await robot.straight(205, timeout=3000)
+    await robot.straight(205, timeout=3000, stall_ms=300)  # 押し当たったら止める
     await robot.straight(-210)
     await robot.turn(-45)
     await robot.straight(50)
@@ -32,63 +35,12 @@ async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     await robot.straight(580)
 
     robot.stop()
-    print("# 走行完了！")
-
-
-async def sensor_logger_task(hub, robot, left_wheel, right_wheel):
-    """センサー値を定期的にターミナルに表示する非同期タスク。"""
-    global stop_logging
-    print("--- センサーログタスク開始 ---")
-    logger_timer = StopWatch()
-    logger_timer.reset()
-
-    print(
-        "time,current_dist_mm,error_angle_deg,current_heading_deg,left_angle_deg,right_angle_deg,angle_diff_deg,"
-        "left_speed_dps,right_speed_dps,speed_diff_dps,kp_dist,ki_dist,kd_dist,kp_head,ki_head,kd_head"
-    )
-
-    while not stop_logging:
-        elapsed_time = logger_timer.time()
-        current_dist_mm = robot.distance()
-        current_heading_deg = hub.imu.heading()
-        left_angle_deg = left_wheel.angle()
-        right_angle_deg = right_wheel.angle()
-        angle_diff_deg = right_angle_deg - left_angle_deg
-        left_speed_dps = left_wheel.speed()
-        right_speed_dps = right_wheel.speed()
-        speed_diff_dps = right_speed_dps - left_speed_dps
-
-        kp_dist = 1000
-        ki_dist = 50
-        kd_dist = 10
-        kp_head = 2000
-        ki_head = 50
-        kd_head = 100
-        error_angle_deg = 0
-
-        print(
-            "{0:.0f},{1:.1f},{2:.1f},{3:.1f},"
-            "{4:.1f},{5:.1f},{6:.1f},"
-            "{7:.1f},{8:.1f},{9:.1f},"
-            "{10:.1f},{11:.1f},{12:.1f},{13:.1f},{14:.1f},{15:.1f}".format(
-                elapsed_time, current_dist_mm, error_angle_deg, current_heading_deg,
-                left_angle_deg, right_angle_deg, angle_diff_deg,
-                left_speed_dps, right_speed_dps, speed_diff_dps,
-                kp_dist, ki_dist, kd_dist, kp_head, ki_head, kd_head
-            )
-        )
-
-        await wait(200)
-
-    print("--- センサーログタスク終了 ---")
+    debug("# 走行完了！")
 
 
 async def main():
-    global stop_logging
     await run(hub, robot, left_wheel, right_wheel, left_lift, right_lift)
-    stop_logging = True
-    print("--- メインタスク完了、ログタスク終了中 ---")
-    await wait(500)
+    sensor_log.stop()  # ロガーを止めて、記録したログを出す
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+"""
+ラン5: M01, M02 を表で書いたもの（m01_m02_kanna と同じ動き）。
+
+表の書き方は setup.Robot.run_table を参照。
+"""
+
+from utils.logger import debug
+
+# main.py の単体実行で、一定間隔のセンサーログも記録する（utils.variant.run_standalone）
+SENSOR_LOG = True
+
+TABLE = (
+    ("S", 590),  # M01に向けて前進
+    ("S", -120),  # M01で後進して奥側の羽を倒す
+    ("T", 40),  # M02に向けて方向転換
+    ("S", 220),
+    ("T", -85),
+    ("S", 205, None, 3000, 300),  # 押し当たったら止める
+    ("S", -210),
+    ("T", -45),
+    ("S", 50),
+    ("L", "left", 300, 180),
+    ("S", -50),
+    ("T", -70),
+    ("S", 580),
+)
+
+
+async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
+    """ラン5: M01, M02"""
+    await robot.run_table(TABLE)
+
+    robot.stop()
+    debug("# 走行完了！")
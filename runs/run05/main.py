@@ -6,81 +6,23 @@ if __package__ is None:
     # sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
     pass
 
-from utils.control import run_with_timing
 from utils.runtime import ensure_project_root
+from utils.variant import VariantLoader, run_standalone
 
 ensure_project_root(__file__)
 
-ACTIVE_VARIANT = "m01_m02_kanna"
+ACTIVE_VARIANT = "m01_m02_table"
 
+# ハブのボタンで切り替えられるバリアント（同ディレクトリのファイル名）
+VARIANTS = (ACTIVE_VARIANT,)
 
-def load_variant():
-    if __package__:
-        module_path = "{0}.{1}".format(__package__, ACTIVE_VARIANT)
-    else:
-        module_path = "runs.run05.{0}".format(ACTIVE_VARIANT)
-
-    return __import__(module_path, None, None, ["*"])
-
+# ACTIVE_VARIANT の解決と import は最初の1回だけ行い、モジュールをキャッシュする
+variant_loader = VariantLoader(__package__ or "runs.run05", ACTIVE_VARIANT, VARIANTS)
 
 
 async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
-    variant = load_variant()
-    label = "run05:{0}".format(ACTIVE_VARIANT)
-    return await run_with_timing(
-        label,
-        lambda: variant.run(
-            hub,
-            robot,
-            left_wheel,
-            right_wheel,
-            left_lift,
-            right_lift,
-        ),
-    )
+    return await variant_loader.run(hub, robot, left_wheel, right_wheel, left_lift, right_lift)
 
 
 if __name__ == "__main__":
-    from pybricks.tools import multitask, run_task, wait
-    from setup import initialize_robot
-
-    hub, robot, left_wheel, right_wheel, left_lift, right_lift = initialize_robot()
-    variant = load_variant()
-    label = "run05:{0}".format(ACTIVE_VARIANT)
-
-    async def timed_run():
-        await run_with_timing(
-            label,
-            lambda: variant.run(
-                hub,
-                robot,
-                left_wheel,
-                right_wheel,
-                left_lift,
-                right_lift,
-            ),
-        )
-
-    if hasattr(variant, "sensor_logger_task"):
-        if hasattr(variant, "stop_logging"):
-
-            async def wrapped_run():
-                await timed_run()
-                variant.stop_logging = True
-                await wait(500)
-
-            run_task(
-                multitask(
-                    variant.sensor_logger_task(hub, robot, left_wheel, right_wheel),
-                    wrapped_run(),
-                )
-            )
-        else:
-            run_task(
-                multitask(
-                    variant.sensor_logger_task(hub, robot, left_wheel, right_wheel),
-                    timed_run(),
-                )
-            )
-    else:
-        run_task(timed_run())
+    run_standalone(variant_loader)
@@ -6,135 +6,70 @@ if __package__ is None:
     pass
 
 
-from pybricks.tools import StopWatch, multitask, run_task, wait
+from pybricks.tools import multitask, run_task
 from setup import initialize_robot
+from utils.logger import debug
 from utils.runtime import ensure_project_root
+from utils.sensorlog import sensor_log, sensor_logger_task
 
 ensure_project_root(__file__)
 
-stop_logging = False
+# main.py の単体実行で、一定間隔のセンサーログも記録する（utils.variant.run_standalone）
+SENSOR_LOG = True
 
 
 async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
     """ラン6: M13, M03"""
-    straight_settings = {
-        "straight_speed": 400,
-        "straight_acceleration": 500,
-    }
-    turn_settings = {
-        "turn_rate": 240,
-        "turn_acceleration": 850,
-    }
-
-    robot.settings(**straight_settings)
+    # 既定の速度・加速度で走る（setup.PROFILES["default"]）
+    robot.use_profile("default")
+
+    # 向きは turn_to でスタート時からの絶対的な向きを指定する（前の動作のずれも直る）。
+    # M13 で揺らす turn(-30) / turn(30) だけは今の向きからの相対
+
     await robot.straight(650)
 
-    robot.settings(**turn_settings)
-    await robot.turn(90)
+    await robot.turn_to(90)
 
-    robot.settings(**straight_settings)
     await robot.straight(262)
 
-    robot.settings(**turn_settings)
-    await robot.turn(39)
+    await robot.turn_to(129)
 
-    robot.settings(**straight_settings)
     await robot.straight(140)
-    await wait(100)
+    await robot.settle(100)
 
     await right_lift.run_angle(150, 380)
-    await wait(300)
+    await robot.settle(300)
 
-    robot.settings(**turn_settings)
     await robot.turn(-30)
-    await wait(700)
+    await robot.settle(700)
 
-    robot.settings(**turn_settings)
     await robot.turn(30)
 
-    robot.settings(**straight_settings)
     await robot.straight(-48)
 
-    robot.settings(**turn_settings)
-    await robot.turn(245)
+    await robot.turn_to(374)
 
     await right_lift.run_angle(1000, -350)
     await robot.straight(48)
     await right_lift.run_angle(1000, 360 * 3)
-    await wait(500)
+    await robot.settle(500)
     await right_lift.run_angle(800, -50)
 
-    robot.settings(**turn_settings)
-    await robot.turn(-100)
+    await robot.turn_to(274)
 
-    robot.settings(**straight_settings)
     await robot.straight(300)
 
-    robot.settings(**turn_settings)
-    await robot.turn(-80)
+    await robot.turn_to(194)
 
-    robot.settings(**straight_settings)
     await robot.straight(700)
 
     robot.stop()
-    print("# 走行完了！")
-
-
-async def sensor_logger_task(hub, robot, left_wheel, right_wheel):
-    """センサー値を定期的にターミナルに表示する非同期タスク。"""
-    global stop_logging
-    print("--- センサーログタスク開始 ---")
-    logger_timer = StopWatch()
-    logger_timer.reset()
-
-    print(
-        "time,current_dist_mm,error_angle_deg,current_heading_deg,left_angle_deg,right_angle_deg,angle_diff_deg,"
-        "left_speed_dps,right_speed_dps,speed_diff_dps,kp_dist,ki_dist,kd_dist,kp_head,ki_head,kd_head"
-    )
-
-    while not stop_logging:
-        elapsed_time = logger_timer.time()
-        current_dist_mm = robot.distance()
-        current_heading_deg = hub.imu.heading()
-        left_angle_deg = left_wheel.angle()
-        right_angle_deg = right_wheel.angle()
-        angle_diff_deg = right_angle_deg - left_angle_deg
-        left_speed_dps = left_wheel.speed()
-        right_speed_dps = right_wheel.speed()
-        speed_diff_dps = right_speed_dps - left_speed_dps
-
-        kp_dist = 1000
-        ki_dist = 50
-        kd_dist = 10
-        kp_head = 2000
-        ki_head = 50
-        kd_head = 100
-
-        error_angle_deg = 0
-
-        print(
-            "{0:.0f},{1:.1f},{2:.1f},{3:.1f},"
-            "{4:.1f},{5:.1f},{6:.1f},"
-            "{7:.1f},{8:.1f},{9:.1f},"
-            "{10:.1f},{11:.1f},{12:.1f},{13:.1f},{14:.1f},{15:.1f}".format(
-                elapsed_time, current_dist_mm, error_angle_deg, current_heading_deg,
-                left_angle_deg, right_angle_deg, angle_diff_deg,
-                left_speed_dps, right_speed_dps, speed_diff_dps,
-                kp_dist, ki_dist, kd_dist, kp_head, ki_head, kd_head
-            )
-        )
-
-        await wait(200)
-
-    print("--- センサーログタスク終了 ---")
+    debug("# 走行完了！")
 
 
 async def main():
-    global stop_logging
     await run(hub, robot, left_wheel, right_wheel, left_lift, right_lift)
-    stop_logging = True
-    print("--- メインタスク完了、ログタスク終了中 ---")
-    await wait(500)
+    sensor_log.stop()  # ロガーを止めて、記録したログを出す
 
 
 if __name__ == "__main__":
@@ -4,13 +4,13 @@
 通常版よりも高機能で、デバッグ（バグ探し）に便利な機能があります。
 
 【通常版（selector.py）との違い】
-1. センサーログ機能：ロボットの動きをリアルタイムで記録できる
+1. ログ機能：動作の始まりと終わり（イベントログ）や、センサーの値を記録できる
 2. 非同期処理：複数の作業を同時に行える（ログを取りながらロボットを動かす）
 3. devフラグ：開発モードと本番モードを簡単に切り替えられる
 
 【devフラグとは？】
-- dev=True : 開発モード（センサーログが有効、デバッグに便利）
-- dev=False : 本番モード（センサーログなし、競技本番用）
+- dev=True : 開発モード（イベントログが有効、デバッグに便利）
+- dev=False : 本番モード（ログなし、競技本番用）
 
 【使い方】
 通常版と同じように、左右ボタンでプログラムを選び、
@@ -24,47 +24,106 @@
 
 # ===== ライブラリのインポート =====
 # LEGOロボットを動かすために必要な道具を読み込みます
-from pybricks.parameters import Button, Color, Port  # ポート番号、方向、ボタン、色などの設定
-from pybricks.pupdevices import ForceSensor  # モーターやセンサーを使うための道具
+import gc  # メモリの後片付け（ガベージコレクション）の道具
+
 from pybricks.tools import StopWatch, multitask, run_task, wait  # 待機、並行処理、タイマーの道具
 
-# ----- 競技プログラムのインポート -----
-# 各ミッションのプログラムを runs/ 配下の runXX/main から読み込みます
-from runs.run01 import main as run01_main
-from runs.run02 import main as run02_main
-from runs.run03 import main as run03_main
-from runs.run04 import main as run04_main
-from runs.run05 import main as run05_main
-from runs.run06 import main as run06_main
-from setup import initialize_robot  # ロボットを初期化する関数をインポート
-from utils.logger import tee_stdout
+# 起動（setup や utils の import、ロボットの初期化からセレクター表示まで）にかかった時間を
+# 測るタイマー。重い import より先に動かし始める
+boot_timer = StopWatch()
+
+from pybricks.parameters import Button, Color, Port  # noqa: E402  ポート番号、ボタン、色などの設定
+from pybricks.pupdevices import ForceSensor  # noqa: E402  モーターやセンサーを使うための道具
+
+# ----- 競技プログラムの一覧 -----
+# runs/__init__.py の PROGRAMS には「表示番号 → モジュールパス」の名前だけが入っています。
+# 各 run はここでは読み込まず、フォースセンサーで実行するときに初めて読み込みます（遅延 import）。
+from runs import PROGRAMS  # noqa: E402
+from setup import initialize_robot  # noqa: E402  ロボットを初期化する関数をインポート
+from utils.eventlog import event_log  # noqa: E402
+from utils.logger import DEBUG, INFO, set_level, tee_stdout  # noqa: E402
+from utils.runtime import free_heap, unload_modules  # noqa: E402
+from utils.sensorlog import sensor_log  # noqa: E402
 
 # ===== 開発モードの設定 =====
 # ★★★ここを変更することで、開発モードと本番モードを切り替えます★★★
-dev = False  # False=本番モード、True=開発モード（センサーログ有効）
+dev = False  # False=本番モード、True=開発モード（イベントログ有効）
+# 開発モードで、一定間隔（100ミリ秒ごと）のセンサーログも記録するか
+periodic_log = False
 # テスト中は dev=True にすると、ロボットの動きが詳しく分かります
 # 競技本番では dev=False にすると、動作が軽くなります
 
+# 開発モードでは debug() の出力も出す。本番モードでは debug() は何もしない
+set_level(DEBUG if dev else INFO)
+
 # ===== ロボットの初期化 =====
 # ロボットを使う準備をします（モーターやセンサーの設定を行う）
 hub, robot, left_wheel, right_wheel, left_lift, right_lift = initialize_robot()
 
 # ===== プログラムリスト =====
-# ここに、実行したいプログラムを登録します
+# 実行したいプログラムは runs/__init__.py の PROGRAMS に登録します
 # 競技の「ラン（run）」の順番に並べると分かりやすいです
 #
 # 各プログラムは以下の情報を持っています：
-#   - module: どのファイルに関数があるか（必須）
+#   - module: どのファイルに関数があるか（モジュールパスの文字列、必須）
 #   - display_number: ハブに表示する番号（必須）
 # ※ 各モジュールには「run」という名前の関数が必要です
-programs = [
-    {"module": run01_main, "display_number": 1},
-    {"module": run02_main, "display_number": 2},
-    {"module": run03_main, "display_number": 3},
-    {"module": run04_main, "display_number": 4},
-    {"module": run05_main, "display_number": 5},
-    {"module": run06_main, "display_number": 6},
-]
+programs = PROGRAMS
+
+
+def load_program(program):
+    """
+    プログラムのモジュールを読み込んで返す関数
+
+    【遅延 import とは？】
+    起動時に全部の run を読み込むと、ハブのメモリ（RAM）と起動時間を使ってしまいます。
+    そこで、実行する直前に選ばれた run だけを読み込みます。
+    2回目以降は読み込み済みのモジュールがそのまま使われます。
+    """
+    heap_before = free_heap()
+    load_timer = StopWatch()
+    module = __import__(program["module"], None, None, ["run"])
+    print(
+        "[LOAD] {0}: {1} ms, 空きヒープ {2} → {3} bytes".format(
+            program["module"], load_timer.time(), heap_before, free_heap()
+        )
+    )
+    return module
+
+
+def unload_program(program):
+    """
+    実行が終わったプログラムのモジュールをメモリから外す関数
+
+    【なぜ外す？】
+    読み込んだ run（main.py とバリアント）は、外さないと試合の最後までメモリに残ります。
+    6つの run を続けて実行するとメモリが細切れになり、後の run の走行中に
+    GC（メモリの後片付け）が起きて動きが一瞬止まることがあります。
+    """
+    package = program["module"].rpartition(".")[0]  # 例: "runs.run01.main" → "runs.run01"
+    count = unload_modules(package)
+    print("[UNLOAD] {0}: {1} modules".format(package, count))
+
+
+def collect_garbage(heap_start):
+    """
+    ロボットがホームで止まっている間に、メモリの後片付け（gc.collect）をする関数
+
+    走行中に勝手に GC が起きないよう、止まっているこのタイミングでまとめて行います。
+    heap_start は run を読み込む前の空きヒープで、run ごとの増減を表示します。
+    """
+    heap_end = free_heap()
+    gc.collect()
+    heap_after = free_heap()
+    if heap_start is None or heap_after is None:
+        # PC（シミュレーター）では空きヒープが分からない
+        print("[GC] collect 完了")
+        return
+    print(
+        "[GC] 空きヒープ: 実行前 {0} → 実行後 {1} → GC後 {2} bytes（増減 {3:+d}）".format(
+            heap_start, heap_end, heap_after, heap_after - heap_start
+        )
+    )
 
 
 # ===== フォースセンサーの初期化 =====
@@ -75,6 +134,7 @@ button = ForceSensor(Port.C)
 print("=== プログラムセレクター ===")
 print("LEFT/RIGHT: プログラム選択")
 print("フォースセンサー: プログラム実行")
+print("[BOOT] 起動時間 {0} ms, 空きヒープ {1} bytes".format(boot_timer.time(), free_heap()))
 
 
 # ===== ロボットをリセットする関数（非同期版） =====
@@ -95,70 +155,13 @@ async def reset_robot():
         robot.stop()  # ロボットの動きを停止
         robot.reset()  # ロボットの走行距離などをリセット
         hub.imu.reset_heading(0)  # ジャイロセンサー（向き）を0度にリセット
+        robot.odometry.reset()  # 推定している位置をスタート位置（原点）に戻す
         print("ロボットリソースをリセットしました")
     except Exception as e:
         # エラーが発生した場合はメッセージを表示
         print("リセットエラー: {0}".format(e))
 
 
-# ===== センサーログを記録するタスク =====
-async def sensor_logger_task():
-    """
-    センサーの値を定期的にコンピューターの画面に表示する関数
-
-    【この関数の役割】
-    ロボットが動いている間、センサーの値を0.2秒ごとに記録します。
-    ビデオカメラが動画を撮影するように、ロボットの動きを記録できます。
-
-    【記録される情報】
-    1. 経過時間（何ミリ秒経ったか）
-    2. dist（ロボットが進んだ距離）
-    3. heading（ロボットの向き、0度が正面）
-    4. L（左タイヤが回転した角度）
-    5. R（右タイヤが回転した角度）
-
-    【出力例】
-    LOG[ 1000ms]: dist= 150 mm  heading=   0°  L=  720°  R=  720°
-    ↑ 1秒後、150mm進んだ、向きは0度、タイヤは2回転（720度）
-
-    【いつ役立つ？】
-    - ロボットがまっすぐ進まないとき → headingを見て曲がり具合を確認
-    - 目標距離に届かないとき → distを見て実際の距離を確認
-    - プログラムのバグを探すとき → 数値を見て原因を特定
-
-    【非同期処理の仕組み】
-    この関数は「タスク」として、ロボットの動作と「同時に」実行されます。
-    料理で「お湯を沸かしながら野菜を切る」ように、2つのことを並行して行います。
-    """
-    print("--- センサーログタスク開始 ---")
-
-    # ----- 経過時間を測るタイマーを準備 -----
-    logger_timer = StopWatch()  # ストップウォッチを作成
-    logger_timer.reset()  # タイマーを0にリセット
-
-    # ----- 永遠にログを記録し続けるループ -----
-    while True:  # プログラムが終了するまで継続的にログを出力
-        # 各センサーの値を読み取る
-        elapsed_time = logger_timer.time()  # 経過時間（ミリ秒）
-        heading = hub.imu.heading()  # ロボットの向き（度）
-        left_deg = left_wheel.angle()  # 左タイヤの回転角度（度）
-        right_deg = right_wheel.angle()  # 右タイヤの回転角度（度）
-        dist = robot.distance()  # 走行距離（mm）
-
-        # 読み取った値を画面に表示（フォーマットを整えて見やすく）
-        print(
-            "LOG["
-            "{0:5.0f}ms]: dist={1:4.0f} mm  "
-            "heading={2:4.0f}°  L={3:5.0f}°  R={4:5.0f}°".format(
-                elapsed_time, dist, heading, left_deg, right_deg
-            )
-        )
-
-        # 0.2秒（200ミリ秒）待機して、次の記録まで待つ
-        # awaitをつけることで、待っている間に他のタスク（ロボットの動作）が実行できる
-        await wait(200)
-
-
 # ===== セレクタータスク（プログラム選択と実行） =====
 async def selector_task():
     """
@@ -170,7 +173,7 @@ async def selector_task():
 
     【通常版との違い】
     - すべての処理に「await」がついている（他のタスクと同時実行できる）
-    - センサーログと並行して動く
+    - センサーを読むタスクと並行して動く
     """
     program_id = 0  # 現在選択されているプログラムの番号
     max_programs = len(programs) - 1  # プログラムの総数-1
@@ -206,6 +209,19 @@ async def selector_task():
             hub.light.off()  # ライトを消す
             print("← プログラム {0} に変更".format(program_id))
 
+        # 【Bluetoothボタンが押された場合】選択中のプログラムのバリアントを切り替える
+        # （runs/runXX/main.py の VARIANTS の順に切り替わる。プログラムの再転送は不要）
+        elif Button.BLUETOOTH in pressed_buttons:
+            loader = getattr(load_program(current_program), "variant_loader", None)
+            if loader is not None:
+                print(
+                    "◆ プログラム {0} のバリアントを {1} に変更".format(program_id, loader.next())
+                )
+            loader = None
+            hub.light.on(Color.YELLOW)  # ハブのライトを黄色に点灯
+            await wait(100)  # 0.1秒待つ（awaitで他のタスクに譲る）
+            hub.light.off()  # ライトを消す
+
         # ----- フォースセンサーでプログラム実行 -----
         # フォースセンサーが0.5以上の力で押されたら、プログラムを実行
         if await button.force() >= 0.5:
@@ -213,16 +229,24 @@ async def selector_task():
             print("=== プログラム {0} を実行中 ===".format(program_id))
 
             log_name = "run{0:02d}".format(display_num)
+            heap_start = None
+            module = function = None
             with tee_stdout(log_name) as log_path:
                 print("[LOG] 出力をファイルにも記録します: {0}".format(log_path))
                 try:
                     # ----- 実行前の準備 -----
                     await reset_robot()  # ロボットをリセット（awaitで待つ）
                     await wait(50)  # リセット後に少し待機（0.05秒）
+                    if dev:
+                        event_log.start()  # イベントログの記録を開始
+                    if dev and periodic_log:
+                        sensor_log.start()  # センサーログの記録を開始
 
                     # ----- プログラムを実行 -----
-                    # モジュールからrun関数を取得（例: run05_m01_m02_kanna.run）
-                    function = getattr(current_program["module"], "run")
+                    # 選ばれたプログラムをここで初めて読み込み、run関数を取得
+                    heap_start = free_heap()
+                    module = load_program(current_program)
+                    function = getattr(module, "run")
 
                     # パラメータ（引数）がある場合は渡して実行、ない場合はロボット情報だけ渡す
                     if "params" in current_program:
@@ -246,6 +270,9 @@ async def selector_task():
                         )
 
                     print("=== プログラム {0} 実行完了 ===".format(program_id))
+                    if robot.sampler.running:
+                        # 推定した終了位置（シミュレーターの end pose と比べられる。開発モードのみ）
+                        print("[POSE] x={0} mm y={1} mm heading={2} deg".format(*robot.pose()))
 
                 except Exception as e:
                     # ----- エラーが発生した場合の処理 -----
@@ -260,6 +287,21 @@ async def selector_task():
                         await wait(50)  # リセット後に少し待機（0.05秒）
                     except Exception as e:
                         print("リセットエラー: {0}".format(e))
+                    if dev:
+                        # ロボットが止まってから、記録したログをまとめて表示
+                        event_log.stop()
+                        event_log.dump()
+                    if dev and periodic_log:
+                        sensor_log.stop()
+                        sensor_log.dump(robot)
+
+                    # ----- メモリの後片付け（ロボットが止まっている間に行う） -----
+                    module = function = None  # run への参照を手放す
+                    if not dev:
+                        # 本番モードでは run を毎回メモリから外す
+                        # （開発モードは再実行を速くするため残す）
+                        unload_program(current_program)
+                    collect_garbage(heap_start)
 
             hub.light.off()  # ライトを消す
             print("セレクターに戻りました")
@@ -276,36 +318,49 @@ async def selector_task():
 
 if dev:
     # ----- 開発モード（dev=True）の場合 -----
-    # センサーログタスクとセレクタータスクを「同時に」実行します
+    # センサーを読むタスクとセレクタータスクを「同時に」実行します
     #
     # 【multitaskの仕組み】
     # multitask()は、複数のタスクを並行して実行する機能です。
     # 料理で「パスタを茹でながら、ソースを作る」ように、
-    # 「センサーログを記録しながら、プログラムを選択・実行する」ことができます。
+    # 「センサーを読みながら、プログラムを選択・実行する」ことができます。
     #
     # 【実行されるタスク】
-    # 1. sensor_logger_task() : 0.2秒ごとにセンサー値を画面に表示
+    # 1. robot.sampler.task() : 10ミリ秒ごとにセンサーを1回だけ読み、
+    #    フィールド上の位置（robot.pose()）と、periodic_log なら
+    #    センサーログ（100ミリ秒ごと）をその値で更新
     # 2. selector_task() : ボタンでプログラムを選択・実行
     #
-    # この2つが同時に動くので、ロボットが動いている間もログが記録されます。
-    print("--- 開発モードで起動（センサーログ有効） ---")
+    # イベントログ（utils/eventlog.py）は、動作の始まりと終わりのときだけ記録します。
+    # ログはプログラム実行中だけメモリ（リングバッファ）へ記録し、
+    # ロボットが止まってから selector_task がまとめて表示します。
+    # センサーを読む人が増えても、タスクとセンサーを読む回数は増えません（utils/sampler.py）。
+    print("--- 開発モードで起動（イベントログ有効） ---")
+    if periodic_log:
+        every = sensor_log.period_ms // robot.sampler.period_ms  # 100ミリ秒ごと
+        robot.sampler.subscribe(sensor_log.on_sample, every=every)
     run_task(
         multitask(
-            sensor_logger_task(),  # センサー値を継続的にログに出力するタスク
+            robot.sampler.task(),  # センサーを読み、位置とログを更新し続けるタスク
             selector_task(),  # プログラム選択・実行タスク
         )
     )
 else:
     # ----- 本番モード（dev=False）の場合 -----
-    # セレクタータスクのみを実行します（センサーログなし）
+    # セレクタータスクのみを実行します（ログなし、robot.sampler も動かさない）
     #
     # 【なぜログをオフにする？】
-    # センサーログは便利ですが、コンピューターへのデータ送信に時間がかかります。
+    # ログは便利ですが、コンピューターへのデータ送信に時間がかかります。
     # 競技本番では、ログは不要なので、オフにすると動作が少し速くなります。
     #
+    # 【なぜ robot.sampler も動かさない？】
+    # 本番で sampler の値を使うのは [POSE] の表示（開発用）だけです。
+    # settle() や stall の監視は、sampler が動いていなければセンサーを直接読みます。
+    # 10ミリ秒ごとの読み取りとメモリの確保をしない分、走行中の負担が減ります。
+    #
     # 【実行されるタスク】
     # 1. selector_task() : ボタンでプログラムを選択・実行（通常版と同じ）
-    print("--- 本番モードで起動（センサーログなし） ---")
+    print("--- 本番モードで起動（ログなし） ---")
     run_task(multitask(selector_task()))  # プログラム選択・実行タスク（単独）
 
 # ========================================
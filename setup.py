@@ -18,11 +18,17 @@
 
 # ===== ライブラリのインポート =====
 # LEGOロボットを動かすために必要な道具を読み込みます
+from math import atan2, pi, sqrt  # 目標地点への向きと距離の計算（drive_to）
+
 from pybricks.hubs import PrimeHub  # ロボットの「脳みそ」（ハブ）を使うための道具
-from pybricks.parameters import Axis, Direction, Port  # ポート、軸、方向などの設定
+from pybricks.parameters import Axis, Direction, Port, Stop  # ポート、軸、方向、止め方などの設定
 from pybricks.pupdevices import Motor  # モーターを使うための道具
 from pybricks.robotics import DriveBase  # ロボットの移動機能を使うための道具
-from utils.control import apply_curve_settings, run_with_timeout
+from pybricks.tools import StopWatch, multitask, wait  # 時間を計る・同時に動かす・待つための道具
+from utils.control import DONE, race_with_timeout, step_log
+from utils.eventlog import event_log
+from utils.odometry import Odometry
+from utils.sampler import DRIVE_SPEED, MOTOR_SPEEDS, RATE, Sampler
 
 # ===== デフォルトの速度・加速度設定 =====
 # 各runファイルから共通で使用できる設定値
@@ -33,9 +39,55 @@ DEFAULT_STRAIGHT_SETTINGS = {"straight_speed": 400, "straight_acceleration": 500
 # 回転時の設定
 DEFAULT_TURN_SETTINGS = {"turn_rate": 240, "turn_acceleration": 850}
 
+# ===== ロボットの大きさ =====
+WHEEL_DIAMETER = 62  # タイヤの直径（mm）
+AXLE_TRACK = 115  # 左右のタイヤの間隔（mm）
+
 # カーブ時の設定
 DEFAULT_CURVE_SETTINGS = {"straight_speed": 240, "straight_acceleration": 800}
 
+# 名前つきの速度プロファイル
+# run からは robot.profile("precise") のように名前で使います。
+# ここを調整すれば、そのプロファイルを使っているすべての run に反映されます。
+PROFILES = {
+    # 既定（DEFAULT_STRAIGHT_SETTINGS + DEFAULT_TURN_SETTINGS）
+    "default": dict(DEFAULT_STRAIGHT_SETTINGS, **DEFAULT_TURN_SETTINGS),
+    # 速く移動したいとき（ミッションから離れた場所の移動など）
+    "fast": {
+        "straight_speed": 600,
+        "straight_acceleration": 800,
+        "turn_rate": 300,
+        "turn_acceleration": 1000,
+    },
+    # ゆっくり正確に動きたいとき（ミッションモデルに合わせる位置決めなど）
+    "precise": {
+        "straight_speed": 100,
+        "straight_acceleration": 200,
+        "turn_rate": 100,
+        "turn_acceleration": 300,
+    },
+    # ミッションモデルを押す・引くとき（低速で、急に力をかけない）
+    "push": {"straight_speed": 220, "straight_acceleration": 300},
+    # カーブするとき
+    "curve": DEFAULT_CURVE_SETTINGS,
+}
+
+# DriveBase.settings() の値の並び（引数なしで呼んだときに返るタプルと同じ順番）
+SETTINGS_KEYS = ("straight_speed", "straight_acceleration", "turn_rate", "turn_acceleration")
+
+# ===== 絶対的な向き・位置への移動（Robot.turn_to / drive_to 用） =====
+HEADING_TOLERANCE = 0.5  # drive_to で目標への向きとのずれがこれ未満なら回転しない（deg）
+DRIVE_TO_MIN_MM = 2  # drive_to で目標地点までがこれ未満なら動かない（mm）
+
+# Robot.run_table の ("L", 名前, ...) で使うモーター名（Robot.attach に渡す順番）
+TABLE_MOTORS = ("left_wheel", "right_wheel", "left", "right")
+
+# ===== 止まったかどうかの判定（Robot.settle 用） =====
+SETTLE_SPEED = 10  # 全モーターの回転速度がこれ未満なら止まっている（deg/s）
+SETTLE_RATE = 5  # ハブの回転（ジャイロの角速度）がこれ未満なら止まっている（deg/s）
+SETTLE_HOLD_MS = 20  # 止まった状態がこの時間続いたら settle を終える（ms）
+SETTLE_POLL_MS = 10  # 速度を読む間隔（ms）
+
 
 # ===== ハブの設定をする関数 =====
 def setup_hub():
@@ -87,6 +139,45 @@ def setup_motors():
     return left_wheel, right_wheel, left_lift, right_lift
 
 
+def _travel(step):
+    """blend の動作が進む向き（前進 1、後退 -1、その場回転 0）"""
+    if step[0] == "S":
+        distance = step[1]
+    elif step[0] == "C":
+        # pbio と同じく、進む向きは角度の符号で決まる（半径の符号は曲がる側だけ）
+        distance = step[2]
+    else:
+        return 0
+    return 1 if distance > 0 else -1 if distance < 0 else 0
+
+
+# ===== 速度プロファイルを一時的に使うクラス =====
+class ProfileScope:
+    """
+    with の間だけ速度・加速度を変えて、抜けるときに入る前の設定へ正確に戻すクラス
+    （MicroPython には contextlib がないのでクラスで実装）
+
+    Robot.profile() が返すので、直接作る必要はありません。
+    """
+
+    def __init__(self, robot, values):
+        self.robot = robot
+        self.values = values
+        self.saved = None
+
+    def __enter__(self):
+        if self.values:
+            self.saved = self.robot.settings()  # 入る前の設定（タプル）を覚える
+            self.robot.settings(**self.values)
+        return self.robot
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.saved is not None:
+            self.robot.settings(**dict(zip(SETTINGS_KEYS, self.saved)))
+            self.saved = None
+        return False
+
+
 # ===== Robotクラス（DriveBaseのラッパー） =====
 class Robot:
     """
@@ -100,51 +191,79 @@ class Robot:
     await robot.turn(90, rate=300)              # 300deg/sで90度回転
     await robot.curve(200, 45, speed=150)       # 150mm/sでカーブ
 
-    スピードを指定しない場合は、デフォルト設定が使われます。
+    スピードを指定しない場合は、今の設定（最初はデフォルト設定）が使われます。
+    よく使う速度の組み合わせは PROFILES に名前をつけて登録し、robot.profile(名前) で使います。
+
+    【settings のキャッシュ】
+    DriveBase に今かかっている速度・加速度を覚えておき、settings() では
+    値が変わったキーだけを DriveBase に送ります（同じ値なら何もしない）。
+    送った回数と省いた回数は settings_issued / settings_skipped で分かります。
     """
 
     def __init__(self, drivebase):
         """DriveBaseを受け取って初期化"""
         self._robot = drivebase
+        # DriveBase に今かかっている設定（最初に1回だけ DriveBase から読む）
+        self._settings = dict(zip(SETTINGS_KEYS, drivebase.settings()))
+        self.settings_issued = 0  # DriveBase.settings を実際に呼んだ回数
+        self.settings_skipped = 0  # 値が同じだったので呼ばずに済ませた回数
+        # settle() で見るハブとモーター（initialize_robot が attach で渡す）
+        self._hub = None
+        self._motors = ()
+        self.settle_count = 0  # settle() を呼んだ回数
+        self.settle_saved_ms = 0  # 固定の wait と比べて短くなった時間の合計
+        # 位置の推定（initialize_robot が Odometry を入れる）
+        self.odometry = None
+        # センサーのスナップショット（initialize_robot が Sampler を入れる）
+        self.sampler = None
+
+    def attach(self, hub, motors):
+        """
+        settle() で止まったかを確かめるハブ（ジャイロ）とモーターを渡す
+
+        motors は (左タイヤ, 右タイヤ, 左リフト, 右リフト) の順。
+        run_table() の ("L", 名前, ...) もこの順番でモーターを選びます。
+        """
+        self._hub = hub
+        self._motors = tuple(motors)
 
-    async def straight(self, distance, speed=None, acceleration=None, timeout=None):
+    async def straight(self, distance, speed=None, acceleration=None, timeout=None, stall_ms=None):
         """
-        直進する（スピード・タイムアウト指定可能）
+        直進する（スピード・タイムアウト・stall 検出指定可能）
 
         【パラメータ】
         - distance: 移動距離（mm）。正の値で前進、負の値で後退
-        - speed: 速度（mm/s）。省略時はデフォルト設定
-        - acceleration: 加速度（mm/s²）。省略時はデフォルト設定
+        - speed: 速度（mm/s）。省略時は今の設定のまま
+        - acceleration: 加速度（mm/s²）。省略時は今の設定のまま
         - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
-        """
-        # スピード設定
-        if speed is not None or acceleration is not None:
-            self._robot.settings(
-                straight_speed=(
-                    speed if speed is not None else DEFAULT_STRAIGHT_SETTINGS["straight_speed"]
-                ),
-                straight_acceleration=(
-                    acceleration
-                    if acceleration is not None
-                    else DEFAULT_STRAIGHT_SETTINGS["straight_acceleration"]
-                ),
-            )
+        - stall_ms: ミッションモデルに押し当てる動作用。速度が 20 mm/s 未満のまま
+          この時間（ミリ秒）続いたら、押し当たったとみなしてそこで止める。省略時は検出なし
 
-        if timeout is not None:
-            # タイムアウト付きで実行
-            await run_with_timeout(
-                start_fn=lambda: self._robot.straight(distance, wait=False),
-                done_fn=self._robot.done,
-                stop_fn=self._robot.stop,
-                timeout_ms=timeout,
-            )
-        else:
-            # 通常の実行（完了まで待つ）
-            await self._robot.straight(distance)
-
-        # デフォルト設定に戻す
-        if speed is not None or acceleration is not None:
-            self._robot.settings(**DEFAULT_STRAIGHT_SETTINGS)
+        speed / acceleration を指定したときは、終わったら指定前の設定に戻します。
+        最後まで動けたら True、タイムアウトや stall で止めたら False を返します。
+        """
+        with self.profile(straight_speed=speed, straight_acceleration=acceleration):
+            # ステップ記録（run_with_timing の表に出す）
+            step = step_log.start("straight", distance)
+            start_distance = self._robot.distance()
+
+            ending = DONE
+
+            if timeout is not None or stall_ms is not None:
+                # 動作の完了とタイマー・stall の監視を競わせる
+                ending = await race_with_timeout(
+                    self._robot.straight(distance),
+                    self._robot.stop,
+                    timeout,
+                    self._drive_speed,
+                    stall_ms,
+                )
+            else:
+                # 通常の実行（完了まで待つ）
+                await self._robot.straight(distance)
+
+            step_log.finish(step, self._robot.distance() - start_distance, ending)
+        return ending == DONE
 
     async def turn(self, angle, rate=None, acceleration=None, timeout=None):
         """
@@ -152,97 +271,340 @@ class Robot:
 
         【パラメータ】
         - angle: 回転角度（度）。正の値で右回転、負の値で左回転
-        - rate: 回転速度（deg/s）。省略時はデフォルト設定
-        - acceleration: 回転加速度（deg/s²）。省略時はデフォルト設定
+        - rate: 回転速度（deg/s）。省略時は今の設定のまま
+        - acceleration: 回転加速度（deg/s²）。省略時は今の設定のまま
         - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
+
+        rate / acceleration を指定したときは、終わったら指定前の設定に戻します。
+        最後まで動けたら True、タイムアウトで止めたら False を返します。
         """
-        # スピード設定
-        if rate is not None or acceleration is not None:
-            self._robot.settings(
-                turn_rate=rate if rate is not None else DEFAULT_TURN_SETTINGS["turn_rate"],
-                turn_acceleration=(
-                    acceleration
-                    if acceleration is not None
-                    else DEFAULT_TURN_SETTINGS["turn_acceleration"]
-                ),
-            )
+        with self.profile(turn_rate=rate, turn_acceleration=acceleration):
+            step = step_log.start("turn", angle)
+            start_angle = self._robot.angle()
+            ending = DONE
+
+            if timeout is not None:
+                # タイムアウト付きで実行（動作の完了とタイマーを競わせる）
+                ending = await race_with_timeout(
+                    self._robot.turn(angle), self._robot.stop, timeout
+                )
+            else:
+                # 通常の実行
+                await self._robot.turn(angle)
+
+            step_log.finish(step, self._robot.angle() - start_angle, ending)
+        return ending == DONE
+
+    async def turn_to(self, heading, rate=None, acceleration=None, timeout=None):
+        """
+        ジャイロの向きが heading（度）になるまで回転する（絶対的な向き）
 
-        if timeout is not None:
-            # タイムアウト付きで実行
-            await run_with_timeout(
-                start_fn=lambda: self._robot.turn(angle, wait=False),
-                done_fn=self._robot.done,
-                stop_fn=self._robot.stop,
-                timeout_ms=timeout,
-            )
-        else:
-            # 通常の実行
-            await self._robot.turn(angle)
+        【パラメータ】
+        - heading: 目標の向き（度）。スタート時の向きが 0、時計回りが正。
+          ジャイロと同じく 360 を超える値もそのまま使う（129 度から 374 度なら右に 245 度）
+        - rate / acceleration / timeout: turn() と同じ
 
-        # デフォルト設定に戻す
-        if rate is not None or acceleration is not None:
-            self._robot.settings(**DEFAULT_TURN_SETTINGS)
+        turn(角度) は「今の向きから何度」なので、前の動作のずれがそのまま残ります。
+        turn_to は毎回ジャイロの向きから回る角度を決めるので、それまでのずれも直ります。
+        最後まで動けたら True、タイムアウトで止めたら False を返します。
 
-    async def curve(self, radius, angle, speed=None, acceleration=None, timeout=None):
+        【使用例】
+        await robot.turn_to(90)  # スタート時から見て右向きにする
         """
-        カーブする（スピード・タイムアウト指定可能）
+        angle = heading - self._hub.imu.heading()
+        return await self.turn(angle, rate, acceleration, timeout)
+
+    async def drive_to(self, x, y, speed=None, backwards=False, timeout=None):
+        """
+        推定した位置（robot.pose()）から、地点 (x, y) に向きを変えて直進する
 
         【パラメータ】
-        - radius: カーブの半径（mm）
-        - angle: 回転角度（度）
-        - speed: 速度（mm/s）。省略時はデフォルト設定
-        - acceleration: 加速度（mm/s²）。省略時はデフォルト設定
-        - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
+        - x, y: 目標地点（mm）。スタート位置が原点、前方が +x、右が +y
+        - speed: 直進の速度（mm/s）。省略時は今の設定のまま
+        - backwards: True なら後ろ向きに走って目標地点に行く
+        - timeout: 直進のタイムアウト（ミリ秒）
+
+        回転は目標地点への向きに近い方（今の向きから ±180 度以内）に回ります。
+        最後まで動けたら True、タイムアウトで止めたら False を返します。
+        pose() を使うので、robot.sampler.task() の実行中だけ使えます（それ以外は RuntimeError）。
+
+        【使用例】
+        await robot.drive_to(650, 262)
         """
-        # スピード設定（指定があれば上書き）
-        apply_curve_settings(
-            self._robot.settings,
-            speed if speed is not None else None,
-            acceleration if acceleration is not None else None,
-        )
+        px, py, _ = self.pose()
+        heading = self._hub.imu.heading()
+        dx = x - px
+        dy = y - py
+        distance = sqrt(dx * dx + dy * dy)
+        if distance < DRIVE_TO_MIN_MM:
+            return True
+        bearing = atan2(dy, dx) * 180 / pi
+        if backwards:
+            bearing += 180
+            distance = -distance
+        # 今の向きから ±180 度以内で同じ向きになる角度を選ぶ
+        angle = (bearing - heading + 180) % 360 - 180
+        if abs(angle) >= HEADING_TOLERANCE:
+            await self.turn(angle)
+        return await self.straight(distance, speed, None, timeout)
+
+    async def curve(
+        self, radius, angle, speed=None, acceleration=None, timeout=None, stall_ms=None
+    ):
+        """
+        カーブする（スピード・タイムアウト・stall 検出指定可能）
 
-        if timeout is not None:
-            # タイムアウト付きで実行
-            await run_with_timeout(
-                start_fn=lambda: self._robot.curve(radius, angle, wait=False),
-                done_fn=self._robot.done,
-                stop_fn=self._robot.stop,
-                timeout_ms=timeout,
-            )
-        else:
-            # 通常の実行
-            await self._robot.curve(radius, angle)
+        【パラメータ】
+        - radius: カーブの半径（mm）。符号で曲がる側が決まる
+        - angle: 回転角度（度）。負の値で後ろ向きに進む
+        - speed: 速度（mm/s）。省略時は今の設定のまま
+        - acceleration: 加速度（mm/s²）。省略時は今の設定のまま
+        - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
+        - stall_ms: 速度が 20 mm/s 未満のままこの時間（ミリ秒）続いたら止める（straight と同じ）
 
-        # デフォルト設定に戻す
-        if speed is not None or acceleration is not None:
-            self._robot.settings(**DEFAULT_STRAIGHT_SETTINGS)
+        speed / acceleration を指定したときは、終わったら指定前の設定に戻します
+        （カーブ用プロファイルの中で使えば、カーブ用の設定に戻ります）。
+        最後まで動けたら True、タイムアウトや stall で止めたら False を返します。
+        """
+        with self.profile(straight_speed=speed, straight_acceleration=acceleration):
+            # カーブは「向きの変化」を目標・実績として記録する
+            step = step_log.start("curve", -angle if radius < 0 else angle)
+            start_angle = self._robot.angle()
+            ending = DONE
+
+            if timeout is not None or stall_ms is not None:
+                # 動作の完了とタイマー・stall の監視を競わせる
+                ending = await race_with_timeout(
+                    self._robot.curve(radius, angle),
+                    self._robot.stop,
+                    timeout,
+                    self._drive_speed,
+                    stall_ms,
+                )
+            else:
+                # 通常の実行
+                await self._robot.curve(radius, angle)
+
+            step_log.finish(step, self._robot.angle() - start_angle, ending)
+        return ending == DONE
+
+    def _drive_speed(self):
+        """今の直進速度（mm/s）。stall の監視に使う。"""
+        if self._sampling():
+            return self.sampler.values[DRIVE_SPEED]
+        return self._robot.state()[1]
+
+    def _sampling(self):
+        """sampler.task() が動いていて、スナップショットを読めばよいか"""
+        return self.sampler is not None and self.sampler.running
+
+    async def blend(self, steps):
+        """
+        直進とカーブを、間で止まらずにつなげて走る（モーションブレンド）
+
+        【パラメータ】
+        - steps: 動作の並び。次の形のタプルを並べたリスト
+            ("S", 距離)        … 直進（mm）
+            ("C", 半径, 角度)  … カーブ
+            ("T", 角度)        … その場で回転
+
+        【しくみ】
+        ふつうの straight() / curve() は、終わるたびに速度0まで減速して止まります。
+        blend() では、次も「同じ向きに進む直進かカーブ」のときだけ then=Stop.NONE で動かし、
+        止まらずにその速度のまま次の動作に入ります。
+        回転の前後、進む向きが変わるところ、最後の動作では、いつも通り止まります。
+        走行中は速度設定を変えられないので、速度を変えたいときは blend を分けてください。
 
-    async def run_motor(self, motor, speed, angle, timeout=None):
+        【使用例】
+        await robot.blend([("S", 300), ("C", 200, 45), ("S", 100)])
+        （("C", 120, -64) のように角度が負のカーブは後退なので、前進の動作とはつながらない）
+        """
+        last = len(steps) - 1
+        for i, step in enumerate(steps):
+            keep_moving = i < last and _travel(step) * _travel(steps[i + 1]) > 0
+            then = Stop.NONE if keep_moving else Stop.HOLD
+            kind = step[0]
+            if kind == "S":
+                record = step_log.start("straight", step[1])
+                start = self._robot.distance()
+                await self._robot.straight(step[1], then=then)
+                step_log.finish(record, self._robot.distance() - start)
+            elif kind == "C":
+                radius, angle = step[1], step[2]
+                record = step_log.start("curve", -angle if radius < 0 else angle)
+                start = self._robot.angle()
+                await self._robot.curve(radius, angle, then=then)
+                step_log.finish(record, self._robot.angle() - start)
+            elif kind == "T":
+                record = step_log.start("turn", step[1])
+                start = self._robot.angle()
+                await self._robot.turn(step[1])
+                step_log.finish(record, self._robot.angle() - start)
+            else:
+                raise ValueError("unknown step: {0}".format(step))
+
+    async def run_motor(self, motor, speed, angle, timeout=None, stall_ms=None):
         """
-        個別のモーターを回転させる（タイムアウト指定可能）
+        個別のモーターを回転させる（タイムアウト・stall 検出指定可能）
 
         【パラメータ】
         - motor: 対象のモーター（left_wheel, right_wheel, left_lift, right_liftなど）
         - speed: 回転速度（deg/s）
         - angle: 回転角度（度）
         - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
+        - stall_ms: 回転速度が 20 deg/s 未満のままこの時間（ミリ秒）続いたら止める。
+          アームをモデルに押し当てるときに使う。省略時は検出なし
+
+        最後まで動けたら True、タイムアウトや stall で止めたら False を返します。
 
         【使用例】
         await robot.run_motor(right_wheel, 200, 140, timeout=1500)
         await robot.run_motor(left_lift, 300, 180)
         """
-        if timeout is not None:
-            # タイムアウト付きで実行
-            await run_with_timeout(
-                start_fn=lambda: motor.run_angle(speed, angle, wait=False),
-                done_fn=lambda: motor.control.done(),
-                stop_fn=motor.stop,
-                timeout_ms=timeout,
+        step = step_log.start("motor", angle)
+        start_angle = motor.angle()
+        ending = DONE
+
+        if timeout is not None or stall_ms is not None:
+            # 動作の完了とタイマー・stall の監視を競わせる
+            ending = await race_with_timeout(
+                motor.run_angle(speed, angle), motor.stop, timeout, motor.speed, stall_ms
             )
         else:
             # 通常の実行（完了まで待つ）
             await motor.run_angle(speed, angle)
 
+        step_log.finish(step, motor.angle() - start_angle, ending)
+        return ending == DONE
+
+    async def parallel(self, *actions, race=False):
+        """
+        移動とアーム（リフト）の動作を同時に行う
+
+        【パラメータ】
+        - actions: 同時に行う動作（robot.straight(...) や robot.run_motor(...) など）
+        - race: True なら、どれか1つが終わった時点で残りを止める
+
+        【返り値】
+        それぞれの動作の結果のリスト（最後まで動けたら True、タイムアウトなら False）。
+        race=True で途中で止められた動作は None になります。
+
+        【使用例】
+        # リフトを回しながら後ろに下がる（リフトは8秒、移動は3秒でタイムアウト）
+        lift_done, drive_done = await robot.parallel(
+            robot.run_motor(right_lift, 1000, 180 * 40, timeout=8000),
+            robot.straight(-130, timeout=3000),
+        )
+
+        【注意】
+        タイヤ（DriveBase）を使う動作は同時に1つだけにしてください。
+        ひとつひとつの動作は、タイムアウトを含めてふだんと同じように動きます。
+        """
+        return await multitask(*actions, race=race)
+
+    async def run_table(self, table):
+        """
+        表（タプルの並び）に書いた動作を順番に実行する
+
+        【表の書き方】（省略した引数は None と同じ）
+            ("S", 距離, 速度, timeout, stall_ms)        … straight
+            ("T", 角度, 回転速度, timeout)               … turn
+            ("C", 半径, 角度, 速度, timeout, stall_ms)  … curve
+            ("L", モーター名, 速度, 角度, timeout, stall_ms) … run_motor
+                モーター名は "left" / "right"（リフト）、"left_wheel" / "right_wheel"
+            ("W", 上限ms)                               … settle（止まるまで待つ）
+            ("P", プロファイル名)                       … use_profile
+
+        【使用例】
+        TABLE = (
+            ("S", 590),
+            ("T", 40),
+            ("C", 850, 25, 200, 2000),
+            ("L", "left", 300, 180),
+        )
+        await robot.run_table(TABLE)
+
+        各動作は straight() などを呼ぶので、時間の記録・timeout・stall 検出はふだんと同じです。
+        すべて最後まで動けたら True、timeout や stall で止めた動作があれば False を返します。
+        """
+        completed = True
+        for step in table:
+            kind = step[0]
+            args = step[1:] + (None,) * (6 - len(step))
+            if kind == "S":
+                ok = await self.straight(args[0], args[1], None, args[2], args[3])
+            elif kind == "T":
+                ok = await self.turn(args[0], args[1], None, args[2])
+            elif kind == "C":
+                ok = await self.curve(args[0], args[1], args[2], None, args[3], args[4])
+            elif kind == "L":
+                motor = self._motors[TABLE_MOTORS.index(args[0])]
+                ok = await self.run_motor(motor, args[1], args[2], args[3], args[4])
+            elif kind == "W":
+                await self.settle(args[0])
+                ok = True
+            elif kind == "P":
+                self.use_profile(args[0])
+                ok = True
+            else:
+                raise ValueError("unknown step: {0}".format(step))
+            completed = completed and ok
+        return completed
+
+    async def settle(self, cap):
+        """
+        ロボットが止まるまで待つ（最大 cap ミリ秒）
+
+        【パラメータ】
+        - cap: 待つ時間の上限（ミリ秒）。置き換える前の wait() の値をそのまま入れる
+
+        【しくみ】
+        タイヤとリフトの回転速度（SETTLE_SPEED 未満）とジャイロの角速度（SETTLE_RATE 未満）が
+        SETTLE_HOLD_MS 続いたら、cap を待たずにすぐ戻ります。
+        止まらなければ cap で戻るので、wait(cap) より長くなることはありません。
+        短くなった時間は run の後に [SETTLE] で表示します。
+
+        【使用例】
+        await robot.settle(300)  # 以前の await wait(300)
+
+        実際に待った時間（ミリ秒）を返します。
+        """
+        step = step_log.start("settle", cap)
+        timer = StopWatch()
+        still_since = None
+        while True:
+            now = timer.time()
+            if now >= cap:
+                break
+            if self._still():
+                if still_since is None:
+                    still_since = now
+                elif now - still_since >= SETTLE_HOLD_MS:
+                    break
+            else:
+                still_since = None
+            await wait(min(SETTLE_POLL_MS, cap - now))
+        elapsed = timer.time()
+        self.settle_count += 1
+        self.settle_saved_ms += max(cap - elapsed, 0)
+        step_log.finish(step, elapsed)
+        return elapsed
+
+    def _still(self):
+        """タイヤ・リフトとハブの回転が止まっているか"""
+        if self._sampling():
+            values = self.sampler.values
+            for slot in MOTOR_SPEEDS:
+                if abs(values[slot]) >= SETTLE_SPEED:
+                    return False
+            return abs(values[RATE]) < SETTLE_RATE
+        for motor in self._motors:
+            if abs(motor.speed()) >= SETTLE_SPEED:
+                return False
+        if self._hub is not None and abs(self._hub.imu.angular_velocity(Axis.Z)) >= SETTLE_RATE:
+            return False
+        return True
+
     # ----- 元のDriveBaseのメソッドをそのまま使えるようにする -----
     def stop(self):
         """ロボットを停止"""
@@ -256,9 +618,84 @@ class Robot:
         """走行距離を取得"""
         return self._robot.distance()
 
+    def state(self):
+        """(走行距離, 直進速度, 回転角度, 回転速度) を取得"""
+        return self._robot.state()
+
     def settings(self, **kwargs):
-        """設定を変更（元のDriveBase.settingsと同じ）"""
-        self._robot.settings(**kwargs)
+        """
+        設定を変更（元のDriveBase.settingsと同じ）
+
+        引数なしで呼ぶと、今の設定を DriveBase.settings() と同じ並びのタプルで返します。
+        値が変わったキーだけを DriveBase に送り、何も変わらなければ呼び出しを省きます。
+        """
+        if not kwargs:
+            return tuple(self._settings[key] for key in SETTINGS_KEYS)
+        changed = {}
+        for key, value in kwargs.items():
+            if value is not None and self._settings.get(key) != value:
+                changed[key] = value
+        if not changed:
+            self.settings_skipped += 1
+            return None
+        self._robot.settings(**changed)
+        self._settings.update(changed)
+        self.settings_issued += 1
+        return None
+
+    def print_settings_stats(self):
+        """settings を DriveBase に送った回数と省いた回数を表示して、数え直す"""
+        print(
+            "[SETTINGS] issued {0}, skipped {1}".format(
+                self.settings_issued, self.settings_skipped
+            )
+        )
+        self.settings_issued = 0
+        self.settings_skipped = 0
+
+    def print_settle_stats(self):
+        """settle() の回数と、固定の wait と比べて短くなった時間を表示して、数え直す"""
+        if self.settle_count:
+            print(
+                "[SETTLE] {0} waits, saved {1} ms".format(self.settle_count, self.settle_saved_ms)
+            )
+        self.settle_count = 0
+        self.settle_saved_ms = 0
+
+    def profile(self, name=None, **overrides):
+        """
+        プロファイルを with の間だけ使う
+
+        【使用例】
+        with robot.profile("precise"):
+            await robot.straight(148)
+            await robot.turn(106)
+        # ここで with に入る前の設定に戻る
+
+        name を省略すると、overrides（straight_speed=... など）だけを適用します。
+        """
+        values = dict(PROFILES[name]) if name is not None else {}
+        for key, value in overrides.items():
+            if value is not None:
+                values[key] = value
+        return ProfileScope(self, values)
+
+    def use_profile(self, name):
+        """プロファイルを適用する（元に戻さない。run の最初に基準の設定を決めるとき用）"""
+        self.settings(**PROFILES[name])
+
+    def pose(self):
+        """
+        今のフィールド上の位置 (x mm, y mm, 向き deg) を返す
+
+        スタート位置が原点で、前方が +x、右が +y、向きは時計回りが正。
+        sampler.task() が 10 ms ごとのスナップショットで更新した値を返します。
+        sampler.task() が動いていないときは位置を正しく積分できないので RuntimeError にします
+        （まとめて1回で積分すると、曲がった道のりが直線になってしまう）。
+        """
+        if not self._sampling():
+            raise RuntimeError("robot.pose() は robot.sampler.task() の実行中だけ使えます")
+        return self.odometry.pose()
 
     def done(self):
         """現在の移動が完了したかどうか"""
@@ -294,8 +731,8 @@ def setup_robot_parameters(left_wheel, right_wheel):
     drivebase = DriveBase(
         left_wheel,  # 左タイヤのモーター
         right_wheel,  # 右タイヤのモーター
-        wheel_diameter=62,  # タイヤの直径（mm）
-        axle_track=115,  # 左右のタイヤの間隔（mm）
+        wheel_diameter=WHEEL_DIAMETER,  # タイヤの直径（mm）
+        axle_track=AXLE_TRACK,  # 左右のタイヤの間隔（mm）
     )
 
     # ----- デフォルトの速度・加速度を自動適用 -----
@@ -420,6 +857,8 @@ def initialize_robot():
     4. PID制御の設定
     5. センサーの初期化
     6. モーター角度のリセット
+    7. 位置の推定（robot.odometry）とセンサーのスナップショット（robot.sampler）の準備
+    8. イベントログ（動作の始まりと終わりの記録）の準備
 
     【返り値（戻ってくる値）】
     この関数は、以下の6つの情報を返します：
@@ -459,6 +898,19 @@ def initialize_robot():
     # ----- ステップ6: モーター角度のリセット -----
     reset_motor_angles(left_wheel, right_wheel, left_lift, right_lift)
 
+    # settle() で止まったかを確かめるために、ハブと全モーターを渡しておく
+    robot.attach(hub, (left_wheel, right_wheel, left_lift, right_lift))
+
+    # 位置の推定（robot.pose()）と、センサーを 10 ms ごとに1回だけ読むスナップショット。
+    # robot.sampler.task() を run と並行して動かすと、odometry もその値で更新される
+    robot.odometry = Odometry(hub, left_wheel, right_wheel, WHEEL_DIAMETER)
+    robot.sampler = Sampler(hub, robot, (left_wheel, right_wheel, left_lift, right_lift))
+    robot.sampler.subscribe(robot.odometry.on_sample)
+
+    # 動作の始まりと終わりを、記録中のイベントログにも書く（event_log.start() から）
+    event_log.attach(hub)
+    step_log.events = event_log
+
     print("=== ロボット初期化完了 ===")
 
     # ----- すべての設定情報を返す -----
@@ -0,0 +1,108 @@
+"""
+オフライン・シミュレーター。
+
+実機の SPIKE Prime ハブがなくても、setup.py / selector.py / runs/ を
+PC（Linux / Mac / Windows）の上でそのまま実行するための pybricks 互換バックエンドです。
+時間は仮想時計で進むので、数十秒の走行も一瞬で終わり、シミュレーション上の所要時間が分かります。
+
+使い方:
+    python -m sim runs/run03/m10_m11.py
+    python -m sim runs.run03.main
+
+Python から使う場合:
+    from sim import simulate
+    result = simulate("runs.run03.m10_m11")
+    print(result.duration_ms)
+"""
+
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def install():
+    """互換 pybricks を sys.path の先頭に差し込み、プロジェクトルートも import 可能にする。"""
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(1, PROJECT_ROOT)
+    loaded = sys.modules.get("pybricks")
+    if loaded is not None and not getattr(loaded, "__file__", "").startswith(BACKEND_DIR):
+        raise RuntimeError("the real pybricks package is already imported")
+
+
+def module_name(target):
+    """'runs/run03/m10_m11.py' のようなパスを 'runs.run03.m10_m11' に直す。"""
+    name = target.replace("\\", "/")
+    if name.endswith(".py"):
+        name = name[:-3]
+    if name.startswith("./"):
+        name = name[2:]
+    return name.replace("/", ".")
+
+
+class SimResult:
+    """1回のシミュレーション結果。"""
+
+    def __init__(self, name, duration_ms, wall_ms, log, pose, value=None):
+        self.name = name
+        self.duration_ms = duration_ms
+        self.wall_ms = wall_ms
+        self.log = log
+        self.pose = pose
+        self.value = value
+
+    def motions(self):
+        """settings 以外の動作ログ。"""
+        return [entry for entry in self.log if entry["kind"] != "settings"]
+
+    def summary(self):
+        return "[SIM] {0}: simulated {1:.2f} s (wall {2:.1f} ms, {3} motions)".format(
+            self.name, self.duration_ms / 1000, self.wall_ms, len(self.motions())
+        )
+
+
+def simulate(target, quiet=False, limit_ms=None):
+    """
+    runs/ のモジュール（run(hub, robot, ...) を持つもの）を初期化から終了まで実行する。
+
+    Args:
+        target: モジュール名またはファイルパス。run(hub, robot, ...) と同じ引数の
+            非同期関数をそのまま渡してもよい（sim.coalesce の再生用）。
+        quiet: True なら run 側の print を捨てる。
+        limit_ms: シミュレーション時間の上限（ms）。None なら無制限。
+
+    Returns:
+        SimResult
+    """
+    install()
+    import builtins
+
+    from sim import world as world_module
+    from sim.clock import clock, run_task
+
+    name = target.__name__ if callable(target) else module_name(target)
+    world_module.reset()
+    original_print = builtins.print
+    if quiet:
+        builtins.print = lambda *args, **kwargs: None
+    wall = time.perf_counter()
+    try:
+        from setup import initialize_robot
+
+        run = target if callable(target) else __import__(name, None, None, ["run"]).run
+        devices = initialize_robot()
+        # 初期化にかかった時間は数えず、run の開始を 0 ms とする
+        clock.now = 0.0
+        world_module.world.log = []
+        clock.limit_ms = limit_ms
+        value = run_task(run(*devices))
+    finally:
+        builtins.print = original_print
+    wall_ms = (time.perf_counter() - wall) * 1000
+    return SimResult(
+        name, clock.now, wall_ms, list(world_module.world.log), world_module.world.pose(), value
+    )
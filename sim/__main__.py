@@ -0,0 +1,53 @@
+"""
+シミュレーターのコマンドライン入口。
+
+例:
+    python -m sim runs/run03/m10_m11.py
+    python -m sim runs.run06.main --quiet
+    python -m sim selector.py --as-main --limit-ms 60000
+"""
+
+import argparse
+import runpy
+import time
+
+from sim import install, module_name, simulate
+from sim.clock import SimTimeLimit, clock
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sim", description=__doc__.splitlines()[1])
+    parser.add_argument("target", help="runs/ のモジュール名またはファイルパス")
+    parser.add_argument("--quiet", action="store_true", help="run 側の print を表示しない")
+    parser.add_argument("--limit-ms", type=int, default=None, help="シミュレーション時間の上限")
+    parser.add_argument(
+        "--as-main",
+        action="store_true",
+        help="run() を呼ばずに、ファイルを __main__ としてそのまま実行する",
+    )
+    args = parser.parse_args(argv)
+
+    if args.as_main:
+        install()
+        clock.limit_ms = args.limit_ms
+        wall = time.perf_counter()
+        try:
+            runpy.run_module(module_name(args.target), run_name="__main__")
+        except SimTimeLimit:
+            print("[SIM] time limit reached")
+        print(
+            "[SIM] {0}: simulated {1:.2f} s (wall {2:.1f} ms)".format(
+                args.target, clock.now / 1000, (time.perf_counter() - wall) * 1000
+            )
+        )
+        return 0
+
+    result = simulate(args.target, quiet=args.quiet, limit_ms=args.limit_ms)
+    x, y, heading = result.pose
+    print(result.summary())
+    print("[SIM] end pose: x={0:.0f} mm y={1:.0f} mm heading={2:.1f} deg".format(x, y, heading))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
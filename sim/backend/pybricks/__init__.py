@@ -0,0 +1,7 @@
+"""
+pybricks 互換パッケージ（シミュレーター用）。
+
+sim.install() で sys.path の先頭に置かれ、実機の pybricks の代わりに読み込まれます。
+"""
+
+version = ("sim", "3.6.1", "offline")
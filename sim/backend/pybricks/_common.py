@@ -0,0 +1,94 @@
+"""互換 pybricks の内部共通部品（Control と動作完了待ち）。"""
+
+from sim.clock import clock, drive
+
+
+class Control:
+    """Motor.control / DriveBase.distance_control 相当。設定値を覚えておくだけ。"""
+
+    def __init__(self, owner, speed, acceleration):
+        self._owner = owner
+        self._limits = [speed, acceleration, 200]
+        self._pid = [0, 0, 0, 0, 0]
+        self._target_tolerances = [50, 10]
+        self._stall_tolerances = [20, 200]
+
+    def limits(self, speed=None, acceleration=None, torque=None):
+        if speed is None and acceleration is None and torque is None:
+            return tuple(self._limits)
+        for i, value in enumerate((speed, acceleration, torque)):
+            if value is not None:
+                self._limits[i] = value
+        return None
+
+    def pid(self, kp=None, ki=None, kd=None, integral_deadzone=None, integral_rate=None):
+        values = (kp, ki, kd, integral_deadzone, integral_rate)
+        if all(v is None for v in values):
+            return tuple(self._pid)
+        for i, value in enumerate(values):
+            if value is not None:
+                self._pid[i] = value
+        return None
+
+    def target_tolerances(self, speed=None, position=None):
+        if speed is None and position is None:
+            return tuple(self._target_tolerances)
+        if speed is not None:
+            self._target_tolerances[0] = speed
+        if position is not None:
+            self._target_tolerances[1] = position
+        return None
+
+    def stall_tolerances(self, speed=None, time=None):
+        if speed is None and time is None:
+            return tuple(self._stall_tolerances)
+        if speed is not None:
+            self._stall_tolerances[0] = speed
+        if time is not None:
+            self._stall_tolerances[1] = time
+        return None
+
+    def done(self):
+        return self._owner.done()
+
+    def stalled(self):
+        return self._owner.stalled()
+
+
+class MotionAwaitable:
+    """動作が終わるまで待つ awaitable。キャンセルされたら動作を止める（Pybricks と同じ）。"""
+
+    def __init__(self, owner, motion):
+        self._owner = owner
+        self._motion = motion
+
+    def _active(self):
+        return self._owner.motion is self._motion and not self._motion.finished(clock.now)
+
+    def __await__(self):
+        try:
+            while self._active():
+                yield self._motion.end_ms
+        except GeneratorExit:
+            if self._active():
+                self._owner.stop()
+            raise
+
+
+def finish(owner, motion, wait):
+    """wait=True なら完了待ちの awaitable（run_task の外ではその場で完了まで進める）。"""
+    if not wait:
+        return _Done()
+    awaitable = MotionAwaitable(owner, motion)
+    if clock.running:
+        return awaitable
+    drive(awaitable)
+    return None
+
+
+class _Done:
+    """すでに完了している awaitable（wait=False の戻り値）。"""
+
+    def __await__(self):
+        return
+        yield
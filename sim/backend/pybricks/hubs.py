@@ -0,0 +1,152 @@
+"""pybricks.hubs 互換（PrimeHub）。"""
+
+import math
+
+from sim.clock import clock
+from sim.world import world
+
+from pybricks.parameters import Axis
+
+
+class _IMU:
+    """左右タイヤの差から向きを求める IMU。"""
+
+    def __init__(self):
+        self._heading_offset = 0.0
+
+    def heading(self):
+        return world.heading_at(clock.now) - self._heading_offset
+
+    def reset_heading(self, angle):
+        self._heading_offset = world.heading_at(clock.now) - angle
+
+    def angular_velocity(self, axis=None):
+        rate = 0.0
+        drivebase = world.drivebase
+        if drivebase is not None:
+            rate = drivebase.state()[3]
+        if axis is None:
+            return (0.0, 0.0, rate)
+        return rate if axis is Axis.Z else 0.0
+
+    def acceleration(self, axis=None):
+        return (0.0, 0.0, 9810.0) if axis is None else 0.0
+
+    def tilt(self):
+        return (0, 0)
+
+    def up(self):
+        return None
+
+    def ready(self):
+        return True
+
+    def stationary(self):
+        drivebase = world.drivebase
+        if drivebase is None:
+            return True
+        _, speed, _, rate = drivebase.state()
+        return math.isclose(speed, 0.0, abs_tol=1e-6) and math.isclose(rate, 0.0, abs_tol=1e-6)
+
+    def settings(self, *args, **kwargs):
+        return None
+
+
+class _Display:
+    def __init__(self):
+        self.shown = None
+
+    def char(self, char):
+        self.shown = char
+
+    def number(self, number):
+        self.shown = number
+
+    def text(self, text, on=500, off=50):
+        self.shown = text
+
+    def icon(self, icon):
+        self.shown = icon
+
+    def off(self):
+        self.shown = None
+
+    def orientation(self, up):
+        return None
+
+    def pixel(self, row, column, brightness=100):
+        return None
+
+
+class _Light:
+    def __init__(self):
+        self.color = None
+
+    def on(self, color):
+        self.color = color
+
+    def off(self):
+        self.color = None
+
+    def blink(self, color, durations):
+        self.color = color
+
+    def animate(self, colors, interval):
+        self.color = colors[0] if colors else None
+
+
+class _Buttons:
+    def pressed(self):
+        return world.buttons_at()
+
+
+class _Speaker:
+    def volume(self, volume=None):
+        return 100 if volume is None else None
+
+    def beep(self, frequency=500, duration=100):
+        return None
+
+    def play_notes(self, notes, tempo=120):
+        return None
+
+
+class _Battery:
+    def voltage(self):
+        return 8000
+
+    def current(self):
+        return 100
+
+
+class _System:
+    def __init__(self):
+        self.stop_button = None
+
+    def set_stop_button(self, button):
+        self.stop_button = button
+
+    def name(self):
+        return "Pybricks Sim"
+
+    def shutdown(self):
+        return None
+
+
+class PrimeHub:
+    """SPIKE Prime ハブ。"""
+
+    def __init__(
+        self, top_side=Axis.Z, front_side=Axis.X, broadcast_channel=None, observe_channels=None
+    ):
+        self.imu = _IMU()
+        self.display = _Display()
+        self.light = _Light()
+        self.buttons = _Buttons()
+        self.speaker = _Speaker()
+        self.battery = _Battery()
+        self.system = _System()
+        world.hub = self
+
+
+InventorHub = PrimeHub
@@ -0,0 +1,43 @@
+"""pybricks.parameters 互換の定数。"""
+
+
+class _Constant:
+    def __init__(self, group, name):
+        self._group = group
+        self._name = name
+
+    def __repr__(self):
+        return "{0}.{1}".format(self._group, self._name)
+
+
+def _constants(group, names):
+    return type(group, (), {name: _Constant(group, name) for name in names})
+
+
+Axis = _constants("Axis", ("X", "Y", "Z"))
+Side = _constants("Side", ("TOP", "BOTTOM", "FRONT", "BACK", "LEFT", "RIGHT"))
+Port = _constants("Port", ("A", "B", "C", "D", "E", "F"))
+Direction = _constants("Direction", ("CLOCKWISE", "COUNTERCLOCKWISE"))
+Stop = _constants("Stop", ("COAST", "COAST_SMART", "BRAKE", "HOLD", "NONE"))
+Button = _constants(
+    "Button", ("LEFT", "RIGHT", "CENTER", "BLUETOOTH", "UP", "DOWN", "LEFT_PLUS", "RIGHT_PLUS")
+)
+Color = _constants(
+    "Color",
+    (
+        "NONE",
+        "BLACK",
+        "GRAY",
+        "WHITE",
+        "RED",
+        "ORANGE",
+        "BROWN",
+        "YELLOW",
+        "GREEN",
+        "CYAN",
+        "BLUE",
+        "VIOLET",
+        "MAGENTA",
+    ),
+)
+Icon = _constants("Icon", ("HEART", "HAPPY", "SAD", "UP", "DOWN", "LEFT", "RIGHT", "FULL", "EMPTY"))
@@ -0,0 +1,189 @@
+"""pybricks.pupdevices 互換（Motor / ForceSensor）。"""
+
+from sim.clock import clock
+from sim.kinematics import MOTOR_ACCELERATION, MOTOR_MAX_SPEED, Motion, Profile, Ramp
+from sim.world import world
+
+from pybricks._common import Control, finish
+from pybricks.parameters import Direction, Stop
+
+
+class Motor:
+    """
+    台形プロファイルで回るモーター。
+
+    角度は「確定済みの角度 + 自分の動作中の変化 + DriveBase の動作中の変化」で求めます。
+    """
+
+    def __init__(
+        self,
+        port,
+        positive_direction=Direction.CLOCKWISE,
+        gears=None,
+        reset_angle=True,
+        profile=None,
+    ):
+        self.port = port
+        self.positive_direction = positive_direction
+        self.control = Control(self, MOTOR_MAX_SPEED, MOTOR_ACCELERATION)
+        self.motion = None
+        self.drivebase = None
+        self._pos = 0.0
+        self._offset = 0.0
+        world.add_motor(port, self)
+
+    # ----- 状態 -----
+    def raw_angle(self, t):
+        angle = self._pos
+        if self.motion is not None:
+            angle += self.motion.positions(t)[0]
+        if self.drivebase is not None:
+            angle += self.drivebase.wheel_angle(self, t)
+        return angle
+
+    def raw_speed(self, t):
+        speed = 0.0
+        if self.motion is not None:
+            speed += self.motion.velocities(t)[0]
+        if self.drivebase is not None:
+            speed += self.drivebase.wheel_speed(self, t)
+        return speed
+
+    def angle(self):
+        return int(round(self.raw_angle(clock.now) - self._offset))
+
+    def speed(self, window=None):
+        return int(round(self.raw_speed(clock.now)))
+
+    def load(self):
+        return 0
+
+    def stalled(self):
+        if self.motion is None:
+            return False
+        return self.motion.stalled(clock.now, self.control.stall_tolerances()[1])
+
+    def done(self):
+        return self.motion is None or self.motion.finished(clock.now)
+
+    def reset_angle(self, angle=None):
+        if angle is None:
+            angle = 0
+        self._offset = self.raw_angle(clock.now) - angle
+
+    # ----- 動作 -----
+    def commit(self):
+        """動作中の変化を確定させて動作を終える。"""
+        if self.motion is not None:
+            world.end(self.motion)
+            self._pos += self.motion.positions(clock.now)[0]
+            self.motion = None
+
+    def _start(self, profile):
+        world.sync()
+        if self.drivebase is not None:
+            self.drivebase.commit()
+        self.commit()
+        self.motion = Motion(clock.now, [profile])
+        world.take_block(self.port, self.motion)
+        return self.motion
+
+    def _limited(self, speed):
+        max_speed, acceleration, _ = self.control.limits()
+        return min(abs(speed), max_speed), acceleration
+
+    def run_angle(self, speed, rotation_angle, then=Stop.HOLD, wait=True):
+        direction = -1 if speed < 0 else 1
+        speed, acceleration = self._limited(speed)
+        if speed == 0 or rotation_angle == 0:
+            world.sync()
+            self.commit()
+            return finish(self, None, False)
+        profile = Profile(direction * rotation_angle, speed, acceleration)
+        motion = self._start(profile)
+        motion.entry = world.record(
+            "run_angle",
+            direction * rotation_angle,
+            profile.duration * 1000,
+            port=self.port,
+            speed=speed,
+        )
+        return finish(self, motion, wait)
+
+    def run_target(self, speed, target_angle, then=Stop.HOLD, wait=True):
+        return self.run_angle(abs(speed), target_angle - self.angle(), then, wait)
+
+    def run_time(self, speed, time, then=Stop.HOLD, wait=True):
+        speed_limited, acceleration = self._limited(speed)
+        accel = acceleration[0] if isinstance(acceleration, (tuple, list)) else acceleration
+        seconds = time / 1000
+        # 台形の面積が与えられた時間に収まる移動量を求める
+        ramp = min(speed_limited / accel, seconds / 2)
+        peak = accel * ramp
+        rotation = peak * (seconds - ramp)
+        if rotation <= 0:
+            return self.run_angle(speed, 0, then, wait)
+        return self.run_angle(peak if speed >= 0 else -peak, rotation, then, wait)
+
+    def run(self, speed):
+        world.sync()
+        if self.drivebase is not None:
+            self.drivebase.commit()
+        current = self.raw_speed(clock.now)
+        self.commit()
+        speed_limited, acceleration = self._limited(speed)
+        target = speed_limited if speed >= 0 else -speed_limited
+        self.motion = Motion(clock.now, [Ramp(target, acceleration, current)])
+
+    def run_until_stalled(self, speed, then=Stop.COAST, duty_limit=None):
+        # 障害物はモデル化していないので、すぐに止まったことにする
+        return finish(self, None, False)
+
+    def stop(self):
+        world.sync()
+        self.commit()
+        if self.drivebase is not None and self.drivebase.motion is not None:
+            self.drivebase.stop()
+
+    def brake(self):
+        self.stop()
+
+    def hold(self):
+        self.stop()
+
+    def dc(self, duty):
+        self.run(duty * 10)
+
+    def track_target(self, target_angle):
+        self.stop()
+        self._pos += target_angle - self.angle()
+
+
+class ForceSensor:
+    """台本（world.press_force）どおりに押されるフォースセンサー。"""
+
+    def __init__(self, port):
+        self.port = port
+
+    def force(self):
+        return Reading(world.force_at(self.port))
+
+    def distance(self):
+        return Reading(8.0 if world.force_at(self.port) > 0 else 0.0)
+
+    def pressed(self, force=3):
+        return world.force_at(self.port) >= force
+
+    def touched(self):
+        return world.force_at(self.port) > 0
+
+
+class Reading(float):
+    """そのまま数値としても、await しても使える測定値。
+
+    Pybricks のセンサー値は run_task の中では await で読み出すため、その両方に対応する。
+    """
+
+    def __await__(self):
+        return float(self)
+        yield
@@ -0,0 +1,213 @@
+"""pybricks.robotics 互換（DriveBase）。"""
+
+import math
+
+from sim.clock import clock
+from sim.kinematics import Motion, Profile, Ramp, curve_geometry
+from sim.world import world
+
+from pybricks._common import Control, finish
+from pybricks.parameters import Stop
+
+
+class DriveBase:
+    """
+    左右2つのモーターで動く台車。
+
+    straight / turn / curve は距離と向きの2軸の台形プロファイルとして動き、
+    その変化を左右のタイヤの角度に振り分けます。
+    then=Stop.NONE のときは止まらずに、次の動作へ速度を引き継ぎます。
+    """
+
+    def __init__(self, left_motor, right_motor, wheel_diameter, axle_track):
+        self.left = left_motor
+        self.right = right_motor
+        self.wheel_diameter = wheel_diameter
+        self.axle_track = axle_track
+        self.motion = None
+        self._distance_offset = 0.0
+        self._angle_offset = 0.0
+        self._gyro = False
+        self._settings = {
+            "straight_speed": 230,
+            "straight_acceleration": 830,
+            "turn_rate": 310,
+            "turn_acceleration": 1300,
+        }
+        self.distance_control = Control(self, 1000, 2000)
+        self.heading_control = Control(self, 1000, 2000)
+        left_motor.drivebase = self
+        right_motor.drivebase = self
+        world.drivebase = self
+
+    # ----- 単位変換 -----
+    def _deg_per_mm(self):
+        return 360 / (math.pi * self.wheel_diameter)
+
+    def _wheel_split(self, motor, distance, heading):
+        """(距離 mm, 向き deg) の変化を motor のタイヤ角度（deg）に直す。"""
+        arc = math.radians(heading) * self.axle_track / 2
+        mm = distance + arc if motor is self.left else distance - arc
+        return mm * self._deg_per_mm()
+
+    def wheel_angle(self, motor, t):
+        if self.motion is None:
+            return 0.0
+        distance, heading = self.motion.positions(t)
+        return self._wheel_split(motor, distance, heading)
+
+    def wheel_speed(self, motor, t):
+        if self.motion is None:
+            return 0.0
+        speed, rate = self.motion.velocities(t)
+        return self._wheel_split(motor, speed, rate)
+
+    # ----- 状態 -----
+    def _raw_distance(self):
+        mm_per_deg = 1 / self._deg_per_mm()
+        now = clock.now
+        return (self.left.raw_angle(now) + self.right.raw_angle(now)) / 2 * mm_per_deg
+
+    def _raw_angle(self):
+        return world.heading_at(clock.now)
+
+    def distance(self):
+        return int(round(self._raw_distance() - self._distance_offset))
+
+    def angle(self):
+        return self._raw_angle() - self._angle_offset
+
+    def state(self):
+        now = clock.now
+        mm_per_deg = 1 / self._deg_per_mm()
+        left = self.left.raw_speed(now) * mm_per_deg
+        right = self.right.raw_speed(now) * mm_per_deg
+        speed = (left + right) / 2
+        rate = math.degrees((left - right) / self.axle_track)
+        return self.distance(), speed, self.angle(), rate
+
+    def reset(self, distance=0, angle=0):
+        self._distance_offset = self._raw_distance() - distance
+        self._angle_offset = self._raw_angle() - angle
+
+    def done(self):
+        return self.motion is None or self.motion.finished(clock.now)
+
+    def stalled(self):
+        if self.motion is None:
+            return False
+        return self.motion.stalled(clock.now, self.distance_control.stall_tolerances()[1])
+
+    def use_gyro(self, use_gyro):
+        self._gyro = bool(use_gyro)
+
+    def settings(
+        self,
+        straight_speed=None,
+        straight_acceleration=None,
+        turn_rate=None,
+        turn_acceleration=None,
+    ):
+        values = {
+            "straight_speed": straight_speed,
+            "straight_acceleration": straight_acceleration,
+            "turn_rate": turn_rate,
+            "turn_acceleration": turn_acceleration,
+        }
+        if all(v is None for v in values.values()):
+            s = self._settings
+            return (
+                s["straight_speed"],
+                s["straight_acceleration"],
+                s["turn_rate"],
+                s["turn_acceleration"],
+            )
+        for key, value in values.items():
+            if value is not None:
+                self._settings[key] = value
+        applied = {k: v for k, v in values.items() if v is not None}
+        world.record("settings", None, 0.0, values=applied)
+        return None
+
+    # ----- 動作 -----
+    def commit(self):
+        """動作中の変化を左右のタイヤに確定させる。"""
+        if self.motion is None:
+            return
+        now = clock.now
+        world.end(self.motion)
+        distance, heading = self.motion.positions(now)
+        for motor in (self.left, self.right):
+            motor._pos += self._wheel_split(motor, distance, heading)
+        self.motion = None
+
+    def _carry(self):
+        """動作中なら (直進速度, 回転速度) を返す。then=Stop.NONE のつなぎ用。"""
+        now = clock.now
+        if self.motion is None or (self.motion.finished(now) and not self.motion.keep_moving):
+            return 0.0, 0.0
+        speed, rate = self.motion.velocities(now)
+        return speed, rate
+
+    def _start(self, kind, target, distance, heading, then):
+        world.sync()
+        speed, rate = self._carry()
+        self.commit()
+        for motor in (self.left, self.right):
+            motor.commit()
+        s = self._settings
+        keep_moving = then is Stop.NONE
+        # 同じ向きに動いていれば、その速度から加速を始める
+        v0 = abs(speed) if speed * distance > 0 else 0.0
+        w0 = abs(rate) if rate * heading > 0 else 0.0
+        v_end = s["straight_speed"] if keep_moving and distance else 0.0
+        w_end = s["turn_rate"] if keep_moving and heading else 0.0
+        profiles = [
+            Profile(distance, s["straight_speed"], s["straight_acceleration"], v0, v_end),
+            Profile(heading, s["turn_rate"], s["turn_acceleration"], w0, w_end),
+        ]
+        self.motion = Motion(clock.now, profiles, keep_moving)
+        world.take_block(None, self.motion)
+        self.motion.entry = world.record(
+            kind,
+            target,
+            self.motion.duration * 1000,
+            settings=self.settings(),
+            then=then,
+            v0=abs(speed),
+        )
+        return self.motion
+
+    def straight(self, distance, then=Stop.HOLD, wait=True):
+        motion = self._start("straight", distance, distance, 0, then)
+        return finish(self, motion, wait)
+
+    def turn(self, angle, then=Stop.HOLD, wait=True):
+        motion = self._start("turn", angle, 0, angle, then)
+        return finish(self, motion, wait)
+
+    def curve(self, radius, angle, then=Stop.HOLD, wait=True):
+        arc_length, arc_angle = curve_geometry(radius, angle)
+        motion = self._start("curve", (radius, angle), arc_length, arc_angle, then)
+        return finish(self, motion, wait)
+
+    def drive(self, speed, turn_rate):
+        world.sync()
+        current_speed, current_rate = self._carry()
+        self.commit()
+        s = self._settings
+        self.motion = Motion(
+            clock.now,
+            [
+                Ramp(speed, s["straight_acceleration"], current_speed),
+                Ramp(turn_rate, s["turn_acceleration"], current_rate),
+            ],
+            keep_moving=True,
+        )
+
+    def stop(self):
+        world.sync()
+        self.commit()
+
+    def brake(self):
+        self.stop()
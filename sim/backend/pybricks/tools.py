@@ -0,0 +1,45 @@
+"""pybricks.tools 互換（仮想時計の上で動く wait / StopWatch / multitask / run_task）。"""
+
+from sim.clock import MultiTask, Wait, clock, drive, run_task
+
+
+def wait(time):
+    """time ミリ秒待つ。run_task の中では awaitable、外では即座に時計を進める。"""
+    if clock.running:
+        return Wait(time)
+    drive(Wait(time))
+    return None
+
+
+def multitask(*coroutines, race=False):
+    """複数のタスクを同時に実行する awaitable を返す。"""
+    return MultiTask(coroutines, race=race)
+
+
+class StopWatch:
+    """仮想時計で計測するストップウォッチ。"""
+
+    def __init__(self):
+        self._start = clock.now
+        self._paused_at = None
+
+    def time(self):
+        now = self._paused_at if self._paused_at is not None else clock.now
+        return int(now - self._start)
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = clock.now
+
+    def resume(self):
+        if self._paused_at is not None:
+            self._start += clock.now - self._paused_at
+            self._paused_at = None
+
+    def reset(self):
+        self._start = clock.now
+        if self._paused_at is not None:
+            self._paused_at = clock.now
+
+
+__all__ = ["wait", "multitask", "run_task", "StopWatch"]
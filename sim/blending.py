@@ -0,0 +1,175 @@
+"""
+モーションブレンドで短くなる時間の見積もり。
+
+各 run をシミュレーターで実行し、間に wait や他の動作、settings の変更をはさまずに続く
+「同じ向きに進む直進・カーブ」の並びを探します。その並びを Robot.blend() でつないだ場合
+（途中で止まらず then=Stop.NONE で次に入る場合）の時間を台形プロファイルで求め、今の時間と比べます。
+
+シミュレーターは Stop.HOLD の後の「止まりきるまでの待ち」を計算に入れていないので、
+実機で短くなる時間はこれより少し大きくなります。
+カーブの進む向きは pbio と同じく角度の符号で決まります（負なら後退）。
+
+使い方:
+    python -m sim.blending                      # 全 run（各 main.py の ACTIVE_VARIANT）
+    python -m sim.blending runs/run02/m09_m07.py
+"""
+
+import argparse
+
+from sim import simulate
+from sim.estimator import active_variants, describe
+from sim.kinematics import Motion, Profile, curve_geometry
+
+BLENDABLE_KINDS = ("straight", "curve")
+
+# これ未満のすき間なら「続けて動いている」とみなす（ms）
+CONTIGUOUS_MS = 1
+
+
+def travel(entry):
+    """動作ログの1件が (進む距離 mm, 向きの変化 deg) のどちらに動くか。"""
+    if entry["kind"] == "straight":
+        return entry["target"], 0.0
+    if entry["kind"] == "turn":
+        return 0.0, entry["target"]
+    return curve_geometry(*entry["target"])
+
+
+def joinable(previous, entry):
+    """previous の後に止まらず entry をつなげられるか。"""
+    if "stopped" in previous or "stopped" in entry:
+        # timeout で打ち切られた動作はつながない
+        return False
+    if travel(previous)[0] * travel(entry)[0] <= 0:
+        return False
+    if previous["settings"] != entry["settings"]:
+        return False
+    return entry["t"] - (previous["t"] + previous["duration"]) < CONTIGUOUS_MS
+
+
+def chains(log):
+    """止まらずにつなげられる動作の並び（2件以上）のリストを返す。"""
+    result = []
+    current = []
+    for entry in log:
+        if entry["kind"] in BLENDABLE_KINDS and current and joinable(current[-1], entry):
+            current.append(entry)
+            continue
+        if len(current) > 1:
+            result.append(current)
+        current = [entry] if entry["kind"] in BLENDABLE_KINDS else []
+    if len(current) > 1:
+        result.append(current)
+    return result
+
+
+def stop_reasons(log):
+    """
+    走行の動作どうしの間で止まった回数を、つなげられない理由ごとに数える。
+
+    理由: blend（つなげられる）/ reverse（進む向きが逆）/ turn（その場回転の前後）/
+    settings（速度設定が違う）/ timeout（打ち切り）/ pause（wait などで間があく）
+    """
+    counts = {}
+    previous = None
+    for entry in log:
+        if entry["kind"] not in BLENDABLE_KINDS + ("turn",):
+            if entry["kind"] != "settings":
+                previous = None
+            continue
+        if previous is not None:
+            if joinable(previous, entry):
+                reason = "blend"
+            elif entry["t"] - (previous["t"] + previous["duration"]) >= CONTIGUOUS_MS:
+                reason = "pause"
+            elif "turn" in (previous["kind"], entry["kind"]):
+                reason = "turn"
+            elif "stopped" in previous or "stopped" in entry:
+                reason = "timeout"
+            elif travel(previous)[0] * travel(entry)[0] <= 0:
+                reason = "reverse"
+            else:
+                reason = "settings"
+            counts[reason] = counts.get(reason, 0) + 1
+        previous = entry
+    return counts
+
+
+def blended_ms(chain):
+    """chain を止まらずにつないだときの所要時間（ms）。シミュレーターの then=Stop.NONE と同じ式。"""
+    total = 0.0
+    speed_carry = rate_carry = 0.0
+    last = len(chain) - 1
+    for i, entry in enumerate(chain):
+        speed, accel, rate, turn_accel = entry["settings"]
+        distance, heading = travel(entry)
+        keep_moving = i < last
+        # 同じ向きに動いていれば、その速度から加速を始める
+        v0 = abs(speed_carry) if speed_carry * distance > 0 else 0.0
+        w0 = abs(rate_carry) if rate_carry * heading > 0 else 0.0
+        v1 = speed if keep_moving and distance else 0.0
+        w1 = rate if keep_moving and heading else 0.0
+        profiles = [
+            Profile(distance, speed, accel, v0, v1),
+            Profile(heading, rate, turn_accel, w0, w1),
+        ]
+        motion = Motion(0.0, profiles, keep_moving)
+        total += motion.duration * 1000
+        speed_carry, rate_carry = motion.velocities(motion.end_ms)
+    return total
+
+
+class Saving:
+    """1つの並びについて、今の時間とブレンドしたときの時間。"""
+
+    def __init__(self, chain):
+        self.labels = [describe(entry)[0] for entry in chain]
+        self.start_ms = chain[0]["t"]
+        self.current_ms = sum(entry["duration"] for entry in chain)
+        self.blended_ms = min(blended_ms(chain), self.current_ms)
+
+    @property
+    def saved_ms(self):
+        return self.current_ms - self.blended_ms
+
+
+def savings(target):
+    """target（run のモジュール名またはパス）の (名前, [Saving, ...], 止まった理由の数) を返す。"""
+    result = simulate(target, quiet=True)
+    items = [Saving(chain) for chain in chains(result.log)]
+    return result.name, items, stop_reasons(result.log)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sim.blending")
+    parser.add_argument("targets", nargs="*", help="run のモジュール名またはパス（省略時は全 run）")
+    args = parser.parse_args(argv)
+
+    total = 0.0
+    print("== blend savings ==")
+    for target in args.targets or active_variants():
+        name, items, reasons = savings(target)
+        saved = sum(item.saved_ms for item in items)
+        total += saved
+        print(
+            "  {0:<32} {1:6.2f} s   stops: {2}".format(
+                name,
+                saved / 1000,
+                ", ".join("{0} {1}".format(k, v) for k, v in sorted(reasons.items())) or "-",
+            )
+        )
+        for item in items:
+            print(
+                "    {0:8.2f}  {1:<48} {2:6.2f} -> {3:6.2f} s".format(
+                    item.start_ms / 1000,
+                    " + ".join(item.labels),
+                    item.current_ms / 1000,
+                    item.blended_ms / 1000,
+                )
+            )
+    print("  {0:<32} {1:6.2f} s".format("total", total / 1000))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+"""
+仮想時計と協調スケジューラー。
+
+シミュレーター内の待ち（wait やモーターの完了待ち）は「次に起きる時刻（ms）」を yield します。
+スケジューラーは実時間で待たずに、その時刻まで仮想時計を一気に進めます。
+そのため 30 秒の走行でも数ミリ秒で終わります。
+"""
+
+import math
+
+# 1回のスケジュールで最低限進める時間（ms）。Pybricks のループ周期に近い値。
+TICK_MS = 1
+
+
+class SimTimeLimit(BaseException):
+    """シミュレーション時間の上限を超えたときに送出する。
+
+    run 側の ``except Exception`` に握りつぶされないよう BaseException を継承する。
+    """
+
+
+class Clock:
+    """仮想時計（ms）。"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.running = False
+        self.limit_ms = None
+
+    def reset(self):
+        self.now = 0.0
+        self.running = False
+        self.limit_ms = None
+
+    def advance(self, deadline):
+        """deadline まで時計を進める（少なくとも TICK_MS は進める）。"""
+        target = self.now + TICK_MS
+        if deadline is not None and deadline != math.inf and deadline > target:
+            target = deadline
+        if self.limit_ms is not None and target > self.limit_ms:
+            self.now = self.limit_ms
+            raise SimTimeLimit("simulated time limit reached ({0} ms)".format(self.limit_ms))
+        self.now = target
+
+
+clock = Clock()
+
+
+def _iterate(awaitable):
+    """コルーチン・awaitable を send() できるイテレーターにする。"""
+    if hasattr(awaitable, "send"):
+        return awaitable
+    return awaitable.__await__()
+
+
+def drive(awaitable):
+    """awaitable を最後まで実行し、戻り値を返す（run_task とブロッキング呼び出しの共通部分）。"""
+    it = _iterate(awaitable)
+    while True:
+        try:
+            deadline = it.send(None)
+        except StopIteration as stop:
+            return stop.value
+        clock.advance(deadline)
+
+
+def run_task(main):
+    """pybricks.tools.run_task 相当。仮想時計の上でメインタスクを実行する。"""
+    clock.running = True
+    try:
+        return drive(main)
+    finally:
+        clock.running = False
+
+
+class Wait:
+    """指定時間だけ待つ awaitable。"""
+
+    def __init__(self, ms):
+        self.until = clock.now + max(ms, 0)
+
+    def __await__(self):
+        # wait(0) でも1回は他のタスクに順番を譲る
+        yield self.until
+        while clock.now < self.until:
+            yield self.until
+
+
+class MultiTask:
+    """pybricks.tools.multitask 相当。各タスクを1回ずつ進めるラウンドロビン。"""
+
+    def __init__(self, coroutines, race=False):
+        self.coroutines = coroutines
+        self.race = race
+
+    def __await__(self):
+        tasks = [_iterate(c) for c in self.coroutines]
+        results = [None] * len(tasks)
+        active = list(range(len(tasks)))
+        try:
+            while active:
+                deadlines = []
+                for i in list(active):
+                    try:
+                        deadlines.append(tasks[i].send(None))
+                    except StopIteration as stop:
+                        results[i] = stop.value
+                        active.remove(i)
+                        if self.race:
+                            return results
+                if not active:
+                    break
+                known = [d for d in deadlines if d is not None]
+                yield min(known) if len(known) == len(deadlines) else None
+            return results
+        finally:
+            # race で終わったときやキャンセル時は残りのタスクを閉じる（Pybricks と同じ）
+            for i in active:
+                try:
+                    tasks[i].close()
+                except (AttributeError, RuntimeError):
+                    pass
@@ -0,0 +1,277 @@
+"""
+コマンド列のまとめ（コアレス）。
+
+各 run をシミュレーターで実行して記録したコマンド列から、次のものをまとめた短い列を作ります。
+
+- 続けて同じ向きに動く同じ種類の動作（同じ設定の直進・回転・同じ半径のカーブ、
+  同じモーター・同じ速度の run_angle）を1つにする。間の wait / settle もなくなる
+- 次の走行で使われる前に上書きされる settings や、値の変わらない settings を消す
+
+元の列とまとめた列をそれぞれシミュレーターで再生し、終了位置（x, y, 向き）と
+全モーターの角度が同じになることを確かめてから、短くなる時間を表示します。
+timeout / stall で打ち切られた動作、同時に動いている動作、then=Stop.NONE の動作はまとめません。
+
+使い方:
+    python -m sim.coalesce                      # 全 run（各 main.py の ACTIVE_VARIANT）
+    python -m sim.coalesce runs/run01/m08_m06_m05.py --code
+"""
+
+import argparse
+
+from sim import install, simulate
+from sim.estimator import MOTION_KINDS, active_variants, describe
+
+# これ未満のすき間は「続けて動いている」とみなす（ms）
+CONTIGUOUS_MS = 1
+
+# 終了位置が同じとみなす誤差（mm / deg）
+POSE_TOLERANCE_MM = 1.0
+POSE_TOLERANCE_DEG = 0.5
+
+
+def plan_from_log(log):
+    """
+    動作ログを再生できるコマンド列にする。
+
+    各動作には、その前の何もしていない時間 "pause"（ms）とまとめた数 "count" を付けます。
+    同時に動いている動作や then=Stop.NONE の動作があれば、順番に再生できないので None を返します。
+    """
+    plan = []
+    busy_until = 0.0
+    for entry in log:
+        item = dict(entry)
+        if entry["kind"] == "settings":
+            plan.append(item)
+            continue
+        if entry["kind"] not in MOTION_KINDS:
+            return None
+        if entry["t"] < busy_until - CONTIGUOUS_MS:
+            return None
+        if "then" in entry and repr(entry["then"]) != "Stop.HOLD":
+            return None
+        item["pause"] = max(entry["t"] - busy_until, 0.0)
+        item["count"] = 1
+        busy_until = entry.get("stopped", entry["t"] + entry["duration"])
+        plan.append(item)
+    return plan
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def mergeable(previous, item):
+    """previous と item を1つの動作にまとめられるか。"""
+    if previous["kind"] != item["kind"] or "stopped" in previous or "stopped" in item:
+        return False
+    kind = item["kind"]
+    if kind == "run_angle":
+        return (
+            previous["port"] == item["port"]
+            and previous["speed"] == item["speed"]
+            and _sign(previous["target"]) == _sign(item["target"])
+        )
+    if previous["settings"] != item["settings"]:
+        return False
+    if kind == "curve":
+        (radius0, angle0), (radius1, angle1) = previous["target"], item["target"]
+        return radius0 == radius1 and _sign(angle0) == _sign(angle1)
+    return _sign(previous["target"]) == _sign(item["target"])
+
+
+def _merge(previous, item):
+    merged = dict(previous)
+    if item["kind"] == "curve":
+        merged["target"] = (previous["target"][0], previous["target"][1] + item["target"][1])
+    else:
+        merged["target"] = previous["target"] + item["target"]
+    merged["count"] = previous["count"] + item["count"]
+    merged["dropped_ms"] = previous.get("dropped_ms", 0.0) + item["pause"]
+    merged["duration"] = previous["duration"] + item["duration"]
+    return merged
+
+
+class Result:
+    """1つの run のまとめ結果。"""
+
+    def __init__(self, name, plan, merged, dead_settings):
+        self.name = name
+        self.plan = plan
+        self.merged = merged
+        self.dead_settings = dead_settings
+        self.before = None
+        self.after = None
+
+    @property
+    def saved_ms(self):
+        return self.before.duration_ms - self.after.duration_ms
+
+    def pose_error(self):
+        """(位置のずれ mm, 向き・モーター角度のずれの最大 deg)。"""
+        (x0, y0, h0), (x1, y1, h1) = self.before.pose, self.after.pose
+        distance = ((x1 - x0) ** 2 + (y1 - y0) ** 2) ** 0.5
+        angles = [abs(h1 - h0)]
+        for port, angle in self.before.value.items():
+            angles.append(abs(self.after.value[port] - angle))
+        return distance, max(angles)
+
+    def pose_ok(self):
+        distance, angle = self.pose_error()
+        return distance <= POSE_TOLERANCE_MM and angle <= POSE_TOLERANCE_DEG
+
+
+def coalesce(plan):
+    """
+    plan をまとめた (新しいコマンド列, 消した settings の数) を返す。
+
+    settings は次の走行（直進・回転・カーブ）の直前に1つにまとめ、その走行の設定から
+    値が変わらないキーは消します。最後の走行の後の settings も消します。
+    """
+    install()
+    from setup import SETTINGS_KEYS
+
+    result = []
+    pending = {}
+    pending_count = 0
+    dead = 0
+    current = None
+    for item in plan:
+        kind = item["kind"]
+        if kind == "settings":
+            pending.update(item["values"])
+            pending_count += 1
+            continue
+        if kind != "run_angle" and pending_count:
+            if current is not None:
+                pending = {key: value for key, value in pending.items() if current[key] != value}
+            if pending:
+                result.append({"kind": "settings", "values": pending})
+                dead += pending_count - 1
+            else:
+                dead += pending_count
+            pending = {}
+            pending_count = 0
+        if kind != "run_angle":
+            current = dict(zip(SETTINGS_KEYS, item["settings"]))
+        previous = result[-1] if result else None
+        if previous is not None and previous["kind"] != "settings" and mergeable(previous, item):
+            result[-1] = _merge(previous, item)
+        else:
+            result.append(dict(item))
+    return result, dead + pending_count
+
+
+def replay(plan, name):
+    """plan をシミュレーターで再生し、SimResult（value は {ポート: モーター角度}）を返す。"""
+    from pybricks.tools import wait
+
+    async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
+        motors = {motor.port: motor for motor in (left_wheel, right_wheel, left_lift, right_lift)}
+        for item in plan:
+            kind = item["kind"]
+            if kind == "settings":
+                robot.settings(**item["values"])
+                continue
+            if item["pause"] >= CONTIGUOUS_MS:
+                await wait(item["pause"])
+            timeout = item["stopped"] - item["t"] if "stopped" in item else None
+            if kind == "straight":
+                await robot.straight(item["target"], timeout=timeout)
+            elif kind == "turn":
+                await robot.turn(item["target"], timeout=timeout)
+            elif kind == "curve":
+                await robot.curve(item["target"][0], item["target"][1], timeout=timeout)
+            else:
+                motor = motors[item["port"]]
+                await robot.run_motor(motor, item["speed"], item["target"], timeout=timeout)
+        return {port: motor.angle() for port, motor in motors.items()}
+
+    run.__name__ = name
+    return simulate(run, quiet=True)
+
+
+def analyze(target):
+    """target（run のモジュール名またはパス）をまとめて再生した Result を返す。
+
+    まとめられない run（同時に動く動作がある）なら None を返す。
+    """
+    recorded = simulate(target, quiet=True)
+    plan = plan_from_log(recorded.log)
+    if plan is None:
+        return None
+    merged, dead = coalesce(plan)
+    result = Result(recorded.name, plan, merged, dead)
+    result.before = replay(plan, recorded.name)
+    result.after = replay(merged, recorded.name + " (coalesced)")
+    return result
+
+
+def code_lines(plan):
+    """コマンド列を run に貼れる形の行にする（ポートはモーター名で出す）。"""
+    lines = []
+    for item in plan:
+        kind = item["kind"]
+        if kind == "settings":
+            args = ", ".join("{0}={1}".format(k, v) for k, v in sorted(item["values"].items()))
+            lines.append("robot.settings({0})".format(args))
+            continue
+        if item["pause"] >= CONTIGUOUS_MS:
+            lines.append("await wait({0:.0f})".format(item["pause"]))
+        if kind == "run_angle":
+            label = describe(item)[0].split()[0]
+            lines.append(
+                "await {0}.run_angle({1}, {2:g})".format(label, item["speed"], item["target"])
+            )
+        elif kind == "curve":
+            lines.append("await robot.curve({0:g}, {1:g})".format(*item["target"]))
+        else:
+            lines.append("await robot.{0}({1:g})".format(kind, item["target"]))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sim.coalesce")
+    parser.add_argument("targets", nargs="*", help="run のモジュール名またはパス（省略時は全 run）")
+    parser.add_argument("--code", action="store_true", help="まとめたコマンド列も表示する")
+    args = parser.parse_args(argv)
+
+    total = 0.0
+    print("== coalesce ==")
+    for target in args.targets or active_variants():
+        result = analyze(target)
+        if result is None:
+            print("  {0:<32} (同時に動く動作があるのでまとめない)".format(target))
+            continue
+        distance, angle = result.pose_error()
+        ok = result.pose_ok()
+        if ok:
+            total += result.saved_ms
+        print(
+            "  {0:<32} {1:6.2f} -> {2:6.2f} s  saved {3:5.2f} s  settings -{4}  pose {5} "
+            "({6:.1f} mm, {7:.2f} deg)".format(
+                result.name,
+                result.before.duration_ms / 1000,
+                result.after.duration_ms / 1000,
+                result.saved_ms / 1000,
+                result.dead_settings,
+                "ok" if ok else "NG",
+                distance,
+                angle,
+            )
+        )
+        for item in result.merged:
+            if item.get("count", 1) > 1:
+                print(
+                    "    {0:8.2f}  {1} x{2}  (間の待ち {3:.0f} ms もなくなる)".format(
+                        item["t"] / 1000, describe(item)[0], item["count"], item["dropped_ms"]
+                    )
+                )
+        if args.code:
+            for line in code_lines(result.merged):
+                print("      " + line)
+    print("  {0:<32} {1:5.2f} s".format("total", total / 1000))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,185 @@
+"""
+動作時間の見積もり。
+
+各 run をシミュレーターで実行し、Robot の straight / turn / curve / run_motor や
+リフトの run_angle ごとに、その時点の settings（DEFAULT_*_SETTINGS、speed= / rate= の上書き、
+robot.settings(...) の変更をすべて反映したもの）から台形プロファイルで求めた予測時間を並べます。
+加速・減速を含むので、old/run_turn_test.py の「角度 ÷ 速度」より実機に近い値になります。
+
+使い方:
+    python -m sim.estimator                      # 全 run（各 main.py の ACTIVE_VARIANT）
+    python -m sim.estimator runs/run03/m10_m11.py
+    python -m sim.estimator --straight-speed 500 # DEFAULT_STRAIGHT_SETTINGS を仮に変えて比較
+"""
+
+import argparse
+import glob
+import os
+
+from sim import PROJECT_ROOT, install, simulate
+
+# 試合時間（ms）
+MATCH_MS = 150000
+
+MOTION_KINDS = ("straight", "turn", "curve", "run_angle")
+
+# setup.setup_motors() のポート割り当て
+PORT_NAMES = {
+    "Port.F": "left_wheel",
+    "Port.B": "right_wheel",
+    "Port.E": "left_lift",
+    "Port.A": "right_lift",
+}
+
+
+class Row:
+    """見積もり表の1行。"""
+
+    def __init__(self, start_ms, label, settings, predicted_ms, actual_ms, timed_out=False):
+        self.start_ms = start_ms
+        self.label = label
+        self.settings = settings
+        self.predicted_ms = predicted_ms
+        self.actual_ms = actual_ms
+        self.timed_out = timed_out
+
+
+class Estimate:
+    """1つの run の見積もり結果。"""
+
+    def __init__(self, name, rows, total_ms):
+        self.name = name
+        self.rows = rows
+        self.total_ms = total_ms
+
+    @property
+    def motion_ms(self):
+        return sum(row.actual_ms for row in self.rows if row.label != "idle")
+
+    @property
+    def idle_ms(self):
+        return sum(row.actual_ms for row in self.rows if row.label == "idle")
+
+    def table(self):
+        lines = [
+            "== {0} ==".format(self.name),
+            "  start[s]  command                       settings    predict[s]  actual[s]",
+        ]
+        for row in self.rows:
+            lines.append(
+                "  {0:8.2f}  {1:<28}  {2:<10}  {3:>10}  {4:9.2f}{5}".format(
+                    row.start_ms / 1000,
+                    row.label,
+                    row.settings,
+                    "-" if row.label == "idle" else "{0:.2f}".format(row.predicted_ms / 1000),
+                    row.actual_ms / 1000,
+                    "  (timeout)" if row.timed_out else "",
+                )
+            )
+        lines.append(
+            "  total {0:.2f} s  (motion {1:.2f} s, idle {2:.2f} s)".format(
+                self.total_ms / 1000, self.motion_ms / 1000, self.idle_ms / 1000
+            )
+        )
+        return "\n".join(lines)
+
+
+def describe(entry):
+    """動作ログの1件を (コマンド表記, 設定表記) にする。"""
+    kind = entry["kind"]
+    if kind == "run_angle":
+        port = PORT_NAMES.get(repr(entry["port"]), repr(entry["port"]))
+        return "{0} {1:+.0f}deg".format(port, entry["target"]), "{0}dps".format(entry["speed"])
+    speed, accel, rate, turn_accel = entry["settings"]
+    if kind == "turn":
+        return "turn {0:+g}".format(entry["target"]), "{0}/{1}".format(rate, turn_accel)
+    if kind == "curve":
+        radius, angle = entry["target"]
+        return "curve r={0:g} a={1:+g}".format(radius, angle), "{0}/{1}".format(speed, accel)
+    return "straight {0:+g}".format(entry["target"]), "{0}/{1}".format(speed, accel)
+
+
+def rows_from_log(log, total_ms):
+    """シミュレーターの動作ログを見積もり表の行に変換する。動作のない時間は idle 行にまとめる。"""
+    rows = []
+    busy_until = 0.0
+    for entry in log:
+        if entry["kind"] not in MOTION_KINDS:
+            continue
+        start = entry["t"]
+        if start - busy_until >= 1:
+            rows.append(Row(busy_until, "idle", "", 0.0, start - busy_until))
+        predicted = entry["duration"]
+        timed_out = "stopped" in entry
+        actual = entry["stopped"] - start if timed_out else predicted
+        label, settings = describe(entry)
+        rows.append(Row(start, label, settings, predicted, actual, timed_out))
+        busy_until = max(busy_until, start + actual)
+    if total_ms - busy_until >= 1:
+        rows.append(Row(busy_until, "idle", "", 0.0, total_ms - busy_until))
+    return rows
+
+
+def estimate(target):
+    """target（run のモジュール名またはパス）の見積もりを返す。"""
+    result = simulate(target, quiet=True)
+    return Estimate(result.name, rows_from_log(result.log, result.duration_ms), result.duration_ms)
+
+
+def active_variants():
+    """runs/runXX/main.py の ACTIVE_VARIANT から、採用中のバリアントのモジュール名を集める。"""
+    install()
+    names = []
+    for path in sorted(glob.glob(os.path.join(PROJECT_ROOT, "runs", "run[0-9]*", "main.py"))):
+        package = "runs." + os.path.basename(os.path.dirname(path))
+        main = __import__(package + ".main", None, None, ["ACTIVE_VARIANT"])
+        names.append("{0}.{1}".format(package, main.ACTIVE_VARIANT))
+    return names
+
+
+def apply_overrides(args):
+    """コマンドライン引数で DEFAULT_*_SETTINGS（と既定プロファイル）を一時的に書き換える。"""
+    install()
+    import setup
+
+    pairs = (
+        (setup.DEFAULT_STRAIGHT_SETTINGS, "straight_speed", args.straight_speed),
+        (setup.DEFAULT_STRAIGHT_SETTINGS, "straight_acceleration", args.straight_acceleration),
+        (setup.DEFAULT_TURN_SETTINGS, "turn_rate", args.turn_rate),
+        (setup.DEFAULT_TURN_SETTINGS, "turn_acceleration", args.turn_acceleration),
+    )
+    for settings, key, value in pairs:
+        if value is not None:
+            settings[key] = value
+            setup.PROFILES["default"][key] = value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sim.estimator")
+    parser.add_argument("targets", nargs="*", help="run のモジュール名またはパス（省略時は全 run）")
+    parser.add_argument("--straight-speed", type=int)
+    parser.add_argument("--straight-acceleration", type=int)
+    parser.add_argument("--turn-rate", type=int)
+    parser.add_argument("--turn-acceleration", type=int)
+    args = parser.parse_args(argv)
+
+    apply_overrides(args)
+    estimates = [estimate(target) for target in (args.targets or active_variants())]
+    for result in estimates:
+        print(result.table())
+        print()
+
+    total = sum(result.total_ms for result in estimates)
+    print("== summary ==")
+    for result in estimates:
+        print("  {0:<32} {1:7.2f} s".format(result.name, result.total_ms / 1000))
+    print(
+        "  {0:<32} {1:7.2f} s / {2:.0f} s (段取り替えの時間は含まない)".format(
+            "total", total / 1000, MATCH_MS / 1000
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+"""
+台形速度プロファイルの計算。
+
+Pybricks (pbio) と同じく「加速 → 等速 → 減速」の3区間で動作時間と位置を求めます。
+シミュレーターと時間見積もりの両方から使う、pybricks に依存しない純粋な計算モジュールです。
+時間の単位は秒、距離・角度の単位は呼び出し側（mm または deg）に合わせます。
+"""
+
+import math
+
+# SPIKE モーターの既定リミット（Pybricks の Motor.control.limits() 相当）
+MOTOR_MAX_SPEED = 1000
+MOTOR_ACCELERATION = 2000
+
+
+def split_acceleration(acceleration):
+    """settings() の加速度（数値または (加速, 減速) のタプル）を (加速, 減速) に分ける。"""
+    if isinstance(acceleration, (tuple, list)):
+        return abs(acceleration[0]), abs(acceleration[1])
+    return abs(acceleration), abs(acceleration)
+
+
+class Profile:
+    """
+    1軸の台形速度プロファイル。
+
+    Args:
+        distance: 移動量（符号付き）。
+        speed: 最高速度（符号は無視）。
+        acceleration: 加速度。数値または (加速, 減速)。
+        v0: 開始時の速度（移動方向を正とした大きさ）。
+        v1: 終了時の速度。0 で停止、>0 で止まらずに次の動作へつなぐ。
+    """
+
+    def __init__(self, distance, speed, acceleration, v0=0.0, v1=0.0):
+        speed = abs(speed)
+        accel, decel = split_acceleration(acceleration)
+        if speed <= 0 or accel <= 0 or decel <= 0:
+            raise ValueError("speed and acceleration must be positive")
+
+        self.sign = -1 if distance < 0 else 1
+        self.distance = abs(distance)
+        self.speed = speed
+        self.accel = accel
+        self.decel = decel
+
+        d = self.distance
+        v0 = min(max(v0, 0.0), speed)
+        v1 = min(max(v1, 0.0), speed)
+        # 距離が短すぎて終端速度まで加速しきれない場合は届く速度に下げる
+        v1 = min(v1, math.sqrt(v0 * v0 + 2 * accel * d))
+        # 開始速度から止まりきれない場合は減速度を上げて距離内に収める
+        if v0 > v1 and d > 0 and (v0 * v0 - v1 * v1) / (2 * decel) > d:
+            decel = (v0 * v0 - v1 * v1) / (2 * d)
+            self.decel = decel
+
+        peak_sq = (d + v0 * v0 / (2 * accel) + v1 * v1 / (2 * decel)) / (
+            1 / (2 * accel) + 1 / (2 * decel)
+        )
+        peak = min(speed, math.sqrt(max(peak_sq, 0.0)))
+        peak = max(peak, v0, v1)
+
+        self.v0 = v0
+        self.v1 = v1
+        self.peak = peak
+        self.t1 = (peak - v0) / accel
+        self.s1 = (peak * peak - v0 * v0) / (2 * accel)
+        self.t3 = (peak - v1) / decel
+        self.s3 = (peak * peak - v1 * v1) / (2 * decel)
+        self.s2 = max(d - self.s1 - self.s3, 0.0)
+        self.t2 = self.s2 / peak if peak > 0 else 0.0
+        self.duration = self.t1 + self.t2 + self.t3
+
+    def position(self, t):
+        """開始から t 秒後の位置（符号付き）。終了後は v1 で進み続ける。"""
+        if t <= 0:
+            return 0.0
+        if t < self.t1:
+            s = self.v0 * t + 0.5 * self.accel * t * t
+        elif t < self.t1 + self.t2:
+            s = self.s1 + self.peak * (t - self.t1)
+        elif t < self.duration:
+            u = t - self.t1 - self.t2
+            s = self.s1 + self.s2 + self.peak * u - 0.5 * self.decel * u * u
+        else:
+            s = self.distance + self.v1 * (t - self.duration)
+        return self.sign * s
+
+    def velocity(self, t):
+        """開始から t 秒後の速度（符号付き）。"""
+        if t < 0:
+            return 0.0
+        if t < self.t1:
+            v = self.v0 + self.accel * t
+        elif t < self.t1 + self.t2:
+            v = self.peak
+        elif t < self.duration:
+            v = self.peak - self.decel * (t - self.t1 - self.t2)
+        else:
+            v = self.v1
+        return self.sign * v
+
+
+class Ramp:
+    """目標速度まで加速してそのまま走り続けるプロファイル（drive() / run() 用）。"""
+
+    def __init__(self, speed, acceleration, v0=0.0):
+        accel, _ = split_acceleration(acceleration)
+        self.target = speed
+        self.v0 = v0
+        self.accel = accel
+        self.t1 = abs(speed - v0) / accel if accel > 0 else 0.0
+        self.duration = math.inf
+        self.v1 = speed
+
+    def position(self, t):
+        if t <= 0:
+            return 0.0
+        direction = 1 if self.target >= self.v0 else -1
+        if t < self.t1:
+            return self.v0 * t + 0.5 * direction * self.accel * t * t
+        s1 = (self.v0 + self.target) * 0.5 * self.t1
+        return s1 + self.target * (t - self.t1)
+
+    def velocity(self, t):
+        if t <= 0:
+            return self.v0
+        if t < self.t1:
+            direction = 1 if self.target >= self.v0 else -1
+            return self.v0 + direction * self.accel * t
+        return self.target
+
+
+class Motion:
+    """
+    複数軸のプロファイルを同時に終わるよう時間を引き伸ばして束ねたもの。
+
+    pbio は距離と向きの軌道のうち遅い方に速い方を合わせるので、
+    curve() の所要時間は「直進の時間」と「回転の時間」の長い方になります。
+    """
+
+    def __init__(self, start_ms, profiles, keep_moving=False):
+        self.start_ms = start_ms
+        self.profiles = profiles
+        self.keep_moving = keep_moving
+        self.duration = max(p.duration for p in profiles) if profiles else 0.0
+        self.end_ms = start_ms + self.duration * 1000
+        # シミュレーターが動作ログの行を結びつける（途中停止の記録用）
+        self.entry = None
+        # 障害物に押し当たって動けなくなった時刻（ms）。None なら当たっていない
+        self.blocked_ms = None
+
+    def _clamp(self, now_ms):
+        if self.blocked_ms is not None and now_ms > self.blocked_ms:
+            return self.blocked_ms
+        return now_ms
+
+    def _scale(self, profile):
+        if self.duration in (0.0, math.inf) or profile.duration == 0.0:
+            return 1.0
+        return profile.duration / self.duration
+
+    def positions(self, now_ms):
+        t = (self._clamp(now_ms) - self.start_ms) / 1000
+        if not self.keep_moving and t > self.duration:
+            t = self.duration
+        result = []
+        for p in self.profiles:
+            k = self._scale(p)
+            if t > self.duration:
+                end = p.position(p.duration)
+                result.append(end + p.sign * p.v1 * k * (t - self.duration))
+            else:
+                result.append(p.position(t * k))
+        return result
+
+    def velocities(self, now_ms):
+        if self.blocked_ms is not None and now_ms >= self.blocked_ms:
+            return [0.0 for _ in self.profiles]
+        t = (now_ms - self.start_ms) / 1000
+        if t > self.duration and not self.keep_moving:
+            return [0.0 for _ in self.profiles]
+        result = []
+        for p in self.profiles:
+            k = self._scale(p)
+            if t > self.duration:
+                result.append(p.sign * p.v1 * k)
+            else:
+                result.append(p.velocity(t * k) * k)
+        return result
+
+    def finished(self, now_ms):
+        # 押し当たっている間は目標に届かないので、止められるまで終わらない
+        return self.blocked_ms is None and now_ms >= self.end_ms
+
+    def stalled(self, now_ms, stall_ms):
+        """押し当たってから stall_ms 以上たったか（Pybricks の stalled() 相当）。"""
+        return self.blocked_ms is not None and now_ms - self.blocked_ms >= stall_ms
+
+
+def straight_time(distance, speed, acceleration, v0=0.0, v1=0.0):
+    """直進の所要時間（秒）。"""
+    if distance == 0:
+        return 0.0
+    return Profile(distance, speed, acceleration, v0, v1).duration
+
+
+def turn_time(angle, rate, acceleration):
+    """その場回転の所要時間（秒）。"""
+    if angle == 0:
+        return 0.0
+    return Profile(angle, rate, acceleration).duration
+
+
+def curve_geometry(radius, angle):
+    """
+    curve(radius, angle) の (弧の長さ mm, 向きの変化 deg)。pbio と同じ符号規則。
+
+    進む向きは角度の符号で決まり（負なら後退）、半径の符号は曲がる側だけを決めます。
+    """
+    arc_length = abs(radius) * math.radians(angle)
+    arc_angle = -angle if radius < 0 else angle
+    return arc_length, arc_angle
+
+
+def curve_time(radius, angle, speed, acceleration, rate, turn_acceleration, v0=0.0, v1=0.0):
+    """カーブの所要時間（秒）。直進軌道と回転軌道の長い方。"""
+    arc_length, arc_angle = curve_geometry(radius, angle)
+    return max(
+        straight_time(arc_length, speed, acceleration, v0, v1),
+        turn_time(arc_angle, rate, turn_acceleration),
+    )
+
+
+def motor_time(speed, angle, max_speed=MOTOR_MAX_SPEED, acceleration=MOTOR_ACCELERATION):
+    """Motor.run_angle の所要時間（秒）。速度はモーターの上限で頭打ちになる。"""
+    if angle == 0 or speed == 0:
+        return 0.0
+    return Profile(angle, min(abs(speed), max_speed), acceleration).duration
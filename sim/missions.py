@@ -0,0 +1,97 @@
+"""
+ミッションの位置と作業時間（sim.ordering の入力）。
+
+位置はそのミッションを回る run の発進位置を原点にした (x mm, y mm, 向き deg) で、
+前方が +x、右が +y、向きは時計回りが正（sim.world.World.pose と同じ）。
+action_ms はミッションに着いてから離れるまでの時間（押す・アームを動かすなど）。
+run はその位置を測った run（どの発進位置から見た位置か）です。
+
+run ごとに発進位置が違うので、違う run のミッションの位置はそのままでは比べられません。
+LAUNCHES に各 run の発進位置をフィールド座標で書くと、sim.ordering はミッションの位置を
+フィールド座標に直して、run をまたいだ分け方も探します。None の run（まだ測っていない）の
+ミッションは、同じ run のミッションとだけ組み合わせます。
+
+今の値は、各 run をシミュレーターで実行して、ミッションに着いた時点の位置と
+そこで過ごした時間を読んだものです。フィールドで測り直したら、ここを書き換えてください。
+"""
+
+import math
+
+# 発進位置（各 run の座標の原点）
+HOME = (0, 0, 0)
+
+# run 名 → 発進位置のフィールド座標 (x mm, y mm, 向き deg)。測っていない run は None
+LAUNCHES = {
+    "run01": None,
+    "run02": None,
+    "run03": None,
+    "run04": None,
+    "run05": None,
+    "run06": None,
+}
+
+# 段取り替え（ロボットを回収して置き直し、次の run を始めるまで）の時間（ms）
+CHANGEOVER_MS = 10000
+
+# 1つの run で回れるミッションの数の上限（アタッチメントの付け替えなしで回れる数の目安）
+MAX_PER_RUN = 3
+
+# ミッション名 → 位置と作業時間
+MISSIONS = {
+    "M08": {"run": "run01", "pose": (450, 0, 0), "action_ms": 2430},
+    "M06": {"run": "run01", "pose": (699, -22, -5), "action_ms": 0},
+    "M05": {"run": "run01", "pose": (722, -47, -47), "action_ms": 800},
+    "M09": {"run": "run02", "pose": (94, 46, 46), "action_ms": 5865},
+    "M07": {"run": "run02", "pose": (129, 308, 120), "action_ms": 4393},
+    "M11": {"run": "run03", "pose": (1009, -67, 26), "action_ms": 7700},
+    "M10": {"run": "run03", "pose": (1117, -124, -88), "action_ms": 3960},
+    "M12": {"run": "run04", "pose": (220, 0, 0), "action_ms": 2000},
+    "M01": {"run": "run05", "pose": (590, 0, 0), "action_ms": 980},
+    "M02": {"run": "run05", "pose": (639, 141, -45), "action_ms": 5052},
+    "M13": {"run": "run06", "pose": (562, 371, 129), "action_ms": 4019},
+    "M03": {"run": "run06", "pose": (592, 333, 14), "action_ms": 3373},
+}
+
+# 今の run の分け方（runs/run01〜run06 の順）
+CURRENT = (
+    ("M08", "M06", "M05"),
+    ("M09", "M07"),
+    ("M11", "M10"),
+    ("M12",),
+    ("M01", "M02"),
+    ("M13", "M03"),
+)
+
+
+def to_field(launch, pose):
+    """発進位置 launch（フィールド座標）から見た pose をフィールド座標に直す。"""
+    lx, ly, lh = launch
+    x, y, heading = pose
+    c = math.cos(math.radians(lh))
+    s = math.sin(math.radians(lh))
+    return (lx + x * c - y * s, ly + x * s + y * c, (lh + heading + 180) % 360 - 180)
+
+
+def frame(name):
+    """
+    ミッションの位置の座標系。
+
+    発進位置を測った run のミッションは "field"、測っていない run のミッションは run 名
+    （同じ座標系のミッションどうしだけ、同じ run で回れる）。
+    """
+    run = MISSIONS[name]["run"]
+    return "field" if LAUNCHES.get(run) is not None else run
+
+
+def pose(name):
+    """ミッションの位置を frame(name) の座標で返す。"""
+    mission = MISSIONS[name]
+    launch = LAUNCHES.get(mission["run"])
+    return mission["pose"] if launch is None else to_field(launch, mission["pose"])
+
+
+def launches(route):
+    """route を回る run が発進できる位置（frame の座標）のリスト。"""
+    if not route or frame(route[0]) != "field":
+        return [HOME]
+    return sorted({LAUNCHES[MISSIONS[name]["run"]] for name in route})
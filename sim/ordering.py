@@ -0,0 +1,255 @@
+"""
+ミッションの分け方（どの run でどのミッションを回るか）と順番の提案。
+
+sim.missions のミッションの位置・作業時間・発進位置から、
+「移動時間 + 作業時間 + 段取り替え」の合計が短くなる分け方と順番を探します。
+
+- 移動時間は「その場で回転 → 直進 → その場で回転」の台形プロファイルで求める
+  （setup.PROFILES["default"] の速度・加速度。後ろ向きに走った方が速ければ後ろ向き）
+- 分け方は、ミッション1つずつの run から始めて、つなぐと一番短くなる run どうしを
+  順につなぐ（配送計画の savings 法）。1つの run のミッション数は MAX_PER_RUN まで
+- 各 run の中の順番は 2-opt で、ミッションを別の run に移すと短くなる場合は移して整える
+- 位置は run ごとの発進位置から見た値なので、同じ座標系（sim.missions.frame）の
+  ミッションどうしだけを同じ run にまとめる。発進位置を測った run のミッションは
+  フィールド座標に直して、run をまたいでまとめる（発進位置はミッションの run のうち速いもの）
+
+位置はシミュレーターから読んだ目安なので、結果は「分け方を考え直すきっかけ」として使ってください。
+
+使い方:
+    python -m sim.ordering
+    python -m sim.ordering --max-per-run 4 --changeover 8
+"""
+
+import argparse
+import math
+
+from sim import install
+from sim.kinematics import Profile
+from sim.missions import (
+    CHANGEOVER_MS,
+    CURRENT,
+    LAUNCHES,
+    MAX_PER_RUN,
+    MISSIONS,
+    frame,
+    launches,
+    pose,
+)
+
+
+def _angle_diff(a, b):
+    """a から b へ回る角度（-180〜180 deg）。"""
+    return (b - a + 180) % 360 - 180
+
+
+class TravelModel:
+    """2つの位置の間の移動時間（ms）を求める。"""
+
+    def __init__(self, settings):
+        self.speed = settings["straight_speed"]
+        self.acceleration = settings["straight_acceleration"]
+        self.rate = settings["turn_rate"]
+        self.turn_acceleration = settings["turn_acceleration"]
+        self._cache = {}
+
+    def _turn_ms(self, angle):
+        return Profile(angle, self.rate, self.turn_acceleration).duration * 1000
+
+    def _straight_ms(self, distance):
+        return Profile(distance, self.speed, self.acceleration).duration * 1000
+
+    def leg_ms(self, start, end):
+        """start の位置・向きから end の位置・向きまでの時間。"""
+        key = (start, end)
+        if key in self._cache:
+            return self._cache[key]
+        x0, y0, h0 = start
+        x1, y1, h1 = end
+        distance = math.hypot(x1 - x0, y1 - y0)
+        if distance < 1:
+            result = self._turn_ms(_angle_diff(h0, h1))
+        else:
+            bearing = math.degrees(math.atan2(y1 - y0, x1 - x0))
+            options = []
+            # 前向きに走る場合と後ろ向きに走る場合の速い方
+            for facing in (bearing, bearing + 180):
+                options.append(
+                    self._turn_ms(_angle_diff(h0, facing))
+                    + self._straight_ms(distance)
+                    + self._turn_ms(_angle_diff(facing, h1))
+                )
+            result = min(options)
+        self._cache[key] = result
+        return result
+
+    def run_ms(self, route):
+        """発進位置から route のミッションを順に回って発進位置に戻る時間（一番速い発進位置）。"""
+        return min(self._run_from_ms(home, route) for home in launches(route))
+
+    def _run_from_ms(self, home, route):
+        total = 0.0
+        position = home
+        for name in route:
+            total += self.leg_ms(position, pose(name)) + MISSIONS[name]["action_ms"]
+            position = pose(name)
+        return total + self.leg_ms(position, home)
+
+
+def total_ms(model, routes, changeover_ms):
+    """全 run の時間と、run の間の段取り替えの合計。"""
+    return sum(model.run_ms(route) for route in routes) + changeover_ms * (len(routes) - 1)
+
+
+def two_opt(model, route):
+    """route の一部を逆順にして短くなる限り繰り返す。"""
+    route = list(route)
+    improved = True
+    while improved:
+        improved = False
+        best = model.run_ms(route)
+        for i in range(len(route) - 1):
+            for j in range(i + 1, len(route)):
+                candidate = route[:i] + route[i : j + 1][::-1] + route[j + 1 :]
+                candidate_ms = model.run_ms(candidate)
+                if candidate_ms < best - 1e-6:
+                    route, best, improved = candidate, candidate_ms, True
+    return route
+
+
+def same_frame(names):
+    """names のミッションが全部同じ座標系か（同じ run にまとめてよいか）。"""
+    return len({frame(name) for name in names}) <= 1
+
+
+def savings_routes(model, names, max_per_run, changeover_ms):
+    """savings 法で run をつないでいく。"""
+    routes = [[name] for name in names]
+    while True:
+        best = None
+        for a in range(len(routes)):
+            for b in range(len(routes)):
+                if a == b or len(routes[a]) + len(routes[b]) > max_per_run:
+                    continue
+                merged = routes[a] + routes[b]
+                if not same_frame(merged):
+                    continue
+                saving = (
+                    model.run_ms(routes[a])
+                    + model.run_ms(routes[b])
+                    + changeover_ms
+                    - model.run_ms(merged)
+                )
+                if saving > 0 and (best is None or saving > best[0]):
+                    best = (saving, a, b, merged)
+        if best is None:
+            return routes
+        _, a, b, merged = best
+        routes = [route for i, route in enumerate(routes) if i not in (a, b)] + [merged]
+
+
+def relocate(model, routes, max_per_run, changeover_ms):
+    """ミッションを1つずつ別の run（のどこか）に移し、合計が短くなる限り繰り返す。"""
+    routes = [list(route) for route in routes]
+    improved = True
+    while improved:
+        improved = False
+        current = total_ms(model, routes, changeover_ms)
+        for source in range(len(routes)):
+            for index, name in enumerate(routes[source]):
+                for target in range(len(routes)):
+                    if target == source or len(routes[target]) >= max_per_run:
+                        continue
+                    if not same_frame(routes[target] + [name]):
+                        continue
+                    for position in range(len(routes[target]) + 1):
+                        candidate = [list(route) for route in routes]
+                        del candidate[source][index]
+                        candidate[target].insert(position, name)
+                        candidate = [route for route in candidate if route]
+                        candidate_ms = total_ms(model, candidate, changeover_ms)
+                        if candidate_ms < current - 1e-6:
+                            routes, current, improved = candidate, candidate_ms, True
+                            break
+                    if improved:
+                        break
+                if improved:
+                    break
+            if improved:
+                break
+    return routes
+
+
+def optimize(model, names, max_per_run, changeover_ms):
+    """分け方と順番を探し、run のリスト（長い順）を返す。"""
+    routes = savings_routes(model, names, max_per_run, changeover_ms)
+    routes = [two_opt(model, route) for route in routes]
+    routes = relocate(model, routes, max_per_run, changeover_ms)
+    routes = [two_opt(model, route) for route in routes]
+    return sorted(routes, key=model.run_ms, reverse=True)
+
+
+def default_model():
+    """setup.PROFILES["default"] の設定で移動時間を求める TravelModel。"""
+    install()
+    import setup
+
+    return TravelModel(setup.PROFILES["default"])
+
+
+def print_routes(title, model, routes, changeover_ms):
+    print("== {0} ==".format(title))
+    for i, route in enumerate(routes):
+        print(
+            "  run{0:02d}  {1:<28} {2:6.2f} s".format(
+                i + 1, " -> ".join(route), model.run_ms(route) / 1000
+            )
+        )
+    total = total_ms(model, routes, changeover_ms)
+    print(
+        "  total {0:.2f} s  (run {1:.2f} s + 段取り替え {2} 回 {3:.2f} s)".format(
+            total / 1000,
+            (total - changeover_ms * (len(routes) - 1)) / 1000,
+            len(routes) - 1,
+            changeover_ms * (len(routes) - 1) / 1000,
+        )
+    )
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sim.ordering")
+    parser.add_argument("--max-per-run", type=int, default=MAX_PER_RUN)
+    parser.add_argument("--changeover", type=float, default=CHANGEOVER_MS / 1000, help="秒")
+    args = parser.parse_args(argv)
+
+    changeover_ms = args.changeover * 1000
+    model = default_model()
+    current = [list(route) for route in CURRENT]
+    before = print_routes("current", model, current, changeover_ms)
+    print()
+    reordered = [two_opt(model, route) for route in current]
+    print_routes("current grouping, reordered", model, reordered, changeover_ms)
+    print()
+    # 発進位置を測った run が2つ以上ないと、run をまたいだ組み替えは探せない
+    measured = [run for run, launch in LAUNCHES.items() if launch is not None]
+    cross_run = len(measured) >= 2
+    if not cross_run:
+        print(
+            "[WARN] sim/missions.py の LAUNCHES で発進位置を測った run が {0} 個しかないので、"
+            "run をまたいだ組み替えは探していません（同じ run の中の分け方と順番だけ）".format(
+                len(measured)
+            )
+        )
+    proposed = optimize(model, list(MISSIONS), args.max_per_run, changeover_ms)
+    title = "proposed" if cross_run else "proposed (within each run only, cross-run search skipped)"
+    after = print_routes(title, model, proposed, changeover_ms)
+    print(
+        "  saved {0:.2f} s against the current grouping{1}".format(
+            (before - after) / 1000, "" if cross_run else " (cross-run search skipped)"
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,177 @@
+"""
+試合全体の時間の見積もり。
+
+runs.PROGRAMS に登録した順に、各 run の採用バリアント（main.py の ACTIVE_VARIANT）を
+シミュレーターで実行し、run の間の段取り替え（手で置き直す時間）を足して、
+試合のタイムライン・150 秒に対する余り・速くできる余地の大きい run を表示します。
+
+速くできる余地は、動いていない時間（wait / settle など）、
+sim.blending（止まらずにつなぐ）・sim.coalesce（動作をまとめる）で短くなる時間、
+setup.PROFILES["fast"] より遅い設定の走行を fast で走った場合に短くなる時間の合計です。
+
+使い方:
+    python -m sim.planner                        # 段取り替えは一律 CHANGEOVER_S 秒
+    python -m sim.planner --changeover 8         # 段取り替えを一律 8 秒に
+    python -m sim.planner --changeovers 8,12,10,10,9   # run の間ごとに指定（5つ）
+"""
+
+import argparse
+
+from sim import install, simulate
+from sim.blending import savings, travel
+from sim.coalesce import analyze
+from sim.estimator import MATCH_MS, estimate
+from sim.kinematics import Motion, Profile
+
+# 段取り替え（ロボットを回収して置き直し、次の run を選んで始めるまで）の既定の時間（秒）
+CHANGEOVER_S = 10.0
+
+
+class Entry:
+    """1つの run の見積もり。"""
+
+    def __init__(self, number, result, blend_ms, coalesce_ms, fast_ms):
+        self.number = number
+        self.estimate = result
+        self.blend_ms = blend_ms
+        self.coalesce_ms = coalesce_ms
+        self.fast_ms = fast_ms
+
+    @property
+    def duration_ms(self):
+        return self.estimate.total_ms
+
+    @property
+    def room_ms(self):
+        """速くできる余地（ms）。"""
+        return self.estimate.idle_ms + self.blend_ms + self.coalesce_ms + self.fast_ms
+
+
+def registered_variants():
+    """runs.PROGRAMS の順に (表示番号, 採用バリアントのモジュール名) を返す。"""
+    install()
+    from runs import PROGRAMS
+
+    result = []
+    for program in PROGRAMS:
+        main = __import__(program["module"], None, None, ["ACTIVE_VARIANT"])
+        package = program["module"].rpartition(".")[0]
+        result.append((program["display_number"], "{0}.{1}".format(package, main.ACTIVE_VARIANT)))
+    return result
+
+
+def fast_savings(log):
+    """走行（直進・回転・カーブ）を fast プロファイル以上の設定で走ったら短くなる時間（ms）。"""
+    import setup
+
+    fast = setup.PROFILES["fast"]
+    floor = [fast.get(key, 0) for key in setup.SETTINGS_KEYS]
+    total = 0.0
+    for entry in log:
+        if entry["kind"] not in ("straight", "turn", "curve") or "stopped" in entry:
+            continue
+        speed, accel, rate, turn_accel = [max(a, b) for a, b in zip(entry["settings"], floor)]
+        distance, heading = travel(entry)
+        motion = Motion(0.0, [Profile(distance, speed, accel), Profile(heading, rate, turn_accel)])
+        total += max(entry["duration"] - motion.duration * 1000, 0.0)
+    return total
+
+
+def plan():
+    """登録した全 run の Entry のリストを PROGRAMS の順に返す。"""
+    entries = []
+    for number, target in registered_variants():
+        blend_ms = sum(item.saved_ms for item in savings(target)[1])
+        coalesced = analyze(target)
+        coalesce_ms = coalesced.saved_ms if coalesced is not None and coalesced.pose_ok() else 0.0
+        fast_ms = fast_savings(simulate(target, quiet=True).log)
+        entries.append(Entry(number, estimate(target), blend_ms, coalesce_ms, fast_ms))
+    return entries
+
+
+def changeover_list(entries, uniform_s, per_gap):
+    """run の間ごとの段取り替え（ms）のリスト。per_gap が足りなければ uniform_s で埋める。"""
+    gaps = max(len(entries) - 1, 0)
+    values = list(per_gap or [])[:gaps]
+    values += [uniform_s] * (gaps - len(values))
+    return [value * 1000 for value in values]
+
+
+def timeline(entries, changeovers):
+    """タイムラインの行を (開始 ms, 終了 ms, 内容) のリストで返す。"""
+    rows = []
+    now = 0.0
+    for i, entry in enumerate(entries):
+        rows.append((now, now + entry.duration_ms, entry))
+        now += entry.duration_ms
+        if i < len(changeovers):
+            rows.append((now, now + changeovers[i], None))
+            now += changeovers[i]
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m sim.planner")
+    parser.add_argument("--changeover", type=float, default=CHANGEOVER_S, help="段取り替え（秒）")
+    parser.add_argument(
+        "--changeovers",
+        type=lambda text: [float(value) for value in text.split(",")],
+        help="run の間ごとの段取り替え（秒、カンマ区切り）",
+    )
+    parser.add_argument("--match", type=float, default=MATCH_MS / 1000, help="試合時間（秒）")
+    args = parser.parse_args(argv)
+
+    entries = plan()
+    changeovers = changeover_list(entries, args.changeover, args.changeovers)
+    rows = timeline(entries, changeovers)
+    total_ms = rows[-1][1] if rows else 0.0
+    match_ms = args.match * 1000
+
+    print("== match timeline ==")
+    print("  start[s]   end[s]  item")
+    for start, end, entry in rows:
+        if entry is None:
+            label = "(段取り替え)"
+        else:
+            label = "run{0:02d}  {1:<28} motion {2:5.2f} s, idle {3:5.2f} s".format(
+                entry.number,
+                entry.estimate.name,
+                entry.estimate.motion_ms / 1000,
+                entry.estimate.idle_ms / 1000,
+            )
+        print("  {0:8.2f} {1:8.2f}  {2}".format(start / 1000, end / 1000, label))
+    slack_ms = match_ms - total_ms
+    print(
+        "  total {0:.2f} s / {1:.0f} s  (run {2:.2f} s + 段取り替え {3:.2f} s)"
+        "  {4} {5:.2f} s".format(
+            total_ms / 1000,
+            match_ms / 1000,
+            sum(entry.duration_ms for entry in entries) / 1000,
+            sum(changeovers) / 1000,
+            "slack" if slack_ms >= 0 else "OVER",
+            abs(slack_ms) / 1000,
+        )
+    )
+    print()
+
+    print("== room to speed up ==")
+    print("  run     idle[s]  blend[s]  coalesce[s]  fast[s]  total[s]")
+    ranked = sorted(entries, key=lambda entry: entry.room_ms, reverse=True)
+    for entry in ranked:
+        print(
+            "  run{0:02d}  {1:8.2f}  {2:8.2f}  {3:11.2f}  {4:7.2f}  {5:8.2f}".format(
+                entry.number,
+                entry.estimate.idle_ms / 1000,
+                entry.blend_ms / 1000,
+                entry.coalesce_ms / 1000,
+                entry.fast_ms / 1000,
+                entry.room_ms / 1000,
+            )
+        )
+    if ranked:
+        print("  most room: run{0:02d} ({1})".format(ranked[0].number, ranked[0].estimate.name))
+    return 0 if slack_ms >= 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""
+シミュレーター内のロボットと入力の状態。
+
+互換 pybricks の各デバイスは生成時にここへ登録されます。
+左右タイヤの角度からロボットの位置 (x, y) と向きを積分し、
+ハブのボタンやフォースセンサーの入力は「台本（スクリプト）」として与えます。
+"""
+
+import math
+
+from sim.clock import clock
+
+# 位置を積分するときの刻み（ms）
+POSE_STEP_MS = 5
+
+
+class World:
+    """1回のシミュレーション分の状態。"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hub = None
+        self.drivebase = None
+        self.motors = {}
+        self.log = []
+        self.force_script = {}
+        self.button_script = []
+        self.block_script = []
+        self.x = 0.0
+        self.y = 0.0
+        self._pose_ms = clock.now
+
+    # ----- デバイス登録 -----
+    def add_motor(self, port, motor):
+        self.motors[port] = motor
+
+    def wheels(self):
+        """DriveBase に使われている (左, 右) モーター。なければ None。"""
+        if self.drivebase is None:
+            return None
+        return self.drivebase.left, self.drivebase.right
+
+    # ----- 位置と向き -----
+    def _wheel_mm(self, t):
+        left, right = self.wheels()
+        mm_per_deg = math.pi * self.drivebase.wheel_diameter / 360
+        return left.raw_angle(t) * mm_per_deg, right.raw_angle(t) * mm_per_deg
+
+    def heading_at(self, t):
+        """左右タイヤの差から求めた向き（deg、時計回りが正）。"""
+        if self.drivebase is None:
+            return 0.0
+        left_mm, right_mm = self._wheel_mm(t)
+        return (left_mm - right_mm) / self.drivebase.axle_track * 180 / math.pi
+
+    def sync(self):
+        """前回から現在時刻までの位置を積分する。モーターの動きを変える前に必ず呼ぶ。"""
+        now = clock.now
+        if self.drivebase is None:
+            self._pose_ms = now
+            return
+        t = self._pose_ms
+        left, right = self._wheel_mm(t)
+        while t < now:
+            step = min(POSE_STEP_MS, now - t)
+            nl, nr = self._wheel_mm(t + step)
+            ds = ((nl - left) + (nr - right)) / 2
+            heading = math.radians(self.heading_at(t + step / 2))
+            self.x += ds * math.cos(heading)
+            self.y += ds * math.sin(heading)
+            left, right = nl, nr
+            t += step
+        self._pose_ms = now
+
+    def pose(self):
+        """(x mm, y mm, heading deg)。スタート位置が原点、前方が +x、右が +y。"""
+        self.sync()
+        return self.x, self.y, self.heading_at(clock.now)
+
+    # ----- 入力の台本 -----
+    def press_force(self, port, at_ms, duration_ms=100, force=5.0):
+        """at_ms からduration_ms の間、フォースセンサーを押したことにする。"""
+        self.force_script.setdefault(port, []).append((at_ms, at_ms + duration_ms, force))
+
+    def press_button(self, button, at_ms, duration_ms=100):
+        """at_ms から duration_ms の間、ハブのボタンを押したことにする。"""
+        self.button_script.append((at_ms, at_ms + duration_ms, button))
+
+    def block(self, at_ms, port=None):
+        """
+        at_ms に、動作中のロボット（port=None）またはモーターが障害物に押し当たったことにする。
+
+        当たった後は位置が変わらず速度が 0 になり、動作は目標に届かないまま
+        止められる（timeout や stall 検出）まで続きます。1回の指定で1つの動作だけが当たります。
+        """
+        self.block_script.append((at_ms, port))
+
+    def take_block(self, port, motion):
+        """motion の動作中に当たる予定があれば、その時刻を motion に設定する。"""
+        for item in self.block_script:
+            at_ms, target = item
+            if target == port and motion.start_ms <= at_ms < motion.end_ms:
+                motion.blocked_ms = at_ms
+                self.block_script.remove(item)
+                return
+
+    def force_at(self, port):
+        for start, end, force in self.force_script.get(port, ()):
+            if start <= clock.now < end:
+                return force
+        return 0.0
+
+    def buttons_at(self):
+        return {b for start, end, b in self.button_script if start <= clock.now < end}
+
+    # ----- 動作ログ -----
+    def record(self, kind, target, duration_ms, **details):
+        """モーター・DriveBase の動作指令を記録する（見積もり・解析用）。"""
+        entry = {"t": clock.now, "kind": kind, "target": target, "duration": duration_ms}
+        entry.update(details)
+        self.log.append(entry)
+        return entry
+
+    def end(self, motion):
+        """動作を確定するときに呼ぶ。予定より早く止められた場合は止めた時刻を記録する。"""
+        if motion is not None and motion.entry is not None and not motion.finished(clock.now):
+            motion.entry["stopped"] = clock.now
+
+
+world = World()
+
+
+def reset():
+    """時計と状態を初期化する（1回の走行ごとに呼ぶ）。"""
+    clock.reset()
+    world.reset()
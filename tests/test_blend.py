@@ -0,0 +1,35 @@
+"""setup.Robot.blend のテスト（シミュレーターで実行する）。"""
+
+from sim import simulate
+
+
+def _thens(steps):
+    """steps を blend したときの、各動作の then（Stop の名前）。"""
+
+    async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
+        await robot.blend(steps)
+
+    result = simulate(run, quiet=True)
+    return [repr(entry["then"]) for entry in result.motions()]
+
+
+def test_blend_keeps_moving_in_the_same_direction():
+    assert _thens([("S", 300), ("C", 200, 45), ("S", 100)]) == [
+        "Stop.NONE",
+        "Stop.NONE",
+        "Stop.HOLD",
+    ]
+
+
+def test_negative_angle_curve_breaks_the_blend():
+    # 角度が負のカーブは後退なので、前進のカーブから止まらずにはつながない（run02 の M09 → M07）
+    assert _thens([("C", 120, 110), ("C", 120, -64)]) == ["Stop.HOLD", "Stop.HOLD"]
+
+
+def test_negative_radius_curve_still_moves_forward():
+    # 半径の符号は曲がる側だけなので、前進どうしでつながる
+    assert _thens([("S", 200), ("C", -120, 45)]) == ["Stop.NONE", "Stop.HOLD"]
+
+
+def test_reverse_moves_blend_together():
+    assert _thens([("S", -200), ("C", 120, -45)]) == ["Stop.NONE", "Stop.HOLD"]
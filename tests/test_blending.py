@@ -0,0 +1,37 @@
+"""sim.blending の見積もりのテスト。"""
+
+from sim.blending import chains, joinable, savings, travel
+
+SETTINGS = (300, 750, 200, 800)
+
+
+def _entry(kind, target, t=0.0, duration=1000.0):
+    return {"t": t, "kind": kind, "target": target, "duration": duration, "settings": SETTINGS}
+
+
+def test_travel_of_a_negative_angle_curve_is_backward():
+    distance, heading = travel(_entry("curve", (120, -64)))
+    assert distance < 0
+    assert heading == -64
+
+
+def test_forward_and_reverse_curves_are_not_joinable():
+    forward = _entry("curve", (120, 110))
+    reverse = _entry("curve", (120, -64), t=1000.0)
+    assert not joinable(forward, reverse)
+    assert chains([forward, reverse]) == []
+
+
+def test_same_direction_moves_are_joinable():
+    straight = _entry("straight", 300)
+    curve = _entry("curve", (-200, 45), t=1000.0)
+    assert joinable(straight, curve)
+    assert chains([straight, curve]) == [[straight, curve]]
+
+
+def test_run02_opening_curves_are_not_blendable():
+    # M09 → M07 の curve(120, 110) + curve(120, -64) は、2つ目が後退なのでつながらない
+    _, items, reasons = savings("runs.run02.m09_m07")
+    assert items == []
+    assert "blend" not in reasons
+    assert reasons["reverse"] == 3
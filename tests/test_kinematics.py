@@ -0,0 +1,42 @@
+"""sim.kinematics とシミュレーターのカーブの符号のテスト。"""
+
+import math
+
+import pytest
+from sim import simulate
+from sim.kinematics import curve_geometry
+
+
+@pytest.mark.parametrize(
+    "radius, angle, forward, heading",
+    [
+        (120, 64, True, 64),
+        (120, -64, False, -64),
+        (-120, 64, True, -64),
+        (-120, -64, False, 64),
+    ],
+)
+def test_curve_geometry_follows_pbio_signs(radius, angle, forward, heading):
+    # 進む向きは角度の符号、曲がる側は半径の符号で決まる
+    arc_length, arc_angle = curve_geometry(radius, angle)
+    assert (arc_length > 0) == forward
+    assert abs(arc_length) == pytest.approx(120 * math.pi * 64 / 180)
+    assert arc_angle == heading
+
+
+def test_negative_angle_curve_moves_backward():
+    async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
+        await robot.curve(120, -64)
+
+    x, y, heading = simulate(run, quiet=True).pose
+    assert x < -100
+    assert heading == pytest.approx(-64)
+
+
+def test_positive_angle_curve_moves_forward():
+    async def run(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
+        await robot.curve(120, 64)
+
+    x, y, heading = simulate(run, quiet=True).pose
+    assert x > 100
+    assert heading == pytest.approx(64)
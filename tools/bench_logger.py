@@ -0,0 +1,145 @@
+"""
+utils.logger の print 1回あたりの時間を測るベンチマーク（PC 用）。
+
+次の3つを同じ行数だけ print して比べます。
+コンソールへの表示は捨てて、ファイルに書く分だけを測ります。
+
+- legacy   : 以前の TeeStdout（print のたびに文字列を作って write する）
+- buffered : 今の TeeStdout（bytearray にためて CHUNK_BYTES ごとに write する）
+- debug    : set_level(INFO) のときの debug()（本番で何もしないこと）
+
+PC のファイルは OS がバッファするので、ハブのフラッシュより差が小さく出ます。
+write の回数（ハブではこれがそのままフラッシュへの書き込み回数）も合わせて見てください。
+--write-us に write 1回の時間を渡すと、それを足した print 1回あたりの時間も出します。
+
+使い方:
+    python tools/bench_logger.py
+    python tools/bench_logger.py --lines 20000 --chunk 4096
+    python tools/bench_logger.py --write-us 300   # write 1回 300 us と仮定
+"""
+
+import argparse
+import builtins
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utils import logger  # noqa: E402
+
+# run の中でよく出す行に近い長さ
+LINE = "[STEP] {0:2d}  {1:9d}  {2:7d}  straight     450       450"
+
+
+class CountingFile:
+    """write の回数を数えるファイル。"""
+
+    def __init__(self, path, mode):
+        self._file = open(path, mode)
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return self._file.write(data)
+
+    def close(self):
+        self._file.close()
+
+
+class LegacyTee:
+    """以前の TeeStdout と同じ書き方（比較用）。"""
+
+    def __init__(self, path):
+        self.log_file = CountingFile(path, "a")
+        self.original_print = builtins.print
+
+    def __enter__(self):
+        def _print(*args, **kwargs):
+            sep = kwargs.get("sep", " ")
+            end = kwargs.get("end", "\n")
+            message = sep.join(str(a) for a in args) + end
+            if self.log_file:
+                self.log_file.write(message)
+            self.original_print(*args, **kwargs)
+
+        builtins.print = _print
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        builtins.print = self.original_print
+        self.log_file.close()
+
+
+class CountingTee(logger.TeeStdout):
+    """write の回数を数える TeeStdout。"""
+
+    def _open(self, log_path):
+        return CountingFile(log_path, "wb")
+
+
+def _print_lines(lines):
+    start = time.perf_counter()
+    for i in range(lines):
+        print(LINE.format(i % 100, i * 10, 20))
+    return time.perf_counter() - start
+
+
+def bench_legacy(directory, lines):
+    tee = LegacyTee(os.path.join(directory, "legacy.log"))
+    with tee:
+        elapsed = _print_lines(lines)
+    return elapsed, tee.log_file.writes
+
+
+def bench_buffered(directory, lines, chunk):
+    logger.logs_dir = lambda: directory
+    tee = CountingTee("buffered", chunk_bytes=chunk)
+    with tee:
+        elapsed = _print_lines(lines)
+        file = tee.log_file
+    return elapsed, file.writes
+
+
+def bench_debug(lines):
+    logger.set_level(logger.INFO)
+    start = time.perf_counter()
+    for i in range(lines):
+        logger.debug(LINE, i % 100, i * 10, 20)
+    return time.perf_counter() - start, 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python tools/bench_logger.py")
+    parser.add_argument("--lines", type=int, default=10000)
+    parser.add_argument("--chunk", type=int, default=logger.CHUNK_BYTES, help="バイト")
+    parser.add_argument("--write-us", type=float, default=0.0, help="write 1回の時間（us）")
+    args = parser.parse_args(argv)
+
+    console = builtins.print
+    builtins.print = lambda *a, **k: None  # コンソールへの表示は測らない
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            rows = [
+                ("legacy", bench_legacy(directory, args.lines)),
+                ("buffered", bench_buffered(directory, args.lines, args.chunk)),
+                ("debug", bench_debug(args.lines)),
+            ]
+    finally:
+        builtins.print = console
+
+    print("== print overhead ({0} lines, chunk {1} B) ==".format(args.lines, args.chunk))
+    print("  name       us/print  writes  us/print (+write)")
+    for name, (elapsed, writes) in rows:
+        measured = elapsed / args.lines * 1e6
+        print(
+            "  {0:<9} {1:9.2f}  {2:6d}  {3:17.2f}".format(
+                name, measured, writes, measured + writes * args.write_us / args.lines
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,227 @@
+"""
+ハブに送るファイルを小さくまとめるバンドラー（PC 用）。
+
+selector.py から import をたどり、ハブで実際に読み込まれるモジュールだけを build/ に出します。
+
+- import 文（関数の中のものも）で参照されるプロジェクト内のモジュールと、その親パッケージ
+- runs.PROGRAMS に登録した run（selector が名前で import する）
+- 各 run の main.py の ACTIVE_VARIANT と VARIANTS（VariantLoader が名前で import する）
+
+old/ や sim/、VARIANTS にないバリアントなど、たどれないファイルは出しません。
+出すファイルは tools/strip_trace.py と同じく trace を消し、docstring とコメントも消して
+ast.unparse で書き直します（空行・余分な空白もなくなる）。
+最後に、元の大きさと出した大きさ、PC での compile の時間を表にします
+（ハブでの compile の時間の目安。ハブではもっと長くかかります）。
+
+使い方:
+    python tools/bundle.py              # build/ に作る
+    python tools/bundle.py --out dist   # 出力先を変える
+"""
+
+import argparse
+import ast
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from strip_trace import ROOT, strip_trace
+
+# たどり始めるファイル
+ENTRY = "selector"
+
+
+def module_file(name, root=ROOT):
+    """モジュール名に当たるプロジェクト内のファイル。なければ None。"""
+    path = root.joinpath(*name.split("."))
+    if path.with_suffix(".py").is_file():
+        return path.with_suffix(".py")
+    if (path / "__init__.py").is_file():
+        return path / "__init__.py"
+    return None
+
+
+def _literal(node, names):
+    """文字列・タプル・リスト・辞書の値。名前は names から引く。読めなければ None。"""
+    if isinstance(node, ast.Name):
+        return names.get(node.id)
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return [_literal(item, names) for item in node.elts]
+    if isinstance(node, ast.Dict):
+        return {_literal(k, names): _literal(v, names) for k, v in zip(node.keys, node.values)}
+    if isinstance(node, ast.Constant):
+        return node.value
+    return None
+
+
+def _assignments(tree):
+    """モジュールの一番外側の NAME = 値 を読めるものだけ辞書にする。"""
+    names = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name):
+                names[target.id] = _literal(node.value, names)
+    return names
+
+
+def references(name, tree):
+    """モジュール name（構文木 tree）が読み込むかもしれないモジュール名を返す。"""
+    package = name if module_file(name).name == "__init__.py" else name.rpartition(".")[0]
+    found = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".")[: len(package.split(".")) - node.level + 1]
+                base = ".".join(parts + ([base] if base else []))
+            found.append(base)
+            # from runs import run01 のようにサブモジュールを import する場合
+            found.extend("{0}.{1}".format(base, alias.name) for alias in node.names)
+    # 名前で import されるもの（selector の PROGRAMS と main.py のバリアント）
+    names = _assignments(tree)
+    for program in names.get("PROGRAMS") or []:
+        if isinstance(program, dict) and isinstance(program.get("module"), str):
+            found.append(program["module"])
+    variants = list(names.get("VARIANTS") or []) + [names.get("ACTIVE_VARIANT")]
+    for variant in variants:
+        if isinstance(variant, str):
+            found.append("{0}.{1}".format(package, variant))
+    return found
+
+
+def reachable(entry=ENTRY, root=ROOT):
+    """entry からたどれるモジュール名 → ファイルの辞書（たどった順）。"""
+    modules = {}
+    queue = [entry]
+    while queue:
+        name = queue.pop(0)
+        if name in modules or module_file(name, root) is None:
+            continue
+        # 親パッケージ（__init__.py）も import される
+        parent = name.rpartition(".")[0]
+        if parent and parent not in modules:
+            queue.append(parent)
+        path = module_file(name, root)
+        modules[name] = path
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        queue.extend(references(name, tree))
+    return modules
+
+
+class _DropDocstrings(ast.NodeTransformer):
+    """モジュール・クラス・関数の docstring を消す（関数・クラスが空になったら pass を残す）。"""
+
+    def _strip(self, node):
+        self.generic_visit(node)
+        body = node.body
+        if (
+            body
+            and isinstance(body[0], ast.Expr)
+            and isinstance(body[0].value, ast.Constant)
+            and isinstance(body[0].value.value, str)
+        ):
+            node.body = body[1:]
+            if not node.body and not isinstance(node, ast.Module):
+                node.body = [ast.Pass()]
+        return node
+
+    visit_Module = _strip
+    visit_ClassDef = _strip
+    visit_FunctionDef = _strip
+    visit_AsyncFunctionDef = _strip
+
+
+def minify(source):
+    """trace・docstring・コメントを消したソースを返す。"""
+    source, _ = strip_trace(source)
+    tree = _DropDocstrings().visit(ast.parse(source))
+    text = ast.unparse(tree)
+    return text + "\n" if text else ""
+
+
+def _compile_ms(source, filename, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compile(source, filename, "exec")
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def build(out, root=ROOT):
+    """
+    たどれるモジュールを小さくして out に書く。
+
+    (ファイル, 元のバイト数, 新しいバイト数, 元の compile ms, 新しい compile ms) の
+    リストを返します。
+    """
+    if out.exists():
+        shutil.rmtree(out)
+    report = []
+    for path in reachable(root=root).values():
+        relative = path.relative_to(root)
+        source = path.read_text(encoding="utf-8")
+        small = minify(source)
+        target = out / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(small, encoding="utf-8")
+        report.append(
+            (
+                relative,
+                len(source.encode()),
+                len(small.encode()),
+                _compile_ms(source, str(relative)),
+                _compile_ms(small, str(relative)),
+            )
+        )
+    return report
+
+
+def dropped(report, root=ROOT):
+    """ハブ用のディレクトリにあるのに build に出さなかったファイル。"""
+    from strip_trace import hub_files
+
+    kept = {relative for relative, *_ in report}
+    return [relative for relative in hub_files(root) if relative not in kept]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python tools/bundle.py")
+    parser.add_argument("--out", default=str(ROOT / "build"), help="出力先のディレクトリ")
+    args = parser.parse_args(argv)
+
+    out = Path(args.out).resolve()
+    if out == ROOT or out in ROOT.parents:
+        print("出力先にプロジェクトのルートは指定できません: {0}".format(out), file=sys.stderr)
+        return 1
+    report = build(out)
+    print("== bundle {0} -> {1} ==".format(ENTRY, out))
+    print("  file                                   bytes       ->  compile ms (PC)")
+    for relative, before, after, before_ms, after_ms in report:
+        print(
+            "  {0:<36} {1:6d} -> {2:6d}  {3:6.3f} -> {4:6.3f}".format(
+                str(relative), before, after, before_ms, after_ms
+            )
+        )
+    before = sum(row[1] for row in report)
+    after = sum(row[2] for row in report)
+    print(
+        "  {0:<36} {1:6d} -> {2:6d}  {3:6.3f} -> {4:6.3f}  ({5} files, {6:.0f}% smaller)".format(
+            "total",
+            before,
+            after,
+            sum(row[3] for row in report),
+            sum(row[4] for row in report),
+            len(report),
+            (1 - after / before) * 100 if before else 0,
+        )
+    )
+    skipped = dropped(report)
+    if skipped:
+        print("  not bundled: {0}".format(", ".join(str(path) for path in skipped)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,7 +8,8 @@ $TARGETS = @(
     "$ROOT_DIR\runs",
     "$ROOT_DIR\selector.py",
     "$ROOT_DIR\setup.py",
-    "$ROOT_DIR\utils"
+    "$ROOT_DIR\utils",
+    "$ROOT_DIR\sim"
 )
 
 # Check if ruff is installed
@@ -8,6 +8,7 @@ TARGETS=(
   "$ROOT_DIR/selector.py"
   "$ROOT_DIR/setup.py"
   "$ROOT_DIR/utils"
+  "$ROOT_DIR/sim"
 )
 
 if ! command -v ruff >/dev/null 2>&1; then
@@ -0,0 +1,201 @@
+"""
+ハブに送るコードから trace（debug() の呼び出し）を取り除くビルドステップ（PC 用）。
+
+utils.logger の debug() は本番（set_level(INFO)）では何もせずに戻りますが、
+呼び出しそのものと引数を作る時間は残ります。ここで次のものを消したコピーを build/ に作り、
+そちらをハブに送れば、試合中は trace の分の時間もメモリも使いません。
+
+- 文として書いた debug(...) の呼び出し
+- if enabled(DEBUG): のブロック（else のないもの）
+- それで使われなくなった utils.logger からの import 名
+
+消すと空になるブロックには pass を残します。trace は本番では表示されないので、
+dev = True で動かしたいときは元のファイルを送ってください。
+
+使い方:
+    python tools/strip_trace.py              # build/ に作る
+    python tools/strip_trace.py --out dist   # 出力先を変える
+"""
+
+import argparse
+import ast
+import shutil
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# ハブに送るファイルとディレクトリ
+HUB_SOURCES = ("selector.py", "setup.py", "runs", "utils")
+
+# trace として消す関数名
+TRACE_NAMES = ("debug",)
+
+# trace を消すと使われなくなるかもしれない utils.logger の名前
+LOGGER_NAMES = ("debug", "enabled", "DEBUG")
+
+
+def _is_trace(node):
+    """node が消してよい trace の文か。"""
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+        func = node.value.func
+        return isinstance(func, ast.Name) and func.id in TRACE_NAMES
+    if isinstance(node, ast.If) and not node.orelse:
+        test = node.test
+        return (
+            isinstance(test, ast.Call)
+            and isinstance(test.func, ast.Name)
+            and test.func.id == "enabled"
+            and len(test.args) == 1
+            and isinstance(test.args[0], ast.Name)
+            and test.args[0].id == "DEBUG"
+        )
+    return False
+
+
+def _blocks(tree):
+    """文のリスト（関数・if・for などの中身）を順に返す。"""
+    for node in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            block = getattr(node, field, None)
+            if isinstance(block, list) and block and isinstance(block[0], ast.stmt):
+                yield block
+
+
+def _owns_lines(node, lines):
+    """node が自分の行を1人で使っているか（; で同じ行に別の文がないか）。"""
+    before = lines[node.lineno - 1][: node.col_offset]
+    after = lines[node.end_lineno - 1][node.end_col_offset :].strip()
+    return before.strip() == "" and (after == "" or after.startswith("#"))
+
+
+def _used_names(tree):
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+
+
+def _prune_imports(source):
+    """utils.logger から import した名前のうち、使われなくなったものを消す。"""
+    tree = ast.parse(source)
+    used = _used_names(tree)
+    lines = source.splitlines(keepends=True)
+    edits = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.ImportFrom) and node.module == "utils.logger"):
+            continue
+        keep = [
+            alias
+            for alias in node.names
+            if (alias.asname or alias.name) in used or alias.name not in LOGGER_NAMES
+        ]
+        if len(keep) == len(node.names):
+            continue
+        indent = lines[node.lineno - 1][: node.col_offset]
+        if keep:
+            names = ", ".join(
+                (
+                    alias.name
+                    if alias.asname is None
+                    else "{0} as {1}".format(alias.name, alias.asname)
+                )
+                for alias in keep
+            )
+            text = "{0}from utils.logger import {1}\n".format(indent, names)
+        else:
+            text = "{0}pass\n".format(indent) if indent else ""
+        edits.append((node.lineno, node.end_lineno, text))
+    for first, last, text in sorted(edits, reverse=True):
+        lines[first - 1 : last] = [text] if text else []
+    return "".join(lines)
+
+
+def strip_trace(source):
+    """source から trace を消した (新しいソース, 消した文の数) を返す。"""
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    edits = []
+    for block in _blocks(tree):
+        removable = [node for node in block if _is_trace(node) and _owns_lines(node, lines)]
+        if not removable:
+            continue
+        keep_pass = len(removable) == len(block)
+        for i, node in enumerate(removable):
+            if keep_pass and i == 0:
+                indent = lines[node.lineno - 1][: node.col_offset]
+                edits.append((node.lineno, node.end_lineno, indent + "pass\n"))
+            else:
+                edits.append((node.lineno, node.end_lineno, ""))
+    if not edits:
+        return source, 0
+    # 入れ子の if enabled(DEBUG): の中の debug() は外側と一緒に消える
+    edits.sort()
+    merged = []
+    for edit in edits:
+        if merged and edit[0] <= merged[-1][1]:
+            continue
+        merged.append(edit)
+    for first, last, text in reversed(merged):
+        lines[first - 1 : last] = [text] if text else []
+    return _prune_imports("".join(lines)), len(merged)
+
+
+def hub_files(root=ROOT):
+    """ハブに送る .py ファイル（root からの相対パス）を返す。"""
+    files = []
+    for name in HUB_SOURCES:
+        path = root / name
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    p.relative_to(root) for p in path.rglob("*.py") if "__pycache__" not in p.parts
+                )
+            )
+        elif path.exists():
+            files.append(path.relative_to(root))
+    return files
+
+
+def build(out, root=ROOT):
+    """
+    root のハブ用ファイルを trace を消して out にコピーする。
+
+    (ファイル, 消した数, 元のバイト数, 新しいバイト数) のリストを返します。
+    """
+    if out.exists():
+        shutil.rmtree(out)
+    report = []
+    for relative in hub_files(root):
+        source = (root / relative).read_text(encoding="utf-8")
+        stripped, count = strip_trace(source)
+        target = out / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(stripped, encoding="utf-8")
+        report.append((relative, count, len(source.encode()), len(stripped.encode())))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python tools/strip_trace.py")
+    parser.add_argument("--out", default=str(ROOT / "build"), help="出力先のディレクトリ")
+    args = parser.parse_args(argv)
+
+    out = Path(args.out).resolve()
+    if out == ROOT or out in ROOT.parents:
+        print("出力先にプロジェクトのルートは指定できません: {0}".format(out), file=sys.stderr)
+        return 1
+    report = build(out)
+    print("== strip trace -> {0} ==".format(out))
+    total = 0
+    for relative, count, before, after in report:
+        if count:
+            total += count
+            print(
+                "  {0:<36} -{1:3d} trace  {2:6d} -> {3:6d} B".format(
+                    str(relative), count, before, after
+                )
+            )
+    print("  {0} files, {1} trace statements removed".format(len(report), total))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,46 +3,178 @@
 タイムアウトや計測など、制御まわりの共通処理を提供します。
 """
 
-from pybricks.tools import StopWatch, wait
+from pybricks.tools import StopWatch, multitask, wait as _wait
 
+# これ以上あいた時間は「(gap)」行として表に出す（ms）
+GAP_MS = 5
 
+# race_with_timeout() の終わり方
+DONE = "done"
+TIMEOUT = "timeout"
+STALL = "stall"
 
-async def run_with_timeout(
-    start_fn,
-    done_fn,
-    stop_fn,
-    timeout_ms,
-    poll_ms=10,
-):
+# これ未満の速度（mm/s または deg/s）が続いたら stall とみなす。Pybricks の既定の stall 速度と同じ
+STALL_SPEED = 20
+
+# stall の監視で速度を読む間隔（ms）
+STALL_POLL_MS = 10
+
+
+class StepLog:
+    """
+    run 内の各ステップ（Robot の動作や wait）の時間を記録するクラス。
+
+    1ステップは [種類, 目標, 開始ms, 所要ms, 実績, 終わり方, イベント番号] のリスト。
+    終わり方は race_with_timeout() の TIMEOUT / STALL（途中で止めたとき）か None。
+    events に utils.eventlog.EventLog を入れておくと、記録中のイベントログにも開始と終了を書く。
+    どちらも記録中でないときは start() が None を返し、何もしない。
+    """
+
+    def __init__(self):
+        self.steps = []
+        self.enabled = False
+        self.events = None
+        self._timer = StopWatch()
+        self._last_end = 0
+
+    def begin(self):
+        """記録を開始する（run_with_timing から呼ぶ）。"""
+        self.steps = []
+        self.enabled = True
+        self._timer.reset()
+        self._last_end = 0
+
+    def end(self):
+        """記録を終了する。"""
+        self.enabled = False
+
+    def start(self, kind, target):
+        """ステップの開始を記録し、finish() に渡すステップを返す。"""
+        events = self.events if self.events is not None and self.events.running else None
+        if not self.enabled and events is None:
+            return None
+        now = self._timer.time()
+        step = [kind, target, now, 0, None, None, None]
+        if self.enabled:
+            if now - self._last_end >= GAP_MS:
+                # Robot を通さない動作（リフトの run_angle など）や計算にかかった時間
+                gap = ["(gap)", None, self._last_end, now - self._last_end, None, None, None]
+                self.steps.append(gap)
+            self.steps.append(step)
+        if events is not None:
+            step[6] = events.begin(kind, target)
+        return step
+
+    def finish(self, step, achieved=None, ending=None):
+        """
+        ステップの終了を記録する。
+
+        ending は race_with_timeout() の終わり方（DONE なら何も出さない）。
+        """
+        if step is None:
+            return
+        now = self._timer.time()
+        step[3] = now - step[2]
+        step[4] = achieved
+        step[5] = None if ending == DONE else ending
+        if now > self._last_end:
+            self._last_end = now
+        if step[6] is not None and self.events.running:
+            self.events.end(step[6], step[0], step[1], achieved, ending)
+
+    def print_table(self):
+        """記録したステップを表にして表示する。"""
+        print("[STEP]  #  start(ms)  dur(ms)  command    target  achieved")
+        for i, step in enumerate(self.steps):
+            kind, target, start, duration, achieved, ending = step[:6]
+            print(
+                "[STEP] {0:2d}  {1:9d}  {2:7d}  {3:<9}  {4:>6}  {5:>8}{6}".format(
+                    i + 1,
+                    start,
+                    duration,
+                    kind,
+                    "-" if target is None else "{0:.0f}".format(target),
+                    "-" if achieved is None else "{0:.0f}".format(achieved),
+                    "  " + ending.upper() if ending else "",
+                )
+            )
+
+
+# 全 run で共有するステップ記録
+step_log = StepLog()
+
+
+async def wait(time):
     """
-    非同期ループで完了を監視し、タイムアウトで停止する共通関数。
+    pybricks.tools.wait と同じように待つ。計測中なら「wait」ステップとして記録する。
+
+    runs 側で `from utils.control import wait` とすると、素の wait も表に出ます。
+    """
+    step = step_log.start("wait", time)
+    timer = StopWatch()
+    await _wait(time)
+    step_log.finish(step, timer.time())
+
+
+async def race_with_timeout(motion, stop_fn, timeout_ms=None, speed_fn=None, stall_ms=None):
+    """
+    動作の完了・タイムアウトのタイマー・stall の監視を multitask(race=True) で競わせる共通関数。
+
+    完了を一定間隔でポーリングしないので、動作が終わったら次のスケジューラの周回ですぐに戻ります。
+
+    stall_ms を指定すると、speed_fn() の絶対値が STALL_SPEED 未満のまま
+    stall_ms 続いた時点で「押し当たって動けない」とみなして止めます。
 
     Args:
-        start_fn: 非同期実行を開始する関数（wait=False で開始するなど）。
-        done_fn: 完了を True/False で返す関数。
-        stop_fn: タイムアウト時に呼ぶ停止関数。
-        timeout_ms: タイムアウト（ミリ秒）。
-        poll_ms: ポーリング間隔（ミリ秒）。
+        motion: 開始済みの動作の awaitable（例: drivebase.straight(100)）。
+        stop_fn: タイムアウト・stall で止めるときに呼ぶ停止関数。
+        timeout_ms: タイムアウト（ミリ秒）。None ならタイムアウトなし。
+        speed_fn: 今の速度を返す関数（stall の監視用）。
+        stall_ms: 速度が落ちたままこの時間続いたら止める（ミリ秒）。None なら監視しない。
 
     Returns:
-        bool: 正常完了で True、タイムアウトで False。
+        DONE / TIMEOUT / STALL のどれか。
     """
-    start_fn()
     timer = StopWatch()
-    timer.reset()
 
-    while timer.time() < timeout_ms:
-        if done_fn():
-            return True
-        await wait(poll_ms)
+    async def move():
+        await motion
+        return DONE
+
+    async def deadline():
+        await _wait(timeout_ms)
+        return TIMEOUT
 
-    stop_fn()
-    return False
+    async def stall():
+        low_since = None
+        while True:
+            await _wait(STALL_POLL_MS)
+            now = timer.time()
+            if abs(speed_fn()) >= STALL_SPEED:
+                low_since = None
+            elif low_since is None:
+                low_since = now
+            elif now - low_since >= stall_ms:
+                return STALL
+
+    tasks = [move()]
+    if timeout_ms is not None:
+        tasks.append(deadline())
+    if stall_ms is not None:
+        tasks.append(stall())
+
+    # 先に終わったものの結果だけが入り、負けたものは multitask が取り消す
+    results = await multitask(*tasks, race=True)
+    ending = [result for result in results if result is not None][0]
+    if ending != DONE:
+        stop_fn()
+    return ending
 
 
 async def run_with_timing(label, coro_fn):
     """
     実行時間を計測しつつ非同期処理を実行する共通関数。
+    実行中の各ステップ（Robot の動作と wait）を step_log に記録し、終了後に表を出します。
 
     Args:
         label: ログに出す識別子（例: run01:m08_m06_m05）
@@ -54,29 +186,12 @@ async def run_with_timing(label, coro_fn):
     timer = StopWatch()
     timer.reset()
     print("[RUN] {0} start".format(label))
-    result = await coro_fn()
+    step_log.begin()
+    try:
+        result = await coro_fn()
+    finally:
+        step_log.end()
+        step_log.print_table()
     elapsed_ms = timer.time()
     print("[RUN] {0} done ({1:.0f} ms)".format(label, elapsed_ms))
     return result
-
-
-def apply_curve_settings(
-    set_settings_fn,
-    speed,
-    acceleration,
-):
-    """
-    カーブ用の速度・加速度設定を適用するユーティリティ。
-
-    Args:
-        set_settings_fn: settings(straight_speed=..., straight_acceleration=...) を受け取る関数
-        speed: 速度（None の場合は適用しない）
-        acceleration: 加速度（None の場合は適用しない）
-    """
-    params = {}
-    if speed is not None:
-        params["straight_speed"] = speed
-    if acceleration is not None:
-        params["straight_acceleration"] = acceleration
-    if params:
-        set_settings_fn(**params)
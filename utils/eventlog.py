@@ -0,0 +1,154 @@
+"""
+動作の区切りで記録するイベントログ。
+
+Robot の動作（直進・回転・カーブ・モーター・settle）と wait の開始と終了のときだけ、
+1行ずつ固定幅の整数レコードを書きます。一定間隔のセンサーログと違い、
+回転の終わり・タイムアウトの瞬間・リフトの動き始めを取りこぼさず、ログの量も少なくて済みます。
+記録は utils.control.step_log の start() / finish() から呼ばれます（Robot 側の変更は不要）。
+文字列の組み立てと print は、ロボットが止まった後の dump() でまとめて行います。
+"""
+
+from pybricks.tools import StopWatch
+
+from utils.control import DONE, STALL, TIMEOUT
+
+try:
+    from array import array
+except ImportError:
+    array = None
+
+# 1レコードの列: 番号, 時刻(ms), 種類(START/END), 動作, 目標(×10), 実績(×10),
+#               向き(0.1deg), 終わり方
+COLUMNS = 8
+
+# 1 run 分（動作 100 個ほど）に足りるレコード数。256 × 8 × 4 バイト = 約 8 KB
+CAPACITY = 256
+
+START = 0
+END = 1
+
+# 動作の名前 ↔ 番号（レコードには番号で書く）
+COMMANDS = ("straight", "turn", "curve", "motor", "settle", "wait")
+
+# 終わり方 ↔ 番号
+ENDINGS = (DONE, TIMEOUT, STALL)
+
+# 向きの誤差を出す動作（直進は向きが変わらないのが正しい）
+TURNING = ("turn", "curve")
+
+
+def _tenths(value):
+    return 0 if value is None else int(round(value * 10))
+
+
+class EventLog:
+    """
+    int32 のリングバッファに動作の開始・終了を記録するクラス。
+
+    容量を超えると古いレコードから上書きします（最新 capacity 件が残る）。
+    """
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        # 走行中に確保し直さないよう、ここで一度だけ確保する
+        size = capacity * COLUMNS
+        self.buffer = array("l", [0] * size) if array is not None else [0] * size
+        self.running = False
+        self.count = 0
+        self._head = 0
+        self._number = 0
+        self._hub = None
+        self._timer = StopWatch()
+
+    def attach(self, hub):
+        """開始・終了のときに向きを読むハブを渡す。"""
+        self._hub = hub
+
+    def start(self):
+        """バッファを空にして記録を始める。"""
+        self.count = 0
+        self._head = 0
+        self._number = 0
+        self._timer.reset()
+        self.running = True
+
+    def stop(self):
+        """記録を止める。"""
+        self.running = False
+
+    def begin(self, kind, target):
+        """動作の開始を書き、end() に渡す番号を返す。"""
+        self._number += 1
+        self._write(self._number, START, kind, target, None, DONE)
+        return self._number
+
+    def end(self, number, kind, target, achieved, ending):
+        """動作の終了（実績・終わり方）を書く。"""
+        self._write(number, END, kind, target, achieved, ending or DONE)
+
+    def _write(self, number, event, kind, target, value, ending):
+        heading = self._hub.imu.heading() if self._hub is not None else 0
+        buf = self.buffer
+        i = self._head * COLUMNS
+        buf[i] = number
+        buf[i + 1] = self._timer.time()
+        buf[i + 2] = event
+        buf[i + 3] = COMMANDS.index(kind) if kind in COMMANDS else -1
+        buf[i + 4] = _tenths(target)
+        buf[i + 5] = _tenths(value)
+        buf[i + 6] = int(heading * 10)
+        buf[i + 7] = ENDINGS.index(ending)
+        self._head += 1
+        if self._head == self.capacity:
+            self._head = 0
+        self.count += 1
+
+    def dump(self):
+        """
+        記録したレコードを古い順に CSV で表示する。ロボットが止まってから呼ぶこと。
+
+        終了の行には、開始からの向きの変化と目標の差（heading_err_deg）を付けます。
+        回転・カーブは「向きの変化 − 目標」、直進は「向きの変化」（まっすぐ走れたら 0）。
+        """
+        n = min(self.count, self.capacity)
+        first = self._head - n if self.count <= self.capacity else self._head
+        print("--- イベントログ ({0} events) ---".format(n))
+        print("no,time_ms,event,command,target,value,heading_deg,heading_err_deg,ending")
+        buf = self.buffer
+        started = {}
+        for k in range(n):
+            i = ((first + k) % self.capacity) * COLUMNS
+            number = buf[i]
+            kind = COMMANDS[buf[i + 3]] if buf[i + 3] >= 0 else "?"
+            heading = buf[i + 6]
+            if buf[i + 2] == START:
+                started[number] = heading
+                print(
+                    "{0},{1},start,{2},{3:.1f},,{4:.1f},,".format(
+                        number, buf[i + 1], kind, buf[i + 4] / 10, heading / 10
+                    )
+                )
+                continue
+            error = ""
+            start_heading = started.pop(number, None)
+            if start_heading is not None and kind in TURNING:
+                error = "{0:.1f}".format((heading - start_heading - buf[i + 4]) / 10)
+            elif start_heading is not None and kind == "straight":
+                error = "{0:.1f}".format((heading - start_heading) / 10)
+            print(
+                "{0},{1},end,{2},{3:.1f},{4:.1f},{5:.1f},{6},{7}".format(
+                    number,
+                    buf[i + 1],
+                    kind,
+                    buf[i + 4] / 10,
+                    buf[i + 5] / 10,
+                    heading / 10,
+                    error,
+                    ENDINGS[buf[i + 7]],
+                )
+            )
+        print("--- イベントログ終了 ---")
+
+
+# 全 run で共有するイベントログ
+event_log = EventLog()
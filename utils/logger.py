@@ -4,64 +4,151 @@
 目的:
 - 既存の print() を活かしつつ、コンソールとファイルへ同時出力（tee）する
 - ログはプロジェクトルート直下の logs/ に保存する
+- ファイルへは bytearray にためてまとめて書く（print のたびにフラッシュに書かない）
+- debug() / info() などのレベル付き出力。set_level() より低いレベルは文字列も作らない
 """
 
 import builtins
 
+# ログのレベル（大きいほど重要）
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+# ファイルに書き出すまでにためるバイト数
+CHUNK_BYTES = 2048
+
+# 今のレベル（これより低いレベルの出力は捨てる）
+_level = INFO
+
+
+def set_level(level):
+    """出力するレベルの下限を決める（開発中は DEBUG、本番は INFO など）。"""
+    global _level
+    _level = level
+
+
+def enabled(level):
+    """level の出力が今のレベルで出るか。"""
+    return level >= _level
+
+
+def log(level, message, *args):
+    """
+    level が今のレベル以上なら print する。
+
+    args があれば message.format(*args) を出力します。出さないレベルのときは
+    format も呼ばないので、引数に値を渡すだけなら本番でほとんど時間がかかりません。
+    """
+    if level < _level:
+        return
+    print(message.format(*args) if args else message)
+
+
+def debug(message, *args):
+    """開発中だけ出すログ。"""
+    log(DEBUG, message, *args)
+
+
+def info(message, *args):
+    log(INFO, message, *args)
+
+
+def warning(message, *args):
+    log(WARNING, message, *args)
+
+
+def error(message, *args):
+    log(ERROR, message, *args)
+
+
 def logs_dir():
     """logs ディレクトリのパス文字列を返す。（作成は省略、エラーなら手動作成を促す）"""
     return "logs"
 
 
+def _rotate(path):
+    """前回のログを path.1 に残し、それより古いものは消す（ログが増え続けないように）。"""
+    try:
+        import os
+    except ImportError:
+        return
+    try:
+        os.remove(path + ".1")
+    except OSError:
+        pass
+    try:
+        os.rename(path, path + ".1")
+    except OSError:
+        pass
+
+
 class TeeStdout:
     """
     print をフックし、コンソールとファイルに同時出力するクラス（コンテキストマネージャ）。
     contextlib 削除のためクラスで実装。
+
+    ファイルへの出力は bytearray にため、chunk_bytes を超えたときと with を抜けるときに
+    まとめて書きます。ファイルは run ごとに作り直し、前回の分は .1 に1つだけ残します。
     """
-    def __init__(self, run_name):
+
+    def __init__(self, run_name, chunk_bytes=CHUNK_BYTES):
         self.run_name = run_name
+        self.chunk_bytes = chunk_bytes
         self.log_file = None
+        self.log_path = None
         self.original_print = builtins.print
+        self.writes = 0  # ファイルに書いた回数
+        self._buffer = bytearray()
+
+    def _open(self, log_path):
+        _rotate(log_path)
+        return open(log_path, "wb")
 
     def __enter__(self):
         # タイムスタンプなしでファイル名を作成
-        # logs ディレクトリが存在することを前提とする、または例外を無視する
-        log_path = "{0}/{1}.log".format(logs_dir(), self.run_name)
-        
         # Pybricksでディレクトリ作成は標準では難しい（os.mkdirなどがない場合がある）ため
-        # 事前に logs ディレクトリがあることを期待する、あるいは直下に書く
-        # ここでは logs/runXX.log に追記モードで開く
+        # 事前に logs ディレクトリがあることを期待する
+        log_path = "{0}/{1}.log".format(logs_dir(), self.run_name)
         try:
-            self.log_file = open(log_path, "a")
+            self.log_file = self._open(log_path)
         except OSError:
             # logs ディレクトリがないなどの場合、ルートに書く
             log_path = "{0}.log".format(self.run_name)
-            self.log_file = open(log_path, "a")
+            self.log_file = self._open(log_path)
 
         self.log_path = log_path
+        original_print = self.original_print
 
         def _print(*args, **kwargs):
-            sep = kwargs.get("sep", " ")
-            end = kwargs.get("end", "\n")
-            message = sep.join(str(a) for a in args) + end
-            
             if self.log_file:
-                self.log_file.write(message)
-                # flush はない場合があるが、あるなら呼ぶ
-                # self.log_file.flush() 
-            
-            self.original_print(*args, **kwargs)
+                buffer = self._buffer
+                sep = kwargs.get("sep", " ")
+                buffer.extend(sep.join(str(a) for a in args).encode())
+                buffer.extend(kwargs.get("end", "\n").encode())
+                if len(buffer) >= self.chunk_bytes:
+                    self.flush()
+            original_print(*args, **kwargs)
 
         builtins.print = _print
         return log_path
 
+    def flush(self):
+        """ためた出力をファイルに書く。"""
+        if self.log_file and self._buffer:
+            self.log_file.write(self._buffer)
+            self.writes += 1
+            self._buffer = bytearray()
+
     def __exit__(self, exc_type, exc_value, traceback):
         builtins.print = self.original_print
         if self.log_file:
+            self.flush()
             self.log_file.close()
+            self.log_file = None
 
 
 def tee_stdout(run_name):
     """(旧API互換用) TeeStdout クラスのインスタンスを返す"""
     return TeeStdout(run_name)
-
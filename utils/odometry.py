@@ -0,0 +1,99 @@
+"""
+オドメトリ（フィールド上の位置の推定）。
+
+左右タイヤのエンコーダー（進んだ距離）とハブのジャイロ（向き）を合わせて、
+スタート位置からの (x, y, 向き) を積分します。
+utils.sampler.Sampler に on_sample() を登録し、10 ms ごとのスナップショットの値で積分します。
+座標はスタート位置が原点、前方が +x、右が +y、向きは時計回りが正（ジャイロと同じ）。
+
+走行中にヒープを使わないよう、位置は 1/16 mm 単位の整数で持ち、
+sin / cos は Q14（16384 = 1.0）の表を引いて 0.1 度単位で補間します。
+"""
+
+from math import pi, radians, sin
+
+from utils.sampler import HEADING, LEFT_ANGLE, RIGHT_ANGLE
+
+try:
+    from array import array
+except ImportError:
+    array = None
+
+# 0〜90 度の sin（1 度きざみ、Q14）。起動時に1回だけ作る
+_values = [int(round(sin(radians(d)) * 16384)) for d in range(91)]
+SIN_Q14 = array("h", _values) if array is not None else _values
+del _values
+
+
+def sin_q14(decideg):
+    """0.1 度単位の角度の sin を Q14 の整数で返す。"""
+    a = decideg % 3600
+    sign = 1
+    if a >= 1800:
+        a -= 1800
+        sign = -1
+    if a > 900:
+        a = 1800 - a
+    i = a // 10
+    value = SIN_Q14[i]
+    f = a - i * 10
+    if f:
+        value += (SIN_Q14[i + 1] - value) * f // 10
+    return sign * value
+
+
+def cos_q14(decideg):
+    """0.1 度単位の角度の cos を Q14 の整数で返す。"""
+    return sin_q14(decideg + 900)
+
+
+class Odometry:
+    """
+    エンコーダーとジャイロから位置を推定するクラス。
+
+    Args:
+        hub: PrimeHub（ジャイロの向きを使う）。
+        left_wheel, right_wheel: 左右タイヤのモーター。
+        wheel_diameter: タイヤの直径（mm）。
+    """
+
+    def __init__(self, hub, left_wheel, right_wheel, wheel_diameter):
+        self._hub = hub
+        self._left = left_wheel
+        self._right = right_wheel
+        # 左右の角度の和（deg）× _k >> 11 = 進んだ距離（1/16 mm）
+        self._k = int(round(16 * pi * wheel_diameter / 360 * 1024))
+        self.reset()
+
+    def reset(self, x=0, y=0):
+        """今の位置を (x mm, y mm) にする。向きはジャイロの値をそのまま使う。"""
+        self._x16 = x * 16
+        self._y16 = y * 16
+        self._rest = 0
+        self._left_angle = self._left.angle()
+        self._right_angle = self._right.angle()
+        self._heading = int(self._hub.imu.heading() * 10)
+
+    def on_sample(self, values):
+        """
+        utils.sampler.Sampler のスナップショットで、前回からの移動を位置に足す（subscribe 用）。
+        """
+        left = values[LEFT_ANGLE]
+        right = values[RIGHT_ANGLE]
+        heading = int(values[HEADING] * 10)
+        # 割り切れなかった分は次に持ち越し、丸めの誤差がたまらないようにする
+        total = (left - self._left_angle + right - self._right_angle) * self._k + self._rest
+        step = total >> 11
+        self._rest = total - (step << 11)
+        if step:
+            # 向きは前回と今回の中間を使う
+            middle = (heading + self._heading) >> 1
+            self._x16 += (step * cos_q14(middle) + 8192) >> 14
+            self._y16 += (step * sin_q14(middle) + 8192) >> 14
+        self._left_angle = left
+        self._right_angle = right
+        self._heading = heading
+
+    def pose(self):
+        """(x mm, y mm, 向き deg) を返す。"""
+        return (self._x16 + 8) >> 4, (self._y16 + 8) >> 4, self._heading / 10
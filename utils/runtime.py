@@ -4,6 +4,8 @@
 主に次の目的で使用します:
 - `runs/` 配下のスクリプトを単体実行する際にプロジェクトルートを sys.path に追加する
 - プロジェクトルート Path を取得する
+- 空きヒープ量を調べる（メモリ使用量の確認用）
+- 使い終わったモジュールを sys.modules から外す
 """
 
 import sys
@@ -31,3 +33,33 @@ def ensure_project_root(current_file):
         
     return "."
 
+
+def free_heap():
+    """
+    空きヒープ（バイト）を返す。
+
+    gc.mem_free() は MicroPython（ハブ）にしかないので、PC 上では None を返す。
+    """
+    import gc
+
+    mem_free = getattr(gc, "mem_free", None)
+    return mem_free() if mem_free is not None else None
+
+
+def unload_modules(package):
+    """
+    package（例: "runs.run01"）とその配下のモジュールを sys.modules から外し、外した数を返す。
+
+    親パッケージの属性に残った参照も消すので、ほかに参照がなければ次の gc.collect() で回収される。
+    """
+    prefix = package + "."
+    names = [name for name in sys.modules if name == package or name.startswith(prefix)]
+    for name in names:
+        del sys.modules[name]
+    parent, _, child = package.rpartition(".")
+    if parent in sys.modules:
+        try:
+            delattr(sys.modules[parent], child)
+        except AttributeError:
+            pass
+    return len(names)
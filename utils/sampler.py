@@ -0,0 +1,93 @@
+"""
+センサーのスナップショット。
+
+10 ms ごとに1回だけセンサーを読み、あらかじめ確保したリスト values に入れます。
+位置の推定（Odometry）・センサーログ・settle などはハードウェアを読み直さず、
+values を読むだけにします。使う側が増えても、センサーを読む回数と
+スケジューラのタスクの数は増えません（使う側は subscribe() で登録し、同じタスクの中で呼ばれる）。
+"""
+
+from pybricks.parameters import Axis
+from pybricks.tools import StopWatch, wait
+
+# スナップショットの更新間隔（ms）
+PERIOD_MS = 10
+
+# values の並び
+TIME = 0  # 経過時間（ms、Sampler を作ってから）
+DISTANCE = 1  # 走行距離（mm）
+DRIVE_SPEED = 2  # 直進速度（mm/s）
+HEADING = 3  # ジャイロの向き（deg）
+RATE = 4  # ジャイロの角速度（Z 軸、deg/s）
+LEFT_ANGLE = 5  # 左タイヤの角度（deg）
+RIGHT_ANGLE = 6  # 右タイヤの角度（deg）
+LEFT_SPEED = 7  # 左タイヤの速度（deg/s）
+RIGHT_SPEED = 8  # 右タイヤの速度（deg/s）
+LEFT_LIFT_SPEED = 9  # 左リフトの速度（deg/s）
+RIGHT_LIFT_SPEED = 10  # 右リフトの速度（deg/s）
+SLOTS = 11
+
+# 全モーターの速度の位置（settle の「止まったか」の判定用）
+MOTOR_SPEEDS = (LEFT_SPEED, RIGHT_SPEED, LEFT_LIFT_SPEED, RIGHT_LIFT_SPEED)
+
+
+class Sampler:
+    """
+    センサーを1回読んで values に入れ、登録した関数に渡すクラス。
+
+    Args:
+        hub: PrimeHub。
+        robot: setup.Robot（state() で走行距離と直進速度を読む）。
+        motors: (左タイヤ, 右タイヤ, 左リフト, 右リフト)。
+        period_ms: task() の更新間隔（ms）。
+    """
+
+    def __init__(self, hub, robot, motors, period_ms=PERIOD_MS):
+        self._hub = hub
+        self._robot = robot
+        self._motors = tuple(motors)
+        self.period_ms = period_ms
+        # 走行中に確保し直さないよう、ここで一度だけ確保する
+        self.values = [0] * SLOTS
+        self.ticks = 0
+        self.running = False
+        self._listeners = []
+        self._timer = StopWatch()
+
+    def subscribe(self, listener, every=1):
+        """スナップショットを取るたびに（every 回に1回）listener(values) を呼ぶ。"""
+        self._listeners.append((listener, every))
+
+    def sample(self):
+        """センサーを1回ずつ読んで values を更新し、登録した関数を呼ぶ。"""
+        values = self.values
+        imu = self._hub.imu
+        left_wheel, right_wheel, left_lift, right_lift = self._motors
+        values[TIME] = self._timer.time()
+        state = self._robot.state()
+        values[DISTANCE] = state[0]
+        values[DRIVE_SPEED] = state[1]
+        values[HEADING] = imu.heading()
+        values[RATE] = imu.angular_velocity(Axis.Z)
+        values[LEFT_ANGLE] = left_wheel.angle()
+        values[RIGHT_ANGLE] = right_wheel.angle()
+        values[LEFT_SPEED] = left_wheel.speed()
+        values[RIGHT_SPEED] = right_wheel.speed()
+        values[LEFT_LIFT_SPEED] = left_lift.speed()
+        values[RIGHT_LIFT_SPEED] = right_lift.speed()
+        self.ticks += 1
+        for listener, every in self._listeners:
+            if self.ticks % every == 0:
+                listener(values)
+
+    def stop(self):
+        """task() を終わらせる。"""
+        self.running = False
+
+    async def task(self):
+        """period_ms ごとに sample() する非同期タスク。stop() されるまで続く。"""
+        self.running = True
+        while self.running:
+            self.sample()
+            await wait(self.period_ms)
+        self.running = False
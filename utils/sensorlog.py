@@ -0,0 +1,169 @@
+"""
+リングバッファ式のセンサーロガー。
+
+走行中は固定幅の整数サンプルを、あらかじめ確保した array に書き込むだけにします。
+文字列の組み立て（format）と print（Bluetooth 送信）は、
+ロボットが止まった後の dump() でまとめて行います。
+そのため制御中の負荷が小さく、10〜20 ms 間隔でも記録できます。
+動作の区切り（回転の終わり・タイムアウトなど）は utils.eventlog が記録するので、
+ふだんは 100 ms 間隔で、走行中の様子をざっと見るために使います。
+"""
+
+from pybricks.tools import StopWatch, wait
+
+from utils.sampler import DISTANCE, HEADING, LEFT_ANGLE, LEFT_SPEED, RIGHT_ANGLE, RIGHT_SPEED
+
+try:
+    from array import array
+except ImportError:
+    array = None
+
+# 1サンプルの列: 時刻(10ms単位), 距離(mm), 向き(0.1deg), 左角度, 右角度, 左速度, 右速度
+COLUMNS = 7
+
+# 既定の記録間隔（ms）と容量（サンプル数）。100 ms × 600 = 60 秒分、約 8 KB。
+PERIOD_MS = 100
+CAPACITY = 600
+
+
+class SensorLog:
+    """
+    int16 のリングバッファにセンサー値を記録するクラス。
+
+    容量を超えると古いサンプルから上書きします（最新 capacity 件が残る）。
+    """
+
+    def __init__(self, capacity=CAPACITY, period_ms=PERIOD_MS):
+        self.capacity = capacity
+        self.period_ms = period_ms
+        size = capacity * COLUMNS
+        # 走行中に確保し直さないよう、ここで一度だけ確保する
+        self.buffer = array("h", [0] * size) if array is not None else [0] * size
+        self.running = False
+        self.count = 0
+        self._head = 0
+        self._timer = StopWatch()
+
+    def start(self):
+        """バッファを空にして記録を始める。"""
+        self.count = 0
+        self._head = 0
+        self._timer.reset()
+        self.running = True
+
+    def stop(self):
+        """記録を止める（sensor_logger_task はこの後 dump して終わる）。"""
+        self.running = False
+
+    def sample(self, hub, robot, left_wheel, right_wheel):
+        """1サンプル分のセンサー値をバッファに書き込む。"""
+        self._write(
+            robot.distance(),
+            hub.imu.heading(),
+            left_wheel.angle(),
+            right_wheel.angle(),
+            left_wheel.speed(),
+            right_wheel.speed(),
+        )
+
+    def on_sample(self, values):
+        """
+        utils.sampler.Sampler のスナップショットから1サンプル書き込む（subscribe 用）。
+
+        センサーは読み直しません。start() から stop() までの間だけ記録します。
+        """
+        if self.running:
+            self._write(
+                values[DISTANCE],
+                values[HEADING],
+                values[LEFT_ANGLE],
+                values[RIGHT_ANGLE],
+                values[LEFT_SPEED],
+                values[RIGHT_SPEED],
+            )
+
+    def _write(self, distance, heading, left_angle, right_angle, left_speed, right_speed):
+        buf = self.buffer
+        i = self._head * COLUMNS
+        buf[i] = self._timer.time() // 10
+        buf[i + 1] = distance
+        buf[i + 2] = int(heading * 10)
+        buf[i + 3] = left_angle
+        buf[i + 4] = right_angle
+        buf[i + 5] = left_speed
+        buf[i + 6] = right_speed
+        self._head += 1
+        if self._head == self.capacity:
+            self._head = 0
+        self.count += 1
+
+    def dump(self, robot=None):
+        """記録したサンプルを古い順に CSV で表示する。ロボットが止まってから呼ぶこと。"""
+        n = min(self.count, self.capacity)
+        first = self._head - n if self.count <= self.capacity else self._head
+        print("--- センサーログ ({0} samples, {1} ms 間隔) ---".format(n, self.period_ms))
+        if robot is not None:
+            # PID ゲインは走行中に変わらないので、行ごとではなく最初に1回だけ出す
+            print(
+                "# pid distance={0} heading={1}".format(
+                    robot.distance_control().pid(), robot.heading_control().pid()
+                )
+            )
+        print(
+            "time,current_dist_mm,current_heading_deg,left_angle_deg,right_angle_deg,"
+            "angle_diff_deg,left_speed_dps,right_speed_dps,speed_diff_dps"
+        )
+        buf = self.buffer
+        for k in range(n):
+            i = ((first + k) % self.capacity) * COLUMNS
+            left_angle = buf[i + 3]
+            right_angle = buf[i + 4]
+            left_speed = buf[i + 5]
+            right_speed = buf[i + 6]
+            print(
+                "{0},{1},{2:.1f},{3},{4},{5},{6},{7},{8}".format(
+                    buf[i] * 10,
+                    buf[i + 1],
+                    buf[i + 2] / 10,
+                    left_angle,
+                    right_angle,
+                    right_angle - left_angle,
+                    left_speed,
+                    right_speed,
+                    right_speed - left_speed,
+                )
+            )
+        print("--- センサーログ終了 ---")
+
+    async def task(self, hub, robot, left_wheel, right_wheel, forever=False):
+        """
+        記録用の非同期タスク。
+
+        forever=False: すぐに記録を始め、stop() されたら dump して終わる（run 単体実行用）。
+        forever=True: start() から stop() までの間だけ記録し続ける。
+            dump は呼び出し側で行う（selector 用）。
+        """
+        if not forever:
+            self.start()
+        while True:
+            if self.running:
+                self.sample(hub, robot, left_wheel, right_wheel)
+                await wait(self.period_ms)
+            elif forever:
+                await wait(50)
+            else:
+                break
+        self.dump(robot)
+
+
+# 全 run で共有するロガー
+sensor_log = SensorLog()
+
+
+async def sensor_logger_task(hub, robot, left_wheel, right_wheel):
+    """
+    センサー値を記録する非同期タスク（各バリアントの旧 sensor_logger_task の置き換え）。
+
+    run と並行して実行し、run の後で sensor_log.stop() を呼ぶとログを出して終了します。
+    """
+    await sensor_log.task(hub, robot, left_wheel, right_wheel)
@@ -0,0 +1,135 @@
+"""
+バリアント（runs/runXX/ 配下の実装ファイル）の読み込み。
+
+各 runs/runXX/main.py は VariantLoader を1つ持ちます。
+ACTIVE_VARIANT からモジュールパスを組み立てて import するのは最初の1回だけで、
+2回目以降はキャッシュしたモジュールをそのまま返すので、練習中の再実行はすぐに始まります。
+
+ハブのボタンでバリアントを切り替えた結果は、このモジュールの selected に持ちます。
+selector が run のモジュールをメモリから外しても、選んだバリアントは残ります。
+"""
+
+from pybricks.tools import StopWatch
+
+from utils.control import run_with_timing
+
+# ボタンで選んだバリアント（パッケージ名 → バリアント名）。未選択なら ACTIVE_VARIANT を使う。
+selected = {}
+
+
+class VariantLoader:
+    """
+    1つの run のバリアントを読み込んでキャッシュするクラス。
+
+    Args:
+        package: run のパッケージ名（例: "runs.run03"）。
+        active: 既定のバリアント名（main.py の ACTIVE_VARIANT）。
+        variants: ボタンで切り替えられるバリアント名の並び。省略時は active だけ。
+    """
+
+    def __init__(self, package, active, variants=None):
+        self.package = package
+        self.active = active
+        self.variants = tuple(variants) if variants else (active,)
+        self.module = None
+        self.loaded_name = None
+        # 直近の import にかかった時間（ms）。キャッシュから返したときは変わらない
+        self.load_ms = None
+
+    @property
+    def name(self):
+        """現在選ばれているバリアント名。"""
+        return selected.get(self.package, self.active)
+
+    @property
+    def label(self):
+        """run_with_timing に渡す表示名（例: "run03:m10_m11"）。"""
+        return "{0}:{1}".format(self.package.rpartition(".")[2], self.name)
+
+    def load(self):
+        """選ばれているバリアントのモジュールを返す。import は切り替え後の初回だけ行う。"""
+        name = self.name
+        if self.module is None or self.loaded_name != name:
+            timer = StopWatch()
+            module_path = "{0}.{1}".format(self.package, name)
+            self.module = __import__(module_path, None, None, ["run"])
+            self.loaded_name = name
+            self.load_ms = timer.time()
+            print("[VARIANT] {0}: {1} ms".format(module_path, self.load_ms))
+        return self.module
+
+    def select(self, name):
+        """バリアントを name に切り替える（読み込みは次の load() で行う）。"""
+        if name not in self.variants:
+            raise ValueError("unknown variant: {0}".format(name))
+        selected[self.package] = name
+
+    def next(self):
+        """variants の中で次のバリアントに切り替え、その名前を返す。"""
+        current = self.name
+        index = self.variants.index(current) if current in self.variants else -1
+        self.select(self.variants[(index + 1) % len(self.variants)])
+        return self.name
+
+    async def run(self, hub, robot, left_wheel, right_wheel, left_lift, right_lift):
+        """
+        選ばれているバリアントの run() を時間計測つきで実行する。
+        最後に settings の回数、settle で短くなった時間、推定した終了位置を出す。
+        """
+        variant = self.load()
+        try:
+            return await run_with_timing(
+                self.label,
+                lambda: variant.run(
+                    hub,
+                    robot,
+                    left_wheel,
+                    right_wheel,
+                    left_lift,
+                    right_lift,
+                ),
+            )
+        finally:
+            robot.print_settings_stats()
+            robot.print_settle_stats()
+
+
+def run_standalone(loader):
+    """
+    runs/runXX/main.py を単体実行したときの入口。
+
+    開発中の実行なので、ログのレベルを DEBUG にして debug() の trace も出します。
+    ロボットを初期化し、センサーのスナップショット（robot.sampler.task）を run と並行して
+    動かします。位置の推定はその値で更新されます。動作の始まりと終わりはイベントログに
+    記録し、バリアントが SENSOR_LOG = True にしていれば、一定間隔のセンサーログも
+    同じ値から記録します。どちらも run の後でまとめて表示します。
+    """
+    from pybricks.tools import multitask, run_task
+    from setup import initialize_robot
+
+    from utils.eventlog import event_log
+    from utils.logger import DEBUG, set_level
+    from utils.sensorlog import sensor_log
+
+    set_level(DEBUG)
+    hub, robot, left_wheel, right_wheel, left_lift, right_lift = initialize_robot()
+    variant = loader.load()
+
+    # SENSOR_LOG のバリアントは、スナップショットから記録する（センサーを読み直さない）
+    logging = getattr(variant, "SENSOR_LOG", False)
+    if logging:
+        every = sensor_log.period_ms // robot.sampler.period_ms
+        robot.sampler.subscribe(sensor_log.on_sample, every=every)
+        sensor_log.start()
+    event_log.start()
+
+    async def timed_run():
+        await loader.run(hub, robot, left_wheel, right_wheel, left_lift, right_lift)
+        robot.sampler.stop()  # スナップショットと位置の更新を止める
+        event_log.stop()
+        event_log.dump()
+        if logging:
+            sensor_log.stop()  # ロガーを止めて、記録したログを出す
+            sensor_log.dump(robot)
+
+    run_task(multitask(robot.sampler.task(), timed_run()))